@@ -0,0 +1,3 @@
+"""
+Benchmarks for dbus-python-client-gen.
+"""
@@ -0,0 +1,293 @@
+"""
+Benchmarks for class generation and for the overhead of generated methods
+and property accessors.
+
+Every call is made on an in-process stand-in for a proxy object, so no bus
+is required, and the time measured is the time spent in this library.
+
+Run from the top-level directory:
+
+    PYTHONPATH=./src python3 -m benchmarks.bench --output results.json
+    PYTHONPATH=./src python3 -m benchmarks.bench --compare results.json
+
+The results are written as JSON. If a previous result file is given with
+--compare, the ratio of each timing to the previous timing is displayed, and
+the exit code is 1 if any timing has regressed by more than the threshold.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+from dbus_python_client_gen import (
+    DPClientError,
+    __version__,
+    make_class,
+    xformer_cache_clear,
+)
+from tests._introspect import SPECS
+from tests._proxy import ReplyingProxy
+
+MANAGER = "org.storage.stratis3.Manager.r5"
+POOL = "org.storage.stratis3.pool.r5"
+
+# An interface with a method with many arguments of assorted types
+MANY_ARGS_SPEC = """
+<interface name="org.example.Many">
+    <method name="Many">
+      {args}
+    </method>
+</interface>
+""".format(
+    args="\n      ".join(
+        f'<arg name="arg_{index}" type="{sig}" direction="in" />'
+        for (index, sig) in enumerate(
+            ["s", "b", "q", "t", "as", "(bs)", "a{sv}", "o"] * 2
+        )
+    )
+)
+
+MANY_ARGS = {
+    f"arg_{index}": value
+    for (index, value) in enumerate(
+        [
+            "name",
+            True,
+            1,
+            1024,
+            ["/dev/sda", "/dev/sdb"],
+            (True, "key"),
+            {"size": ("t", 1024)},
+            "/org/example/1",
+        ]
+        * 2
+    )
+}
+
+
+def _timing(func, number, repeat):
+    """
+    Time func, number times, repeat times.
+
+    :returns: the minimum and median seconds per invocation
+    :rtype: dict
+    """
+    times = [t / number for t in timeit.repeat(func, number=number, repeat=repeat)]
+    return {"min": min(times), "median": statistics.median(times)}
+
+
+def _generation(repeat):
+    """
+    Time generation of a class for each interface and measure its peak
+    memory use.
+
+    The cache of transforming functions is cleared before each generation,
+    except for the warm timing.
+    """
+    results = {}
+    for interface_name, xml in SPECS.items():
+        spec = ET.fromstring(xml)
+        for variant in ("default", "compiled", "lazy", "compact"):
+            compiled = variant == "compiled"
+            lazy = variant == "lazy"
+            compact = variant == "compact"
+
+            def generate(spec=spec, compiled=compiled, lazy=lazy, compact=compact):
+                xformer_cache_clear()
+                make_class(
+                    "Klass",
+                    spec,
+                    compiled=compiled,
+                    lazy=lazy,
+                    compact_properties=compact,
+                )
+
+            result = _timing(generate, 5, repeat)
+
+            gc.collect()
+            xformer_cache_clear()
+            tracemalloc.start()
+            make_class(
+                "Klass", spec, compiled=compiled, lazy=lazy, compact_properties=compact
+            )
+            result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            results[f"generation/{interface_name}/{variant}"] = result
+
+        make_class("Klass", spec)
+        results[f"generation/{interface_name}/warm"] = _timing(
+            lambda spec=spec: make_class("Klass", spec), 5, repeat
+        )
+
+    return results
+
+
+def _calls(number, repeat):
+    """
+    Time invocations of generated methods and property accessors.
+    """
+    manager_spec = ET.fromstring(SPECS[MANAGER])
+    pool_spec = ET.fromstring(SPECS[POOL])
+    many_spec = ET.fromstring(MANY_ARGS_SPEC)
+    proxy = ReplyingProxy()
+
+    results = {}
+    for variant in ("default", "compiled"):
+        compiled = variant == "compiled"
+        manager = make_class("Manager", manager_spec, compiled=compiled)
+        pool = make_class("Pool", pool_spec, compiled=compiled)
+        many = make_class("Many", many_spec, compiled=compiled)
+
+        cases = {
+            "method/0-args": lambda m=manager: m.Methods.EngineStateReport(proxy, {}),
+            "method/4-args": lambda m=manager: m.Methods.CreatePool(
+                proxy,
+                {
+                    "name": "pool",
+                    "devices": ["/dev/sda", "/dev/sdb"],
+                    "key_desc": (False, ""),
+                    "clevis_info": (False, ("", "")),
+                },
+            ),
+            "method/16-args": lambda m=many: m.Methods.Many(proxy, MANY_ARGS),
+            "property/get": lambda p=pool: p.Properties.Name.Get(proxy),
+            "property/set": lambda p=pool: p.Properties.FsLimit.Set(proxy, 64),
+            "error/keyword": _raises(
+                lambda m=manager: m.Methods.CreatePool(proxy, {"name": "pool"})
+            ),
+            "error/marshalling": _raises(
+                lambda m=manager: m.Methods.DestroyPool(proxy, {"pool": None})
+            ),
+        }
+        for name, func in cases.items():
+            results[f"call/{variant}/{name}"] = _timing(func, number, repeat)
+
+    return results
+
+
+def _raises(func):
+    """
+    Wrap a function which is expected to raise a DPClientError.
+    """
+
+    def the_func():
+        try:
+            func()
+        except DPClientError:
+            return
+        raise AssertionError("expected a DPClientError")
+
+    return the_func
+
+
+def _commit():
+    """
+    Get the current git commit, if any.
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, check=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(number, repeat):
+    """
+    Run all benchmarks.
+
+    :param int number: the number of calls in each timing of a call
+    :param int repeat: the number of timings of each benchmark
+    :returns: the metadata and the results
+    :rtype: dict
+    """
+    return {
+        "metadata": {
+            "commit": _commit(),
+            "version": __version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+        },
+        "benchmarks": {**_generation(repeat), **_calls(number, repeat)},
+    }
+
+
+def compare(current, baseline, threshold):
+    """
+    Display the ratio of each current minimum timing to the baseline's.
+
+    The minimum is compared because it is the timing least affected by
+    other activity on the machine.
+
+    :param dict current: the current results
+    :param dict baseline: the baseline results
+    :param float threshold: the ratio above which a timing has regressed
+    :returns: the names of the benchmarks which regressed
+    :rtype: list of str
+    """
+    regressed = []
+    for name, result in current["benchmarks"].items():
+        try:
+            previous = baseline["benchmarks"][name]["min"]
+        except KeyError:
+            print(f"{name:60} {'new':>8}")
+            continue
+
+        ratio = result["min"] / previous
+        flag = ""
+        if ratio > threshold:
+            flag = "  REGRESSED"
+            regressed.append(name)
+        print(f"{name:60} {ratio:8.2f}{flag}")
+
+    return regressed
+
+
+def main(argv=None):
+    """
+    Run the benchmarks, and write or compare the results.
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark class generation and generated calls."
+    )
+    parser.add_argument("--output", help="file to which to write JSON results")
+    parser.add_argument("--compare", help="JSON results with which to compare")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="ratio to baseline above which a timing has regressed",
+    )
+    parser.add_argument("--number", type=int, default=2000, help="calls per timing")
+    parser.add_argument("--repeat", type=int, default=5, help="timings per case")
+    args = parser.parse_args(argv)
+
+    results = run(args.number, args.repeat)
+
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(results, output, indent=2)
+
+    if args.compare is not None:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        if compare(results, baseline, args.threshold):
+            return 1
+    elif args.output is None:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
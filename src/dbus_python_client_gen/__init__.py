@@ -5,9 +5,14 @@
 Top-level classes and methods.
 """
 
+from ._accessors import PropertyAccessors
+from ._batch import batch_call
+from ._codegen import load_module, make_module_source, write_module
 from ._errors import (
+    DPClientDeadlineError,
     DPClientError,
     DPClientGenerationError,
+    DPClientGetAllPropertiesContext,
     DPClientGetPropertyContext,
     DPClientInvalidArgError,
     DPClientInvocationContext,
@@ -17,6 +22,15 @@ from ._errors import (
     DPClientMethodCallContext,
     DPClientRuntimeError,
     DPClientSetPropertyContext,
+    DPClientUnmarshallingError,
 )
+from ._fake import FakeProxyObject
 from ._invokers import make_class
+from ._managed import ManagedObjects
+from ._metrics import Histogram, InvocationMetrics, MemberMetrics
+from ._node import make_classes
+from ._property_cache import PropertyCache, PropertyCacheInfo
+from ._signals import Signal, SignalDispatcher, Subscription
+from ._single_flight import SingleFlight, SingleFlightInfo
 from ._version import __version__
+from ._xformers import xformer_cache_clear, xformer_cache_info
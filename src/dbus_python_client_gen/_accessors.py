@@ -0,0 +1,52 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""
+A compact representation of the accessors of a single property.
+"""
+
+from typing import Any, Callable
+
+
+class PropertyAccessors:
+    """
+    The accessors of a single property, with the same Get and Set members
+    as the class that is otherwise made for each property, but without the
+    cost of a class.
+
+    >>> Klass.Properties.Name.Get(proxy_object)
+    >>> Klass.Properties.Name.signature
+    """
+
+    __slots__ = ("Get", "Set", "access", "name", "signature")
+
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        name: str,
+        access: str,
+        signature: str,
+        getter: Callable[..., Any] | None = None,
+        setter: Callable[..., Any] | None = None,
+    ):
+        """
+        Initialize the accessors.
+
+        A Get or Set member is present only if the property is readable or
+        writable, respectively.
+
+        :param str name: the name of the property
+        :param str access: "read", "write", or "readwrite"
+        :param str signature: the signature of the property
+        :param getter: the getter, if the property is readable
+        :param setter: the setter, if the property is writable
+        """
+        self.name = name
+        self.access = access
+        self.signature = signature
+        if getter is not None:
+            self.Get = getter
+        if setter is not None:
+            self.Set = setter
+
+    def __repr__(self) -> str:
+        return f"PropertyAccessors({self.name!r}, {self.access!r}, {self.signature!r})"
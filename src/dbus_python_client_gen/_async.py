@@ -0,0 +1,78 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""
+Code for invoking dbus-python methods from asyncio coroutines.
+
+dbus-python does not block when a method is invoked with a reply handler
+and an error handler; instead, one of the handlers is called from the
+dbus-python main loop when the reply arrives. The handlers defined here
+resolve an asyncio future, so that the reply can be awaited.
+"""
+
+import asyncio
+from typing import Any, Callable
+
+
+def _set_result(future: asyncio.Future, result: Any):
+    """
+    Set the result of the future unless it has been cancelled.
+
+    :param future: the future
+    :param object result: the result
+    """
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_exception(future: asyncio.Future, exception: BaseException):
+    """
+    Set the exception of the future unless it has been cancelled.
+
+    :param future: the future
+    :param exception: the exception
+    """
+    if not future.done():
+        future.set_exception(exception)
+
+
+def call_async(dbus_method: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Invoke a dbus-python method without blocking.
+
+    The result of the returned future is the same as the value the method
+    would return if it were invoked without handlers: None if the method
+    has no out-arguments, the value of the out-argument if it has one, and
+    a tuple of values otherwise. If the method fails, the exception of the
+    future is the dbus.DBusException that the method would raise.
+
+    The handlers may be called from any thread; the future is resolved by
+    the event loop that is running when this function is called.
+
+    :param dbus_method: the dbus-python method
+    :param args: the positional arguments to the method
+    :param kwargs: the keyword arguments to the method
+    :returns: a future
+    :rtype: asyncio.Future
+    :raises RuntimeError: if no event loop is running
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def reply_handler(*values: Any):
+        """
+        Resolve the future with the out-arguments of the method.
+        """
+        result = None if len(values) == 0 else values[0] if len(values) == 1 else values
+        loop.call_soon_threadsafe(_set_result, future, result)
+
+    def error_handler(exception: BaseException):
+        """
+        Resolve the future with the exception raised by the method.
+        """
+        loop.call_soon_threadsafe(_set_exception, future, exception)
+
+    dbus_method(
+        *args, reply_handler=reply_handler, error_handler=error_handler, **kwargs
+    )
+    return future
@@ -0,0 +1,112 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""
+Code for invoking one generated coroutine function many times at once.
+"""
+
+import asyncio
+from typing import Any, Callable, Iterable, Sequence
+
+from ._errors import DPClientDeadlineError
+
+
+async def batch_call(
+    func: Callable[..., Any],
+    calls: Iterable[Sequence[Any]],
+    *,
+    limit: int | None = None,
+    deadline: float | None = None,
+) -> list[Any]:
+    """
+    Invoke a coroutine function of an Async class once for each entry in
+    calls, with all the invocations in progress at once.
+
+    Each entry in calls is the sequence of positional arguments for one
+    invocation, beginning with the proxy object. All the D-Bus messages are
+    sent without waiting for any reply, unless limit is given, in which case
+    at most limit invocations are in progress at any time.
+
+    If deadline is given, every invocation must complete within deadline
+    seconds of the start of the batch. Each invocation is passed the time
+    remaining as its D-Bus timeout.
+
+    The result has one entry for each entry in calls, in the same order.
+    The entry is the value returned by the invocation or, if the invocation
+    failed, the exception that it raised, usually a DPClientError. The
+    failure of one invocation, whatever its exception, neither interrupts
+    the others nor abandons them while they are in progress.
+
+    >>> Pool = make_class("Pool", spec, asynchronous=True)
+    >>> await batch_call(Pool.Async.Properties.Used.Get, [(p,) for p in proxies])
+    >>> await batch_call(
+    ...     Filesystem.Async.Methods.SetName,
+    ...     [(proxy, {"name": name}) for (proxy, name) in renames],
+    ...     limit=64,
+    ...     deadline=30,
+    ... )
+
+    :param func: a method, getter or setter of an Async class
+    :param calls: the positional arguments of each invocation
+    :type calls: iterable of sequence of object
+    :param limit: the maximum number of invocations in progress, default all
+    :type limit: int or NoneType
+    :param deadline: seconds within which all invocations must complete
+    :type deadline: float or NoneType
+    :returns: the result or the exception of each invocation
+    :rtype: list of object
+    :raises ValueError: if limit is less than 1
+    """
+    if limit is not None and limit < 1:
+        raise ValueError(f"limit must be at least 1, but is {limit}")
+
+    loop = asyncio.get_running_loop()
+    end = None if deadline is None else loop.time() + deadline
+    semaphore = None if limit is None else asyncio.Semaphore(limit)
+
+    def deadline_error() -> DPClientDeadlineError:
+        """
+        Construct the error for an invocation that missed the deadline.
+        """
+        return DPClientDeadlineError(
+            f"Invocation did not complete within the deadline of {deadline}s "
+            "for the batch",
+            deadline,
+        )
+
+    async def invoke(args: Sequence[Any]) -> Any:
+        """
+        Invoke func, within the deadline, if any.
+
+        :param args: the positional arguments
+        :type args: sequence of object
+        :raises DPClientError:
+        """
+        if end is None:
+            return await func(*args)
+
+        remaining = end - loop.time()
+        if remaining <= 0:
+            raise deadline_error()
+
+        try:
+            return await asyncio.wait_for(func(*args, timeout=remaining), remaining)
+        except asyncio.TimeoutError as err:
+            raise deadline_error() from err
+
+    async def call(args: Sequence[Any]) -> Any:
+        """
+        Invoke func, when the limit, if any, permits.
+
+        :param args: the positional arguments
+        :type args: sequence of object
+        :raises DPClientError:
+        """
+        if semaphore is None:
+            return await invoke(args)
+        async with semaphore:
+            return await invoke(args)
+
+    return list(
+        await asyncio.gather(*(call(args) for args in calls), return_exceptions=True)
+    )
@@ -0,0 +1,164 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""
+Code for binding generated classes to a particular proxy object.
+"""
+
+import functools
+import weakref
+from typing import Any, Type
+
+from dbus.proxies import ProxyObject
+
+from ._accessors import PropertyAccessors
+
+
+class _CachingProxy:
+    """
+    Wraps a proxy object, caching the dbus-python method objects that
+    generated methods obtain from it.
+
+    Generated methods and property accessors obtain methods from the proxy
+    object either by get_dbus_method() or, in the case of the Get and Set
+    methods of the Properties interface, by attribute access. Both are
+    supported, and each method is resolved only once.
+    """
+
+    __slots__ = ("_methods", "_proxy")
+
+    def __init__(self, proxy_object: ProxyObject):
+        """
+        Initialize the wrapper.
+
+        :param proxy_object: the proxy object to wrap
+        :type proxy_object: dbus.proxies.ProxyObject
+        """
+        self._proxy = proxy_object
+        self._methods: dict[tuple[str, str | None], Any] = {}
+
+    def get_dbus_method(self, member: str, dbus_interface: str | None = None) -> Any:
+        """
+        Get the method from the proxy object, resolving it on first use.
+
+        :param str member: the name of the method
+        :param dbus_interface: the interface to which the method belongs
+        :type dbus_interface: str or NoneType
+        """
+        try:
+            return self._methods[(member, dbus_interface)]
+        except KeyError:
+            method = self._proxy.get_dbus_method(member, dbus_interface=dbus_interface)
+            self._methods[(member, dbus_interface)] = method
+            return method
+
+    @property
+    def object_path(self) -> str:
+        """
+        The object path of the proxy object.
+        """
+        return self._proxy.object_path
+
+    @property
+    def bus_name(self) -> str | None:
+        """
+        The bus name of the proxy object, if it has one.
+        """
+        return getattr(self._proxy, "bus_name", None)
+
+    def connect_to_signal(self, *args: Any, **kwargs: Any) -> Any:
+        """
+        Connect a handler to a signal of the proxy object.
+        """
+        return self._proxy.connect_to_signal(*args, **kwargs)
+
+    def __getattr__(self, member: str) -> Any:
+        """
+        Get a method by attribute access, as on a proxy object.
+
+        :param str member: the name of the method
+        """
+        if member.startswith("__") and member.endswith("__"):
+            raise AttributeError(member)
+        return self.get_dbus_method(member)
+
+
+class _BoundNamespace:
+    """
+    Exposes the members of a generated class with the proxy object already
+    supplied as their first argument.
+
+    Nested classes, and the accessors of properties, are exposed as bound
+    namespaces in their turn, and members which are not callable, e.g.,
+    signals, are exposed unchanged. Each member is constructed on first
+    access and then kept as an instance attribute.
+    """
+
+    def __init__(self, namespace: Any, proxy_object: Any):
+        """
+        Initialize the namespace.
+
+        :param namespace: the generated class, or the accessors of a property
+        :param proxy_object: the object to pass as first argument
+        """
+        self._namespace = namespace
+        self._proxy_object = proxy_object
+
+    def __getattr__(self, name: str) -> Any:
+        """
+        Bind the member, name, of the generated class.
+
+        :param str name: the name of the member
+        """
+        if name.startswith("__") and name.endswith("__"):
+            raise AttributeError(name)
+
+        member = getattr(self._namespace, name)
+        if isinstance(member, (type, PropertyAccessors)):
+            bound = _BoundNamespace(member, self._proxy_object)
+        elif callable(member):
+            bound = functools.partial(member, self._proxy_object)
+        else:
+            bound = member
+        setattr(self, name, bound)
+        return bound
+
+
+def make_bind() -> classmethod:
+    """
+    Returns a bind method for a generated class.
+
+    The bound objects are remembered for each proxy object for as long as
+    they are in use, so that binding the same proxy object again returns the
+    same bound object, with all the methods it has already resolved. Neither
+    the bound objects nor the proxy objects are kept alive by the class.
+
+    >>> bound = Klass.bind(proxy_object)
+    >>> bound.Methods.Method({})
+    >>> bound.Properties.Name.Get()
+
+    :returns: a classmethod to be added to the generated class
+    """
+    bound_objects: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+    def bind(klass: Type, proxy_object: ProxyObject) -> Any:
+        """
+        Bind the generated class to a proxy object.
+
+        The methods and properties of the bound object take the same
+        arguments as those of the generated class, except for the
+        proxy object. The dbus-python methods are obtained from the proxy
+        object once, on first use, and then reused.
+
+        :param proxy_object: the proxy object
+        :type proxy_object: dbus.proxies.ProxyObject
+        :returns: an object with Methods and Properties members
+        """
+        try:
+            return bound_objects[proxy_object]
+        except KeyError:
+            bound = _BoundNamespace(klass, _CachingProxy(proxy_object))
+            bound_objects[proxy_object] = bound
+            return bound
+
+    return classmethod(bind)
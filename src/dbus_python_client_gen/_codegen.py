@@ -0,0 +1,527 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""
+Code for generating the source of a Python module from interface
+specifications.
+
+The generated module defines the same classes that make_class would
+construct from the same specifications. The functions that transform
+arguments to dbus-python types are emitted as Python source, so that
+importing the module requires neither XML parsing nor parsing of
+signatures.
+"""
+
+import hashlib
+import importlib.util
+import keyword
+import os
+import sys
+import tempfile
+import textwrap
+import types
+import xml.etree.ElementTree as ET  # nosec B405
+from typing import Mapping
+
+from ._compiled import method_source
+from ._errors import DPClientGenerationError
+from ._signature import BASIC_TYPES, complete_types, split_signature
+from ._specs import (
+    check_method_spec,
+    check_property_spec,
+    interface_name_of,
+    method_spec,
+    property_spec,
+    signal_spec,
+)
+from ._version import __version__
+
+_MODULE_HEADER = '''\
+# Generated by dbus-python-client-gen {version}. Do not edit.
+"""
+Classes for invoking dbus-python methods, generated from D-Bus
+introspection data.
+"""
+
+from collections.abc import Mapping
+
+import dbus
+from into_dbus_python import IntoDPError
+
+from dbus_python_client_gen._bound import make_bind
+from dbus_python_client_gen._signals import Signal
+from dbus_python_client_gen._snapshot import make_get_all
+from dbus_python_client_gen._runtime import (
+    marshal_variant,
+    method_invocation_error,
+    method_keyword_error,
+    method_marshalling_error,
+    property_get_error,
+    property_marshalling_error,
+    property_set_error,
+)
+'''
+
+# The errors raised by the generated transforming functions, by the
+# dbus-python constructors they call, and by marshal_variant, if a value is
+# inappropriate; any other error is a bug, and is not reported as a
+# marshalling error.
+_MARSHAL_ERRORS = "(IntoDPError, OverflowError, TypeError, ValueError)"
+
+_ARRAY_TEMPLATE = '''\
+def {func_name}(value, *, variant=0):
+    """
+    Transform a value to signature "{signature}".
+    """
+    if isinstance(value, dict):
+        raise TypeError("expected a list for an array but found a dict")
+    return dbus.Array(
+        [{element} for item in value], signature={element_signature!r}, variant_level=variant
+    )
+'''
+
+_DICT_TEMPLATE = '''\
+def {func_name}(value, *, variant=0):
+    """
+    Transform a value to signature "{signature}".
+    """
+    if not isinstance(value, Mapping):
+        raise TypeError("expected a mapping for a dictionary")
+    return dbus.Dictionary(
+        {{{key}: {value} for (entry_key, entry_value) in value.items()}},
+        signature={entry_signature!r},
+        variant_level=variant,
+    )
+'''
+
+_STRUCT_TEMPLATE = '''\
+def {func_name}(value, *, variant=0):
+    """
+    Transform a value to signature "{signature}".
+    """
+    if isinstance(value, dict) or len(value) != {num_fields}:
+        raise TypeError("expected {num_fields} elements for a struct")
+    {fields} = value
+    return dbus.Struct(
+        {elements}, signature={field_signature!r}, variant_level=variant
+    )
+'''
+
+_GETTER_TEMPLATE = '''\
+@staticmethod
+def Get(proxy_object, *, timeout={timeout!r}):
+    """
+    The property getter.
+
+    :raises DPClientInvocationError:
+    """
+    try:
+        return proxy_object.Get(
+            {interface_name!r},
+            {name!r},
+            dbus_interface=dbus.PROPERTIES_IFACE,
+            timeout=timeout,
+        )
+    except dbus.DBusException as err:
+        raise property_get_error({interface_name!r}, {name!r}) from err
+'''
+
+_SETTER_TEMPLATE = '''\
+@staticmethod
+def Set(proxy_object, value, *, timeout={timeout!r}):
+    """
+    The property setter.
+
+    :raises DPClientRuntimeError:
+    """
+    try:
+        arg = {marshal}
+    except {marshal_errors} as err:
+        raise property_marshalling_error(
+            {interface_name!r}, {name!r}, {signature!r}, value
+        ) from err
+
+    try:
+        proxy_object.Set(
+            {interface_name!r},
+            {name!r},
+            arg,
+            dbus_interface=dbus.PROPERTIES_IFACE,
+            timeout=timeout,
+        )
+    except dbus.DBusException as err:
+        raise property_set_error({interface_name!r}, {name!r}, arg) from err
+'''
+
+
+def _tuple_source(items: list[str]) -> str:
+    """
+    Get the source of a tuple display.
+
+    :param items: the source of each item
+    :type items: list of str
+    :rtype: str
+    """
+    return f"({items[0]},)" if len(items) == 1 else f"({', '.join(items)})"
+
+
+class _Marshallers:
+    """
+    Accumulates the source of the functions that transform values to
+    dbus-python types, one function for each distinct container signature.
+    """
+
+    def __init__(self):
+        self._names: dict[str, str] = {}
+        self.sources: list[str] = []
+
+    def expression(self, signature: str, value: str, variant: int = 0) -> str:
+        """
+        Get an expression which transforms a value to a single complete type.
+
+        :param str signature: the signature of a single complete type
+        :param str value: an expression for the value to transform
+        :param int variant: the variant level of the transformed value
+        :returns: a Python expression
+        :rtype: str
+        """
+        if signature in BASIC_TYPES:
+            klass = f"dbus.types.{BASIC_TYPES[signature]}"
+            return (
+                f"{klass}({value}, variant_level={variant})"
+                if variant
+                else f"{klass}({value})"
+            )
+
+        func_name = "marshal_variant" if signature == "v" else self._function(signature)
+        return (
+            f"{func_name}({value}, variant={variant})"
+            if variant
+            else f"{func_name}({value})"
+        )
+
+    def _function(self, signature: str) -> str:
+        """
+        Get the name of the function for a container signature, generating
+        the function if necessary.
+
+        :param str signature: the signature of a single container type
+        :returns: the name of the function
+        :rtype: str
+        """
+        try:
+            return self._names[signature]
+        except KeyError:
+            pass
+
+        func_name = f"_marshal_{len(self._names)}"
+        self._names[signature] = func_name
+
+        if signature.startswith("a{"):
+            ((key_start, key_end), (value_start, value_end)) = split_signature(
+                signature, 2
+            )
+            source = _DICT_TEMPLATE.format(
+                func_name=func_name,
+                signature=signature,
+                key=self.expression(signature[key_start:key_end], "entry_key"),
+                value=self.expression(signature[value_start:value_end], "entry_value"),
+                entry_signature=signature[2:-1],
+            )
+        elif signature.startswith("a"):
+            source = _ARRAY_TEMPLATE.format(
+                func_name=func_name,
+                signature=signature,
+                element=self.expression(signature[1:], "item"),
+                element_signature=signature[1:],
+            )
+        else:
+            fields = split_signature(signature, 1)
+            source = _STRUCT_TEMPLATE.format(
+                func_name=func_name,
+                signature=signature,
+                num_fields=len(fields),
+                fields=_tuple_source(
+                    [f"field_{index}" for index in range(len(fields))]
+                ),
+                elements=_tuple_source(
+                    [
+                        self.expression(signature[start:end], f"field_{index}")
+                        for (index, (start, end)) in enumerate(fields)
+                    ]
+                ),
+                field_signature=signature[1:-1],
+            )
+
+        self.sources.append(source)
+        return func_name
+
+
+def _check_identifier(name: str, interface_name: str):
+    """
+    Check that name can be used as a Python identifier.
+
+    :param str name: the name of a method or property
+    :param str interface_name: the interface to which it belongs
+    :raises DPClientGenerationError:
+    """
+    if not name.isidentifier() or keyword.iskeyword(name):
+        fmt_str = (
+            'Name "%s" belonging to interface "%s" can not be used as a '
+            "Python identifier"
+        )
+        raise DPClientGenerationError(fmt_str % (name, interface_name))
+
+
+def _class_source(
+    name: str, spec: ET.Element, timeout: int, marshallers: _Marshallers
+) -> str:
+    """
+    Generate the source of a single class.
+
+    :param str name: the name of the class
+    :param spec: the interface specification
+    :type spec: xml.element.ElementTree.Element
+    :param int timeout: the default D-Bus timeout
+    :param marshallers: the transforming functions generated so far
+    :returns: the source of the class definition
+    :rtype: str
+    :raises DPClientGenerationError:
+    """
+    interface_name = interface_name_of(spec)
+
+    methods = []
+    for method in spec.findall("./method"):
+        the_method_spec = method_spec(interface_name, method)
+        check_method_spec(interface_name, the_method_spec)
+        (method_name, arg_names, signature) = the_method_spec
+        _check_identifier(method_name, interface_name)
+        exprs = [
+            marshallers.expression(arg_type, "{}")
+            for arg_type in complete_types(signature)
+        ]
+
+        methods.append(
+            "@staticmethod\n"
+            + method_source(
+                interface_name,
+                method_name,
+                arg_names,
+                signature,
+                exprs,
+                timeout,
+                func_name=method_name,
+                marshal_errors=_MARSHAL_ERRORS,
+            )
+        )
+
+    properties = []
+    property_names = []
+    readable = []
+    for prop in spec.findall("./property"):
+        the_property_spec = property_spec(interface_name, prop)
+        (prop_name, access, signature) = the_property_spec
+        _check_identifier(prop_name, interface_name)
+        property_names.append(prop_name)
+        accessors = []
+        if access in ("read", "readwrite"):
+            readable.append(prop_name)
+            accessors.append(
+                _GETTER_TEMPLATE.format(
+                    interface_name=interface_name, name=prop_name, timeout=timeout
+                )
+            )
+        if access in ("write", "readwrite"):
+            check_property_spec(interface_name, the_property_spec)
+            marshal = marshallers.expression(signature, "value", variant=1)
+            accessors.append(
+                _SETTER_TEMPLATE.format(
+                    interface_name=interface_name,
+                    name=prop_name,
+                    signature=signature,
+                    timeout=timeout,
+                    marshal=marshal,
+                    marshal_errors=_MARSHAL_ERRORS,
+                )
+            )
+        properties.append(
+            f"class {prop_name}:\n"
+            + textwrap.indent("\n".join(accessors) or "pass\n", " " * 4)
+        )
+
+    if "GetAll" not in property_names:
+        properties.append(
+            f"GetAll = staticmethod(\n"
+            f"    make_get_all({interface_name!r}, {tuple(readable)!r}, {timeout!r})\n"
+            f")\n"
+        )
+
+    signals = []
+    for signal in spec.findall("./signal"):
+        (signal_name, arg_names, signature) = signal_spec(interface_name, signal)
+        _check_identifier(signal_name, interface_name)
+        try:
+            complete_types(signature)
+        except ValueError as err:
+            fmt_str = (
+                'Malformed signature "%s" for signal "%s" belonging to interface "%s"'
+            )
+            raise DPClientGenerationError(
+                fmt_str % (signature, signal_name, interface_name)
+            ) from err
+        signals.append(
+            f"{signal_name} = Signal(\n"
+            f"    {interface_name!r}, {signal_name!r}, {arg_names!r}, {signature!r}\n"
+            f")\n"
+        )
+
+    doc = f'Methods and properties of interface "{interface_name}".'
+    methods_body = "\n".join(methods) or "pass\n"
+    properties_body = "\n".join(properties)
+    signals_body = "".join(signals) or "pass\n"
+    return (
+        f"class {name}:\n"
+        f"    {doc!r}\n\n"
+        f"    class Methods:\n"
+        f"{textwrap.indent(methods_body, ' ' * 8)}\n"
+        f"    class Properties:\n"
+        f"{textwrap.indent(properties_body, ' ' * 8)}\n"
+        f"    class Signals:\n"
+        f"{textwrap.indent(signals_body, ' ' * 8)}\n"
+        f"    bind = make_bind()\n"
+    )
+
+
+def make_module_source(specs: Mapping[str, ET.Element], timeout: int = -1) -> str:
+    """
+    Generate the source of a Python module which defines a class for each
+    specification.
+
+    Each class defined by the module has the same Methods, Properties and
+    Signals as the class that make_class would construct from the same specification
+    and timeout. The module can be written to a file and imported in place
+    of calling make_class.
+
+    >>> source = make_module_source({"Manager": spec}, 120)
+    >>> from generated_module import Manager
+    >>> Manager.Methods.CreatePool(proxy_object, {"name": "pool", ...})
+
+    :param specs: map from class names to interface specifications
+    :type specs: mapping of str * xml.element.ElementTree.Element
+    :param int timeout: D-Bus timeout, -1 is libdbus default ~25s
+    :returns: the source of the module
+    :rtype: str
+    :raises DPClientGenerationError:
+    """
+    marshallers = _Marshallers()
+    classes = []
+    for name, spec in specs.items():
+        _check_identifier(name, interface_name_of(spec))
+        classes.append(_class_source(name, spec, timeout, marshallers))
+
+    return "\n\n".join(
+        [_MODULE_HEADER.format(version=__version__)] + marshallers.sources + classes
+    )
+
+
+def write_module(
+    path: str | os.PathLike, specs: Mapping[str, ET.Element], timeout: int = -1
+):
+    """
+    Generate a Python module which defines a class for each specification
+    and write it to path.
+
+    The module is first written to a temporary file in the same directory
+    which then replaces any existing file at path, so that a partially
+    written module is never visible.
+
+    :param path: the path of the module
+    :type path: str or os.PathLike
+    :param specs: map from class names to interface specifications
+    :type specs: mapping of str * xml.element.ElementTree.Element
+    :param int timeout: D-Bus timeout, -1 is libdbus default ~25s
+    :raises DPClientGenerationError:
+    """
+    source = make_module_source(specs, timeout)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    (handle, tmp_path) = tempfile.mkstemp(suffix=".py", dir=directory)
+    try:
+        with os.fdopen(handle, "w", encoding="utf-8") as tmp_file:
+            tmp_file.write(source)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:  # pragma: no cover
+        os.unlink(tmp_path)
+        raise
+
+
+def _cache_key(specs: Mapping[str, str | ET.Element], timeout: int) -> str:
+    """
+    Get the key of a generated module in the cache: a hash of the version
+    of this package, the timeout, and the class names and specifications.
+
+    :param specs: map from class names to interface specifications
+    :type specs: mapping of str * (str or xml.element.ElementTree.Element)
+    :param int timeout: D-Bus timeout, -1 is libdbus default ~25s
+    :rtype: str
+    """
+    digest = hashlib.sha256(f"{__version__}\0{timeout}".encode())
+    for name, spec in specs.items():
+        text = spec if isinstance(spec, str) else ET.tostring(spec, encoding="unicode")
+        digest.update(f"\0{name}\0{text}".encode())
+    return digest.hexdigest()
+
+
+def load_module(
+    cache_dir: str | os.PathLike,
+    specs: Mapping[str, str | ET.Element],
+    timeout: int = -1,
+) -> types.ModuleType:
+    """
+    Load a module which defines a class for each specification from a cache
+    directory, generating and writing it first if it is not present.
+
+    The module is keyed by a hash of the specifications, the timeout and the
+    version of this package, so a service revision with a different
+    interface, or an upgrade of this package, gets a module of its own.
+    Specifications may be passed as XML text, which is only parsed if the
+    module is not present. Modules are written as by write_module, and so
+    several processes may safely populate the same cache at once. Python
+    caches the compiled module alongside it, as for any module.
+
+    >>> module = load_module(cache_dir, {"Manager": manager_xml}, 120)
+    >>> module.Manager.Methods.CreatePool(proxy_object, {"name": "pool", ...})
+
+    :param cache_dir: the cache directory, created if it does not exist
+    :type cache_dir: str or os.PathLike
+    :param specs: map from class names to interface specifications
+    :type specs: mapping of str * (str or xml.element.ElementTree.Element)
+    :param int timeout: D-Bus timeout, -1 is libdbus default ~25s
+    :returns: the module
+    :raises DPClientGenerationError:
+    """
+    module_name = f"dbus_python_client_gen_{_cache_key(specs, timeout)}"
+    try:
+        return sys.modules[module_name]
+    except KeyError:
+        pass
+
+    path = os.path.join(cache_dir, f"{module_name}.py")
+    if not os.path.exists(path):
+        try:
+            elements = {
+                name: ET.fromstring(spec) if isinstance(spec, str) else spec  # nosec B314
+                for name, spec in specs.items()
+            }
+        except ET.ParseError as err:
+            raise DPClientGenerationError("Malformed interface specification") from err
+        os.makedirs(cache_dir, exist_ok=True)
+        write_module(path, elements, timeout)
+
+    module_spec = importlib.util.spec_from_file_location(module_name, path)
+    if module_spec is None or module_spec.loader is None:  # pragma: no cover
+        raise DPClientGenerationError(f'Can not load module from "{path}"')
+    module = importlib.util.module_from_spec(module_spec)
+    module_spec.loader.exec_module(module)
+    return sys.modules.setdefault(module_name, module)
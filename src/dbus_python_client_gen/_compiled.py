@@ -0,0 +1,220 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""
+Code for generating specialized method invokers from Python source.
+
+Each invoker is specific to a single method. Its arguments are fetched from
+fixed keys in a precomputed order and transformed by calling the
+transforming function for each argument directly, so no per-call sorting
+or generic transformation of the argument list is required.
+"""
+
+from typing import Any, Callable, Mapping, Sequence
+
+import dbus
+from into_dbus_python import IntoDPError
+
+from ._async import call_async
+from ._runtime import (
+    method_invocation_error,
+    method_keyword_error,
+    method_marshalling_error,
+)
+
+_METHOD_TEMPLATE = '''\
+{async_}def {func_name}(proxy_object, func_args, *, timeout={timeout!r}):
+    """
+    The method proper.
+
+    :param func_args: The function arguments
+    :type func_args: dict
+    :raises DPClientRuntimeError:
+    """
+{fetch}    if len(func_args) != {num_args}:
+        raise method_keyword_error(
+            {interface_name!r}, {name!r}, {arg_names!r}, func_args
+        )
+{marshal}
+    dbus_method = proxy_object.get_dbus_method(
+        {name!r}, dbus_interface={interface_name!r}
+    )
+
+    try:
+        return {invoke}{xformed_args}{options}signature={signature!r}, timeout=timeout)
+    except dbus.DBusException as err:
+        raise method_invocation_error(
+            {interface_name!r}, {name!r}, [{xformed_args_list}]
+        ) from err
+'''
+
+_FETCH_TEMPLATE = """\
+    try:
+{statements}
+    except KeyError:
+        raise method_keyword_error(
+            {interface_name!r}, {name!r}, {arg_names!r}, func_args
+        ) from None
+"""
+
+_MARSHAL_TEMPLATE = """\
+
+    try:
+{statements}
+    except {marshal_errors} as err:
+        raise method_marshalling_error(
+            {interface_name!r}, {name!r}, {signature!r}, [{args}]
+        ) from err
+"""
+
+
+def method_source(  # noqa: PLR0913, PLR0917
+    interface_name: str,
+    name: str,
+    arg_names: Sequence[str],
+    signature: str,
+    marshallers: Sequence[str],
+    timeout: int,
+    *,
+    func_name: str = "dbus_func",
+    marshal_errors: str = "IntoDPError",
+    asynchronous: bool = False,
+    byte_arrays: bool = False,
+) -> str:
+    """
+    Generate the source of a specialized invoker for a single method.
+
+    The source refers to the names imported by this module; these must be
+    available in the namespace in which it is executed.
+
+    Each entry in marshallers is a format string with a single positional
+    field, into which the name of the variable holding the argument is
+    substituted, e.g., "xformer_0({})".
+
+    If asynchronous is True, the invoker is a coroutine function which
+    invokes the method by means of call_async. If byte_arrays is True, the
+    method is invoked with byte_arrays=True, so that dbus-python returns
+    arrays of bytes as bytes.
+
+    :param str interface_name: the interface to which the method belongs
+    :param str name: the name of the method
+    :param arg_names: the names of the in-arguments, in signature order
+    :type arg_names: sequence of str
+    :param str signature: the signature of the in-arguments
+    :param marshallers: expressions that transform each argument
+    :type marshallers: sequence of str
+    :param int timeout: the default D-Bus timeout
+    :param str func_name: the name of the function defined
+    :param str marshal_errors: the exceptions raised by the marshallers
+    :param bool asynchronous: if True, define a coroutine function
+    :param bool byte_arrays: if True, request arrays of bytes as bytes
+    :returns: the source of a function definition
+    :rtype: str
+    """
+    args = [f"arg_{index}" for index in range(len(arg_names))]
+    xformed = [f"xformed_{index}" for index in range(len(arg_names))]
+    indent = " " * 8
+
+    fetch = (
+        _FETCH_TEMPLATE.format(
+            statements="\n".join(
+                f"{indent}{arg} = func_args[{arg_name!r}]"
+                for (arg, arg_name) in zip(args, arg_names)
+            ),
+            interface_name=interface_name,
+            name=name,
+            arg_names=tuple(arg_names),
+        )
+        if arg_names
+        else ""
+    )
+    marshal = (
+        _MARSHAL_TEMPLATE.format(
+            statements="\n".join(
+                f"{indent}{xarg} = {marshaller.format(arg)}"
+                for (xarg, marshaller, arg) in zip(xformed, marshallers, args)
+            ),
+            marshal_errors=marshal_errors,
+            interface_name=interface_name,
+            name=name,
+            signature=signature,
+            args=", ".join(args),
+        )
+        if arg_names
+        else ""
+    )
+
+    return _METHOD_TEMPLATE.format(
+        async_="async " if asynchronous else "",
+        func_name=func_name,
+        interface_name=interface_name,
+        name=name,
+        arg_names=tuple(arg_names),
+        signature=signature,
+        timeout=timeout,
+        fetch=fetch,
+        num_args=len(arg_names),
+        marshal=marshal,
+        invoke="await call_async(dbus_method, " if asynchronous else "dbus_method(",
+        xformed_args="".join(f"{xarg}, " for xarg in xformed),
+        options="byte_arrays=True, " if byte_arrays else "",
+        xformed_args_list=", ".join(xformed),
+    )
+
+
+def compile_method(  # noqa: PLR0913, PLR0917
+    interface_name: str,
+    name: str,
+    arg_names: Sequence[str],
+    signature: str,
+    funcs: Sequence[Callable[[Any], Any]],
+    default_timeout: int,
+    *,
+    asynchronous: bool = False,
+    byte_arrays: bool = False,
+) -> Callable[[Any, Mapping[str, Any]], Any]:
+    """
+    Compile a specialized invoker for a single method.
+
+    :param str interface_name: the interface to which the method belongs
+    :param str name: the name of the method
+    :param arg_names: the names of the in-arguments, in signature order
+    :type arg_names: sequence of str
+    :param str signature: the signature of the in-arguments
+    :param funcs: the transforming function for each in-argument
+    :type funcs: sequence of (object -> object)
+    :param int default_timeout: the default D-Bus timeout
+    :param bool asynchronous: if True, compile a coroutine function
+    :param bool byte_arrays: if True, request arrays of bytes as bytes
+    :returns: the method
+    """
+    namespace: dict[str, Any] = {
+        "call_async": call_async,
+        "dbus": dbus,
+        "IntoDPError": IntoDPError,
+        "method_invocation_error": method_invocation_error,
+        "method_keyword_error": method_keyword_error,
+        "method_marshalling_error": method_marshalling_error,
+    }
+    marshallers = []
+    for index, func in enumerate(funcs):
+        namespace[f"xformer_{index}"] = func
+        marshallers.append(f"xformer_{index}({{}})")
+
+    source = method_source(
+        interface_name,
+        name,
+        arg_names,
+        signature,
+        marshallers,
+        default_timeout,
+        asynchronous=asynchronous,
+        byte_arrays=byte_arrays,
+    )
+    exec(  # nosec B102
+        compile(source, f"<{interface_name}.{name}>", "exec"), namespace
+    )
+
+    dbus_func = namespace["dbus_func"]
+    dbus_func.__name__ = dbus_func.__qualname__ = name
+    return dbus_func
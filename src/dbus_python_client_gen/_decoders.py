@@ -0,0 +1,323 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""
+Code for decoding the values returned by dbus-python into native Python
+types.
+
+A decoding function is constructed once for each signature, so that no
+generic inspection of the returned values is necessary, except of the
+contents of variants, whose types can not be known in advance. Basic types
+become bool, int, float or str; arrays become lists, dictionaries become
+dicts and structs become tuples. Arrays of bytes become bytes; when
+dbus-python is passed byte_arrays=True, it constructs a dbus.ByteArray,
+which is itself a bytes object and is returned without copying. Unix file
+descriptors are returned as dbus-python constructs them.
+"""
+
+import collections
+import functools
+import inspect
+from typing import Any, Callable, Sequence
+
+import dbus
+
+from ._runtime import unmarshalling_error
+from ._signature import BASIC_TYPES, complete_types, split_signature
+
+# The maximum number of decoding functions that are cached
+DECODER_CACHE_SIZE = 1024
+
+# The errors raised by decoding functions if a value does not agree with
+# its signature
+DECODING_ERRORS = (AttributeError, TypeError, ValueError)
+
+
+def _identity(value: Any) -> Any:
+    """
+    Return the value unchanged.
+    """
+    return value
+
+
+def _decode_bytes(value: Any) -> bytes:
+    """
+    Decode an array of bytes, without copying it if it is already bytes.
+    """
+    return value if isinstance(value, bytes) else bytes(value)
+
+
+# The decoding function for each basic type code
+_BASIC_DECODERS: dict[str, Callable[[Any], Any]] = {
+    "y": int,
+    "b": bool,
+    "n": int,
+    "q": int,
+    "i": int,
+    "u": int,
+    "x": int,
+    "t": int,
+    "d": float,
+    "h": _identity,
+    "s": str,
+    "o": str,
+    "g": str,
+}
+
+
+def decode_variant(value: Any) -> Any:
+    """
+    Decode the contents of a variant according to its dbus-python type.
+
+    :param value: the value
+    :returns: the decoded value
+    """
+    decoder = _VARIANT_DECODERS.get(type(value))
+    return value if decoder is None else decoder(value)
+
+
+def _decode_variant_struct(value: Any) -> tuple[Any, ...]:
+    """
+    Decode a struct in a variant.
+    """
+    return tuple(map(decode_variant, value))
+
+
+def _decode_variant_array(value: Any) -> list[Any]:
+    """
+    Decode an array in a variant.
+    """
+    return list(map(decode_variant, value))
+
+
+def _decode_variant_dictionary(value: Any) -> dict[Any, Any]:
+    """
+    Decode a dictionary in a variant.
+    """
+    return {decode_variant(k): decode_variant(v) for (k, v) in value.items()}
+
+
+# The decoding function for each dbus-python type that may be found in a
+# variant; values of any other type, e.g., dbus.ByteArray, are unchanged.
+_VARIANT_DECODERS: dict[type, Callable[[Any], Any]] = {
+    **{
+        getattr(dbus.types, type_name): _BASIC_DECODERS[code]
+        for (code, type_name) in BASIC_TYPES.items()
+    },
+    dbus.Struct: _decode_variant_struct,
+    dbus.Array: _decode_variant_array,
+    dbus.Dictionary: _decode_variant_dictionary,
+}
+
+
+@functools.lru_cache(maxsize=DECODER_CACHE_SIZE)
+def complete_type_decoder(signature: str) -> Callable[[Any], Any]:
+    """
+    Get the decoding function for a single complete type.
+
+    :param str signature: the signature of a single complete type
+    :returns: the decoding function
+    """
+    code = signature[0]
+    if code in _BASIC_DECODERS:
+        return _BASIC_DECODERS[code]
+
+    if code == "v":
+        return decode_variant
+
+    if signature == "ay":
+        return _decode_bytes
+
+    if code == "a" and signature[1] == "{":
+        ((key_start, key_end), (value_start, value_end)) = split_signature(signature, 2)
+        decode_key = complete_type_decoder(signature[key_start:key_end])
+        decode_value = complete_type_decoder(signature[value_start:value_end])
+
+        def decode_dict(value: Any) -> dict[Any, Any]:
+            """
+            Decode a dictionary.
+            """
+            return {decode_key(k): decode_value(v) for (k, v) in value.items()}
+
+        return decode_dict
+
+    if code == "a":
+        decode_element = complete_type_decoder(signature[1:])
+
+        def decode_array(value: Any) -> list[Any]:
+            """
+            Decode an array.
+            """
+            return list(map(decode_element, value))
+
+        return decode_array
+
+    return _sequence_decoder(
+        [
+            complete_type_decoder(signature[start:end])
+            for (start, end) in split_signature(signature, 1)
+        ]
+    )
+
+
+def _sequence_decoder(
+    decoders: Sequence[Callable[[Any], Any]], result_type: type = tuple
+) -> Callable[[Any], tuple[Any, ...]]:
+    """
+    Get a function which decodes a fixed-length sequence of values.
+
+    :param decoders: the decoding function for each value
+    :param type result_type: tuple, or a subclass of tuple to construct
+    :returns: the decoding function, which returns a result_type
+    """
+    decoders = tuple(decoders)
+    length = len(decoders)
+
+    def decode_sequence(value: Any) -> tuple[Any, ...]:
+        """
+        Decode a struct, or the values of several out-arguments.
+
+        :raises ValueError: if the number of values is wrong
+        """
+        if len(value) != length:
+            raise ValueError(f"expected {length} values, found {len(value)}")
+        return tuple.__new__(result_type, [f(v) for (f, v) in zip(decoders, value)])
+
+    return decode_sequence
+
+
+def _result_builder(length: int, result_type: type) -> Callable[[Any], Any]:
+    """
+    Get a function which constructs a result from the values of several
+    out-arguments, without decoding them.
+
+    :param int length: the number of out-arguments
+    :param type result_type: the subclass of tuple to construct
+    :returns: the constructing function
+    """
+
+    def build_result(value: Any) -> Any:
+        """
+        Construct the result.
+
+        :raises ValueError: if the number of values is wrong
+        """
+        if len(value) != length:
+            raise ValueError(f"expected {length} values, found {len(value)}")
+        return tuple.__new__(result_type, value)
+
+    return build_result
+
+
+def make_result_type(method_name: str, names: Sequence[str]) -> type:
+    """
+    Make a named tuple type for the values of the out-arguments of a method.
+
+    Each field is named after its out-argument; if an out-argument is
+    unnamed, or its name is not a valid field name, the field is named by
+    an underscore followed by its position.
+
+    :param str method_name: the name of the method
+    :param names: the names of the out-arguments
+    :type names: sequence of str
+    :returns: the named tuple type, e.g., CreatePoolResult
+    """
+    return collections.namedtuple(f"{method_name}Result", names, rename=True)
+
+
+def reply_decoder(
+    signature: str, *, decode: bool = True, result_type: type | None = None
+) -> Callable[[Any], Any] | None:
+    """
+    Get a function which transforms the value returned by a dbus-python
+    method: the value of the out-argument if there is one, or the tuple of
+    the values of the out-arguments if there are several.
+
+    :param str signature: the signature of the out-arguments
+    :param bool decode: if True, decode the values into native types
+    :param result_type: if not None, the type of the result if there are
+                        several out-arguments, a subclass of tuple
+    :type result_type: type or NoneType
+    :returns: the transforming function, or None if nothing is to be done
+    :raises ValueError: if the signature is malformed
+    """
+    signatures = complete_types(signature)
+    if len(signatures) < 2:  # noqa: PLR2004
+        return complete_type_decoder(signature) if decode and signatures else None
+    if not decode:
+        return (
+            None
+            if result_type is None
+            else _result_builder(len(signatures), result_type)
+        )
+    return _sequence_decoder(
+        [complete_type_decoder(sig) for sig in signatures],
+        tuple if result_type is None else result_type,
+    )
+
+
+def args_decoder(signature: str) -> Callable[[Any], tuple[Any, ...]]:
+    """
+    Get a function which decodes the tuple of the arguments of a signal.
+
+    :param str signature: the signature of the arguments
+    :returns: the decoding function
+    :raises ValueError: if the signature is malformed
+    """
+    return _sequence_decoder(
+        [complete_type_decoder(sig) for sig in complete_types(signature)]
+    )
+
+
+def decoding(
+    interface_name: str,
+    member_name: str,
+    signature: str,
+    decoder: Callable[[Any], Any],
+    func: Callable[..., Any],
+) -> Callable[..., Any]:
+    """
+    Wrap a generated method or property getter so that the value it returns
+    is decoded.
+
+    :param str interface_name: the name of the interface
+    :param str member_name: the name of the method or property
+    :param str signature: the signature of the value returned
+    :param decoder: the decoding function
+    :param func: the function or coroutine function
+    :returns: a function of the same kind
+    :raises DPClientUnmarshallingError: if the value can not be decoded
+    """
+
+    def decode(value: Any) -> Any:
+        """
+        Decode the value.
+
+        :raises DPClientUnmarshallingError:
+        """
+        try:
+            return decoder(value)
+        except DECODING_ERRORS as err:
+            raise unmarshalling_error(
+                interface_name, member_name, signature, value
+            ) from err
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_dbus_func(*args: Any, **kwargs: Any) -> Any:
+            """
+            Invoke the coroutine function, decoding its result.
+            """
+            return decode(await func(*args, **kwargs))
+
+        return async_dbus_func
+
+    @functools.wraps(func)
+    def dbus_func(*args: Any, **kwargs: Any) -> Any:
+        """
+        Invoke the function, decoding its result.
+        """
+        return decode(func(*args, **kwargs))
+
+    return dbus_func
@@ -12,9 +12,9 @@ class DPClientInvocationContext(ABC):
     """
     Identifies the context in which an invocation error occurred.
 
-    The context can be a get property action, a set property action, or
-    an actual method call. In each case, the fields of the subclass will
-    be different.
+    The context can be a get property action, a get all properties action,
+    a set property action, or an actual method call. In each case, the fields
+    of the subclass will be different.
     """
 
 
@@ -49,6 +49,21 @@ class DPClientGetPropertyContext(DPClientInvocationContext):
         self.property_name = property_name
 
 
+class DPClientGetAllPropertiesContext(DPClientInvocationContext):
+    """
+    GetAll call on an interface's properties.
+    """
+
+    def __init__(self, property_names):  # pragma: no cover
+        """
+        Construct properties information.
+
+        :param property_names: the names of the properties requested
+        :type property_names: list of str
+        """
+        self.property_names = property_names
+
+
 class DPClientSetPropertyContext(DPClientInvocationContext):
     """
     Set call on a property.
@@ -77,6 +92,23 @@ class DPClientGenerationError(DPClientError):
     """
 
 
+class DPClientDeadlineError(DPClientError):
+    """
+    Exception raised when a call in a batch could not be completed before
+    the batch's deadline.
+    """
+
+    def __init__(self, message, deadline):
+        """
+        Initialize a DPClientDeadlineError with the deadline that passed.
+
+        :param str message: the error message
+        :param float deadline: the deadline of the batch, in seconds
+        """
+        super().__init__(message)
+        self.deadline = deadline
+
+
 class DPClientRuntimeError(DPClientError):
     """
     Exception raised during execution of generated classes.
@@ -112,6 +144,30 @@ class DPClientInvocationError(DPClientRuntimeError):
         self.context = context
 
 
+class DPClientUnmarshallingError(DPClientRuntimeError):
+    """
+    Exception raised when a value returned by a dbus-python method could not
+    be decoded according to its signature.
+    """
+
+    def __init__(  # noqa: PLR0913, PLR0917
+        self, message, interface_name, member_name, signature, value
+    ):
+        """
+        Initialize a DPClientUnmarshallingError with the value that failed.
+
+        :param str message: the error message
+        :param str interface_name: the name of the interface
+        :param str member_name: the name of the method or property
+        :param str signature: the D-Bus signature of the value
+        :param object value: the value returned by dbus-python
+        """
+        super().__init__(message, interface_name)
+        self.member_name = member_name
+        self.signature = signature
+        self.value = value
+
+
 class DPClientInvalidArgError(DPClientRuntimeError):
     """
     Exception raised when an invalid argument is passed to a generated method.
@@ -0,0 +1,606 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""
+An in-process stand-in for a dbus-python proxy object, built from the same
+interface specifications that are given to make_class.
+
+The stand-in answers method invocations and the Get, Set and GetAll methods
+of the org.freedesktop.DBus.Properties interface without any bus, so that
+generated classes can be exercised, benchmarked and soak-tested at high
+concurrency. Replies may be delayed, errors may be injected, and each
+method's reply may be fixed in advance.
+"""
+
+import asyncio
+import random
+import threading
+import time
+import xml.etree.ElementTree as ET  # nosec B405
+from collections import Counter
+from typing import Any, Callable, Iterable, NamedTuple
+
+import dbus
+
+from ._signature import complete_types, split_signature
+from ._specs import emits_changed_signal, interface_name_of, method_spec, property_spec
+from ._xformers import signature_xformers
+
+FAILED = "org.freedesktop.DBus.Error.Failed"
+INVALID_ARGS = "org.freedesktop.DBus.Error.InvalidArgs"
+NO_REPLY = "org.freedesktop.DBus.Error.NoReply"
+PROPERTY_READ_ONLY = "org.freedesktop.DBus.Error.PropertyReadOnly"
+UNKNOWN_METHOD = "org.freedesktop.DBus.Error.UnknownMethod"
+UNKNOWN_PROPERTY = "org.freedesktop.DBus.Error.UnknownProperty"
+
+# The Python value from which the default value of each basic type is made
+_DEFAULTS = {"b": False, "d": 0.0, "s": "", "o": "/", "g": ""}
+
+
+class _Method(NamedTuple):
+    """
+    A method of the stand-in.
+    """
+
+    in_signature: str
+    out_signatures: tuple[str, ...]
+
+
+class _Property(NamedTuple):
+    """
+    A property of the stand-in.
+    """
+
+    access: str
+    signature: str
+    policy: str
+
+
+class _Injection:
+    """
+    An error to be raised by some invocations of a member.
+    """
+
+    def __init__(self, error: Exception, count: int | None, probability: float):
+        self.error = error
+        self.count = count
+        self.probability = probability
+
+
+def _default_value(signature: str) -> Any:
+    """
+    Get a Python value of a single complete type, suitable for transforming
+    to a dbus-python value.
+
+    :param str signature: the signature of a single complete type
+    :returns: a false or empty value of the type
+    """
+    code = signature[0]
+    if code == "a":
+        return {} if signature[1] == "{" else []
+    if code == "(":
+        return tuple(
+            _default_value(signature[start:end])
+            for (start, end) in split_signature(signature, 1)
+        )
+    if code == "v":
+        return ("s", "")
+    return _DEFAULTS.get(code, 0)
+
+
+def _default_values(signatures: Iterable[str]) -> list[Any]:
+    """
+    Get a default dbus-python value for each complete type.
+
+    :param signatures: the signature of each complete type
+    :type signatures: iterable of str
+    :returns: the dbus-python values
+    :rtype: list
+    """
+    return [
+        xformer(_default_value(signature))
+        for signature in signatures
+        for xformer in signature_xformers(signature)
+    ]
+
+
+def _dbus_exception(message: str, name: str) -> Exception:
+    """
+    Construct an exception as dbus-python raises for an error reply.
+
+    :param str message: the error message
+    :param str name: the D-Bus error name
+    """
+    return dbus.DBusException(message, name=name)
+
+
+class FakeProxyObject:
+    """
+    Stands in for a dbus-python proxy object which implements some
+    interfaces.
+
+    Methods reply with a default value of each out argument's type unless
+    another reply has been set with set_reply. Properties start with a
+    default value of their type; setting a property stores the new value
+    and emits PropertiesChanged, according to the property's
+    org.freedesktop.DBus.Property.EmitsChangedSignal annotation.
+
+    Invocations are counted in the calls attribute, keyed by interface and
+    member name. Members are named as for InvocationMetrics, e.g.,
+    "CreatePool", "Name.Get", "Name.Set" or "GetAll".
+
+    >>> proxy_object = FakeProxyObject([spec], "/org/example", latency=0.001)
+    >>> proxy_object.set_reply(interface_name, "CreatePool", reply)
+    >>> proxy_object.inject_error(interface_name, "CreatePool", probability=0.1)
+    >>> Manager.Methods.CreatePool(proxy_object, {"name": "pool", ...})
+    """
+
+    def __init__(
+        self,
+        specs: Iterable[ET.Element],
+        object_path: str = "/",
+        *,
+        latency: float | Callable[[], float] = 0.0,
+        seed: int | None = None,
+        bus_name: str | None = None,
+    ):
+        """
+        Initialize the stand-in.
+
+        :param specs: the interface specifications
+        :type specs: iterable of xml.element.ElementTree.Element
+        :param str object_path: the object path of the stand-in
+        :param latency: the seconds before each reply, or a function that
+                        returns the seconds before each reply
+        :type latency: float or a function of no arguments
+        :param seed: the seed for the choice of invocations to fail
+        :type seed: int or NoneType
+        :param bus_name: the bus name of the service
+        :type bus_name: str or NoneType
+        :raises DPClientGenerationError: if a specification is malformed
+        """
+        self.object_path = object_path
+        self.bus_name = bus_name
+        self.latency = latency
+        self.calls: Counter[tuple[str, str]] = Counter()
+
+        self._random = random.Random(seed)  # nosec B311
+        self._lock = threading.Lock()
+        self._methods: dict[tuple[str, str], _Method] = {}
+        self._properties: dict[tuple[str, str], _Property] = {}
+        self._values: dict[tuple[str, str], Any] = {}
+        self._replies: dict[tuple[str, str], Any] = {}
+        self._errors: dict[tuple[str, str], _Injection] = {}
+        self._handlers: list[_Match] = []
+
+        for spec in specs:
+            interface_name = interface_name_of(spec)
+            for method in spec.findall("./method"):
+                in_spec = method_spec(interface_name, method)
+                self._methods[(interface_name, in_spec.name)] = _Method(
+                    in_spec.signature,
+                    tuple(
+                        e.attrib["type"]
+                        for e in method.findall('./arg[@direction="out"]')
+                    ),
+                )
+
+            default_policy = emits_changed_signal(spec)
+            for prop in spec.findall("./property"):
+                prop_spec = property_spec(interface_name, prop)
+                key = (interface_name, prop_spec.name)
+                self._properties[key] = _Property(
+                    prop_spec.access,
+                    prop_spec.signature,
+                    emits_changed_signal(prop, default_policy),
+                )
+                (self._values[key],) = _default_values([prop_spec.signature])
+
+    def set_reply(self, interface_name: str, method_name: str, reply: Any):
+        """
+        Set the reply of a method.
+
+        The reply is None if the method has no out arguments, the value of
+        the out argument if it has one, or a tuple of the values of the out
+        arguments if it has several. If reply is callable, it is called
+        with the method's arguments to obtain the reply, and may raise a
+        dbus.DBusException to reply with an error.
+
+        :param str interface_name: the interface of the method
+        :param str method_name: the name of the method
+        :param reply: the reply, or a function that returns the reply
+        :raises KeyError: if the method is not specified
+        """
+        key = (interface_name, method_name)
+        if key not in self._methods:
+            raise KeyError(key)
+        with self._lock:
+            self._replies[key] = reply
+
+    def get_property(self, interface_name: str, name: str) -> Any:
+        """
+        Get the current value of a property.
+
+        :param str interface_name: the interface of the property
+        :param str name: the name of the property
+        :raises KeyError: if the property is not specified
+        """
+        with self._lock:
+            return self._values[(interface_name, name)]
+
+    def set_property(self, interface_name: str, name: str, value: Any):
+        """
+        Set the value of a property, as the service would, emitting
+        PropertiesChanged if the property's changes are signalled.
+
+        :param str interface_name: the interface of the property
+        :param str name: the name of the property
+        :param value: the new value
+        :raises KeyError: if the property is not specified
+        """
+        key = (interface_name, name)
+        policy = self._properties[key].policy
+        with self._lock:
+            self._values[key] = value
+
+        if policy == "true":
+            self._emit_properties_changed(interface_name, {name: value}, [])
+        elif policy == "invalidates":
+            self._emit_properties_changed(interface_name, {}, [name])
+
+    def inject_error(  # noqa: PLR0913, PLR0917
+        self,
+        interface_name: str,
+        member_name: str,
+        error: Exception | None = None,
+        count: int | None = None,
+        probability: float = 1.0,
+    ):
+        """
+        Make invocations of a member fail.
+
+        :param str interface_name: the interface of the member
+        :param str member_name: the member name, as for InvocationMetrics
+        :param error: the exception, by default a dbus.DBusException
+        :type error: Exception or NoneType
+        :param count: the number of invocations to fail, or None for all
+        :type count: int or NoneType
+        :param float probability: the probability that an invocation fails
+        """
+        if error is None:
+            error = _dbus_exception(
+                f"Injected error for {interface_name}.{member_name}", FAILED
+            )
+        with self._lock:
+            self._errors[(interface_name, member_name)] = _Injection(
+                error, count, probability
+            )
+
+    def clear_errors(self):
+        """
+        Stop failing invocations.
+        """
+        with self._lock:
+            self._errors.clear()
+
+    def get_dbus_method(
+        self, member: str, dbus_interface: str | None = None
+    ) -> Callable[..., Any]:
+        """
+        Get a function which invokes a method, as a proxy object does.
+
+        The function accepts the dbus_interface, signature, timeout,
+        reply_handler and error_handler keyword arguments that dbus-python
+        accepts. If reply_handler is given, the function returns at once,
+        and the handler is called after the latency, on the running event
+        loop if there is one and otherwise on another thread.
+
+        :param str member: the name of the method
+        :param dbus_interface: the interface of the method
+        :type dbus_interface: str or NoneType
+        """
+
+        def dbus_method(*args: Any, **kwargs: Any) -> Any:
+            """
+            Invoke the method.
+            """
+            reply_handler = kwargs.pop("reply_handler", None)
+            error_handler = kwargs.pop("error_handler", None)
+            timeout = kwargs.pop("timeout", -1)
+
+            delay = self.latency() if callable(self.latency) else self.latency
+            try:
+                values = self._invoke(
+                    kwargs.pop("dbus_interface", dbus_interface),
+                    member,
+                    args,
+                    kwargs.pop("signature", None),
+                )
+                if 0 <= timeout < delay:
+                    delay = timeout
+                    raise _dbus_exception(
+                        f"No reply within {timeout} seconds", NO_REPLY
+                    )
+            except Exception as err:
+                if reply_handler is None:
+                    if delay:
+                        time.sleep(delay)
+                    raise
+                _schedule(delay, error_handler, err)
+                return None
+
+            if reply_handler is None:
+                if delay:
+                    time.sleep(delay)
+                if not values:
+                    return None
+                return values[0] if len(values) == 1 else tuple(values)
+
+            _schedule(delay, reply_handler, *values)
+            return None
+
+        return dbus_method
+
+    def connect_to_signal(
+        self,
+        signal_name: str,
+        handler_function: Callable[..., Any],
+        dbus_interface: str | None = None,
+        **keywords: Any,
+    ) -> "_Match":
+        """
+        Arrange for a function to be called when a signal is emitted.
+
+        Only the PropertiesChanged signal is ever emitted, when a property
+        is set. The path_keyword keyword argument is supported.
+
+        :param str signal_name: the name of the signal
+        :param handler_function: the function to call
+        :param dbus_interface: the interface of the signal
+        :type dbus_interface: str or NoneType
+        :returns: the match, which has a remove method
+        """
+        match = _Match(self, signal_name, dbus_interface, handler_function, keywords)
+        with self._lock:
+            self._handlers.append(match)
+        return match
+
+    def __getattr__(self, member: str) -> Callable[..., Any]:
+        """
+        Get a function which invokes a method, as a proxy object does.
+        """
+        if member.startswith("__"):
+            raise AttributeError(member)
+        return self.get_dbus_method(member)
+
+    def _invoke(
+        self,
+        dbus_interface: str | None,
+        member: str,
+        args: tuple[Any, ...],
+        signature: str | None,
+    ) -> list[Any]:
+        """
+        Invoke a method.
+
+        :param dbus_interface: the interface of the method
+        :type dbus_interface: str or NoneType
+        :param str member: the name of the method
+        :param args: the arguments
+        :param signature: the signature of the arguments, if given
+        :type signature: str or NoneType
+        :returns: the values of the out arguments
+        :raises Exception: if the method replies with an error
+        """
+        if dbus_interface == dbus.PROPERTIES_IFACE:
+            return self._invoke_properties(member, args, signature)
+
+        if dbus_interface is None:
+            dbus_interface = next(
+                (i for (i, m) in self._methods if m == member), "<unknown>"
+            )
+        key = (dbus_interface, member)
+        try:
+            method = self._methods[key]
+        except KeyError as err:
+            raise _dbus_exception(
+                f"No method {member} in interface {dbus_interface}", UNKNOWN_METHOD
+            ) from err
+
+        self._count(dbus_interface, member)
+        self._check_args(method.in_signature, args, signature)
+
+        with self._lock:
+            reply: Any = self._replies.get(key)
+        if reply is None:
+            return _default_values(method.out_signatures)
+        if callable(reply):
+            reply = reply(*args)
+
+        if len(method.out_signatures) == 0:
+            return []
+        if len(method.out_signatures) == 1:
+            return [reply]
+        return list(reply)
+
+    def _invoke_properties(
+        self, member: str, args: tuple[Any, ...], signature: str | None
+    ) -> list[Any]:
+        """
+        Invoke a method of the org.freedesktop.DBus.Properties interface.
+
+        :param str member: the name of the method
+        :param args: the arguments
+        :param signature: the signature of the arguments, if given
+        :type signature: str or NoneType
+        :returns: the values of the out arguments
+        :raises Exception: if the method replies with an error
+        """
+        if member == "GetAll":
+            self._check_args("s", args, signature)
+            (interface_name,) = args
+            self._count(interface_name, "GetAll")
+            with self._lock:
+                return [
+                    {
+                        name: self._values[(i, name)]
+                        for ((i, name), prop) in self._properties.items()
+                        if i == interface_name and prop.access != "write"
+                    }
+                ]
+
+        if member not in ("Get", "Set"):
+            raise _dbus_exception(
+                f"No method {member} in interface {dbus.PROPERTIES_IFACE}",
+                UNKNOWN_METHOD,
+            )
+
+        self._check_args("ss" if member == "Get" else "ssv", args, signature)
+        (interface_name, name) = args[:2]
+        key = (interface_name, name)
+        try:
+            prop = self._properties[key]
+        except KeyError as err:
+            raise _dbus_exception(
+                f"No property {name} in interface {interface_name}", UNKNOWN_PROPERTY
+            ) from err
+
+        self._count(interface_name, f"{name}.{member}")
+        if member == "Get":
+            if prop.access == "write":
+                raise _dbus_exception(f"Property {name} is write only", FAILED)
+            return [self.get_property(interface_name, name)]
+
+        if prop.access == "read":
+            raise _dbus_exception(f"Property {name} is read only", PROPERTY_READ_ONLY)
+        self.set_property(interface_name, name, args[2])
+        return []
+
+    def _count(self, interface_name: str, member_name: str):
+        """
+        Count an invocation, and raise the injected error, if any.
+
+        :param str interface_name: the interface of the member
+        :param str member_name: the member name, as for InvocationMetrics
+        :raises Exception: the injected error
+        """
+        key = (interface_name, member_name)
+        with self._lock:
+            self.calls[key] += 1
+            injection = self._errors.get(key)
+            if injection is None or self._random.random() >= injection.probability:
+                return
+            if injection.count is not None:
+                injection.count -= 1
+                if injection.count <= 0:
+                    del self._errors[key]
+        raise injection.error
+
+    @staticmethod
+    def _check_args(in_signature: str, args: tuple[Any, ...], signature: str | None):
+        """
+        Check that the arguments agree with the method's signature.
+
+        :param str in_signature: the signature of the in arguments
+        :param args: the arguments
+        :param signature: the signature of the arguments, if given
+        :type signature: str or NoneType
+        :raises dbus.DBusException: if the arguments do not agree
+        """
+        if (signature is not None and signature != in_signature) or len(args) != len(
+            complete_types(in_signature)
+        ):
+            raise _dbus_exception(
+                f'Arguments do not match signature "{in_signature}"', INVALID_ARGS
+            )
+
+    def _disconnect(self, match: "_Match"):
+        """
+        Stop calling the handler of a match.
+
+        :param _Match match: the match
+        """
+        with self._lock:
+            if match in self._handlers:
+                self._handlers.remove(match)
+
+    def _emit_properties_changed(
+        self,
+        interface_name: str,
+        changed_properties: dict[str, Any],
+        invalidated_properties: list[str],
+    ):
+        """
+        Call the handlers of the PropertiesChanged signal.
+
+        :param str interface_name: the interface whose properties changed
+        :param changed_properties: the new values of changed properties
+        :param invalidated_properties: the names of invalidated properties
+        """
+        with self._lock:
+            matches = [
+                match
+                for match in self._handlers
+                if match.signal_name == "PropertiesChanged"
+                and match.dbus_interface in (None, dbus.PROPERTIES_IFACE)
+            ]
+        for match in matches:
+            match.handler(
+                interface_name,
+                changed_properties,
+                invalidated_properties,
+                **match.keywords(),
+            )
+
+
+class _Match:
+    """
+    A handler for a signal of a FakeProxyObject.
+    """
+
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        proxy_object: FakeProxyObject,
+        signal_name: str,
+        dbus_interface: str | None,
+        handler: Callable[..., Any],
+        keywords: dict[str, Any],
+    ):
+        self.proxy_object = proxy_object
+        self.signal_name = signal_name
+        self.dbus_interface = dbus_interface
+        self.handler = handler
+        self.path_keyword = keywords.get("path_keyword")
+
+    def keywords(self) -> dict[str, Any]:
+        """
+        Get the keyword arguments passed to the handler.
+        """
+        return (
+            {}
+            if self.path_keyword is None
+            else {self.path_keyword: self.proxy_object.object_path}
+        )
+
+    def remove(self):
+        """
+        Stop calling the handler.
+        """
+        self.proxy_object._disconnect(self)
+
+
+def _schedule(delay: float, func: Callable[..., Any], *args: Any):
+    """
+    Call a function after a delay, on the running event loop if there is
+    one and otherwise on another thread.
+
+    :param float delay: the delay in seconds
+    :param func: the function
+    :param args: the arguments of the function
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        threading.Timer(delay, func, args).start()
+    else:
+        loop.call_later(delay, func, *args)
@@ -5,28 +5,223 @@
 Code for generating classes suitable for invoking dbus-python methods.
 """
 
+import copyreg
+import functools
+import hashlib
+import pickle  # nosec B403
 import types
+import weakref
 import xml.etree.ElementTree as ET  # nosec B405
-from typing import Any, Callable, Mapping, MutableMapping, Sequence, Type
+from typing import Any, Callable, Collection, Mapping, MutableMapping, Sequence, Type
 
 import dbus
 from dbus.proxies import ProxyObject
-from into_dbus_python import IntoDPError, xformer, xformers
-
-from ._errors import (
-    DPClientGenerationError,
-    DPClientGetPropertyContext,
-    DPClientInvocationError,
-    DPClientKeywordError,
-    DPClientMarshallingError,
-    DPClientMethodCallContext,
-    DPClientSetPropertyContext,
+from into_dbus_python import IntoDPError
+
+from ._accessors import PropertyAccessors
+from ._async import call_async
+from ._bound import make_bind
+from ._compiled import compile_method
+from ._decoders import (
+    args_decoder,
+    complete_type_decoder,
+    decoding,
+    make_result_type,
+    reply_decoder,
 )
+from ._errors import DPClientGenerationError
+from ._metrics import instrument, timed_marshaller
+from ._property_cache import PropertyCache, cached_getter, invalidating_setter
+from ._runtime import (
+    method_invocation_error,
+    method_keyword_error,
+    method_marshalling_error,
+    property_get_error,
+    property_marshalling_error,
+    property_set_error,
+)
+from ._signals import Signal
+from ._single_flight import SingleFlight, coalescing
+from ._snapshot import make_get_all
+from ._specs import (
+    MethodSpec,
+    PropertySpec,
+    check_method_spec,
+    check_property_spec,
+    emits_changed_signal,
+    interface_name_of,
+    method_out_spec,
+    method_spec,
+    property_spec,
+    signal_spec,
+)
+from ._version import __version__
+from ._xformers import signature_xformer, signature_xformers
+
+# Name of the class attribute which holds the members of a lazily generated
+# class that have not yet been generated.
+_PENDING_MEMBERS = "_pending_members"
+
+# Name of the class attribute which holds the names of the members that
+# were excluded from generation.
+_EXCLUDED_MEMBERS = "_excluded_members"
+
+# Name of the class attribute which holds the name, the specification and
+# the options from which a generated class was made. The specification is
+# serialized only when the class is pickled, so that classes which are never
+# pickled do not pay for it.
+_MAKE_CLASS_ARGS = "_make_class_args"
+
+# The options of make_class whose values are objects of the process in
+# which the class is made; a class made with any of them can not be pickled.
+_LOCAL_OPTIONS = ("property_cache", "metrics", "single_flight")
+
+# The options of make_class whose values are collections of names
+_NAMES_OPTIONS = ("read_only_methods", "members", "exclude_members")
+
+# Generated classes which have been pickled or unpickled, by key; a process
+# forked from one which holds a class unpickles it without remaking it.
+_PICKLED_CLASSES: "weakref.WeakValueDictionary[str, type]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+class LazyNamespace(type):
+    """
+    Metaclass of the Methods, Properties and Signals classes of lazily
+    generated classes, and of classes from which members were excluded.
+
+    Members are generated on first access and then cached on the class.
+    Access to an excluded member is an error which says so.
+    """
+
+    def __getattr__(cls, name: str) -> Any:
+        """
+        Generate the member, name, if it is pending.
+
+        :param str name: the name of the member
+        :raises AttributeError: if there is no such member
+        :raises DPClientGenerationError:
+        """
+        pending = vars(cls).get(_PENDING_MEMBERS, {})
+        try:
+            build = pending[name]
+        except KeyError as err:
+            if name in vars(cls).get(_EXCLUDED_MEMBERS, ()):
+                raise AttributeError(
+                    f"type object '{cls.__name__}' has no attribute '{name}', "
+                    "which was excluded when the class was made"
+                ) from err
+            raise AttributeError(
+                f"type object '{cls.__name__}' has no attribute '{name}'"
+            ) from err
+
+        setattr(cls, name, build())
+        pending.pop(name, None)
+        return type.__getattribute__(cls, name)
+
+    def __dir__(cls) -> list[str]:
+        """
+        Include members which are pending.
+        """
+        return sorted(set(super().__dir__()) | set(vars(cls).get(_PENDING_MEMBERS, {})))
+
+
+class GeneratedClass(type):
+    """
+    Metaclass of the classes made by make_class.
+
+    Such classes are pickled by their name, specification and options, not
+    by reference to a module, and are made again, once per process, when
+    they are unpickled.
+    """
+
+
+def _pickled_class_key(name: str, spec_text: str, options: Mapping[str, Any]) -> str:
+    """
+    Get the key of a pickled class: a hash of the version of this package,
+    the name of the class, its specification and its options.
+
+    :param str name: the name of the class
+    :param str spec_text: the interface specification, as XML
+    :param options: the keyword arguments of make_class
+    :type options: mapping of str * object
+    :rtype: str
+    """
+    return hashlib.sha256(
+        f"{__version__}\0{name}\0{spec_text}\0{sorted(options.items())!r}".encode()
+    ).hexdigest()
 
 
-def prop_builder(  # noqa: PLR0915
-    interface_name: str, properties: Sequence[ET.Element], default_timeout: int
-) -> Callable[[MutableMapping[str, Type]], None]:
+def _make_pickled_class(name: str, spec_text: str, options: Mapping[str, Any]) -> Type:
+    """
+    Get the class which was pickled, making it only if this process does
+    not already have it.
+
+    :param str name: the name of the class
+    :param str spec_text: the interface specification, as XML
+    :param options: the keyword arguments of make_class
+    :type options: mapping of str * object
+    :rtype: type
+    """
+    key = _pickled_class_key(name, spec_text, options)
+    klass = _PICKLED_CLASSES.get(key)
+    if klass is None:
+        klass = make_class(name, ET.fromstring(spec_text), **options)  # nosec B314
+        klass = _PICKLED_CLASSES.setdefault(key, klass)
+    return klass
+
+
+def _reduce_class(klass: Type) -> tuple[Callable[..., Type], tuple[Any, ...]]:
+    """
+    Reduce a generated class, for pickling, to a call to make it again.
+
+    :param type klass: the generated class
+    :raises pickle.PicklingError: if the class was made with options which
+            belong to this process
+    """
+    (name, spec, options) = type.__getattribute__(klass, _MAKE_CLASS_ARGS)
+    local = [option for option in _LOCAL_OPTIONS if options[option] is not None]
+    if local:
+        raise pickle.PicklingError(
+            f'Class "{name}" can not be pickled, because it was made with '
+            f"objects of this process as options ({', '.join(local)})"
+        )
+
+    options = {
+        option: value
+        for (option, value) in options.items()
+        if option not in _LOCAL_OPTIONS
+    }
+    for option in _NAMES_OPTIONS:
+        if options[option] is not None:
+            options[option] = tuple(sorted(options[option]))
+
+    spec_text = ET.tostring(spec, encoding="unicode")
+    _PICKLED_CLASSES.setdefault(_pickled_class_key(name, spec_text, options), klass)
+    return (_make_pickled_class, (name, spec_text, options))
+
+
+copyreg.pickle(GeneratedClass, _reduce_class)
+
+
+def prop_builder(  # noqa: PLR0913, PLR0915
+    interface_name: str,
+    properties: Sequence[ET.Element],
+    default_timeout: int,
+    *,
+    lazy: bool = False,
+    validate: bool = False,
+    asynchronous: bool = False,
+    property_cache: PropertyCache | None = None,
+    changed_signal_default: str = "true",
+    metrics: Any = None,
+    decode: bool = False,
+    single_flight: SingleFlight | None = None,
+    compact: bool = False,
+    passthrough: bool = False,
+    strict_passthrough: bool = False,
+) -> Callable[[MutableMapping[str, Any]], None]:
     """
     Returns a function that builds a property interface based on arguments.
 
@@ -49,9 +244,28 @@ def prop_builder(  # noqa: PLR0915
     :param properties: iterable of interface specifications for each property
     :type properties: iterable of xml.element.ElementTree.Element
     :param int default_timeout: the D-Bus timeout, -1 is the libdbus default ~25s
+    :param bool lazy: if True, defer generating each property until first use
+    :param bool validate: if True and lazy, check the signatures immediately
+    :param bool asynchronous: if True, generate coroutine functions
+    :param property_cache: if not None, the cache consulted by getters
+    :type property_cache: PropertyCache or NoneType
+    :param str changed_signal_default: the EmitsChangedSignal annotation of
+           properties that are not annotated
+    :param metrics: if not None, the object which records each invocation
+    :param bool decode: if True, decode values into native Python types
+    :param single_flight: if not None, the record by which concurrent
+                          identical invocations of getters are coalesced
+    :type single_flight: SingleFlight or NoneType
+    :param bool compact: if True, represent each property by a
+                         PropertyAccessors object rather than a class
+    :param bool passthrough: if True, pass through values which are already
+                             of the dbus-python type of the property
+    :param bool strict_passthrough: if True, pass through values only if
+                                    their contents are also of the right type
 
     :raises DPClientGenerationError:
     """
+    call_options = {"byte_arrays": True} if decode else {}
 
     def build_property_getter(name: str) -> Callable[[ProxyObject], Any]:
         """
@@ -59,6 +273,29 @@ def prop_builder(  # noqa: PLR0915
 
         :param str name: the name of the property
         """
+        if asynchronous:
+
+            async def async_dbus_func(
+                proxy_object: ProxyObject, *, timeout: int = default_timeout
+            ) -> Any:
+                """
+                The property getter, which does not block.
+
+                :raises DPClientInvocationError:
+                """
+                try:
+                    return await call_async(
+                        proxy_object.Get,
+                        interface_name,
+                        name,
+                        dbus_interface=dbus.PROPERTIES_IFACE,
+                        timeout=timeout,
+                        **call_options,
+                    )
+                except dbus.DBusException as err:
+                    raise property_get_error(interface_name, name) from err
+
+            return async_dbus_func
 
         def dbus_func(
             proxy_object: ProxyObject, *, timeout: int = default_timeout
@@ -74,21 +311,14 @@ def prop_builder(  # noqa: PLR0915
                     name,
                     dbus_interface=dbus.PROPERTIES_IFACE,
                     timeout=timeout,
+                    **call_options,
                 )
             except dbus.DBusException as err:  # pragma: no cover
-                err_msg = (
-                    f'Error while getting value for property "{name}" '
-                    f'belonging to interface "{interface_name}"'
-                )
-                raise DPClientInvocationError(
-                    err_msg, interface_name, DPClientGetPropertyContext(name)
-                ) from err
+                raise property_get_error(interface_name, name) from err
 
         return dbus_func
 
-    def build_property_setter(
-        name: str, signature
-    ) -> Callable[[ProxyObject, Any], None]:
+    def build_property_setter(name: str, signature) -> Callable[..., Any]:
         """
         Build a single property setter for this class.
 
@@ -96,7 +326,13 @@ def prop_builder(  # noqa: PLR0915
         :param str signature: the signature of the property
         """
         try:
-            func = xformers(signature)[0][0]
+            (func,) = signature_xformers(
+                signature,
+                passthrough=passthrough or strict_passthrough,
+                strict=strict_passthrough,
+            )
+            if metrics is not None:
+                func = timed_marshaller(func)
         except IntoDPError as err:  # pragma: no cover
             fmt_str = (
                 "Failed to generate argument-transforming function from "
@@ -107,6 +343,37 @@ def prop_builder(  # noqa: PLR0915
                 fmt_str % (signature, name, interface_name)
             ) from err
 
+        if asynchronous:
+
+            async def async_dbus_func(
+                proxy_object: ProxyObject, value: Any, *, timeout: int = default_timeout
+            ) -> None:
+                """
+                The property setter, which does not block.
+
+                :raises DPClientRuntimeError:
+                """
+                try:
+                    arg = func(value, variant=1)
+                except IntoDPError as err:
+                    raise property_marshalling_error(
+                        interface_name, name, signature, value
+                    ) from err
+
+                try:
+                    await call_async(
+                        proxy_object.Set,
+                        interface_name,
+                        name,
+                        arg,
+                        dbus_interface=dbus.PROPERTIES_IFACE,
+                        timeout=timeout,
+                    )
+                except dbus.DBusException as err:
+                    raise property_set_error(interface_name, name, arg) from err
+
+            return async_dbus_func
+
         def dbus_func(
             proxy_object: ProxyObject, value: Any, *, timeout: int = default_timeout
         ) -> None:
@@ -118,13 +385,8 @@ def prop_builder(  # noqa: PLR0915
             try:
                 arg = func(value, variant=1)
             except IntoDPError as err:
-                err_msg = (
-                    f'Failed to format argument "{value}" according to signature '
-                    f'"{signature}" for setter method for property "{name}" belonging to '
-                    f'interface "{interface_name}"'
-                )
-                raise DPClientMarshallingError(
-                    err_msg, interface_name, signature, [value]
+                raise property_marshalling_error(
+                    interface_name, name, signature, value
                 ) from err
 
             try:  # pragma: no cover
@@ -136,18 +398,60 @@ def prop_builder(  # noqa: PLR0915
                     timeout=timeout,
                 )
             except dbus.DBusException as err:  # pragma: no cover
-                err_msg = (
-                    f'Error while setting value of property "{name}" '
-                    f'belonging to interface "{interface_name}" to value "{arg!r}"'
-                )
-                raise DPClientInvocationError(
-                    err_msg, interface_name, DPClientSetPropertyContext(name, arg)
-                ) from err
+                raise property_set_error(interface_name, name, arg) from err
 
         return dbus_func
 
+    def build_cached_property_getter(
+        name: str, signature: str, policy: str
+    ) -> Callable[..., Any]:
+        """
+        Build a single property getter, which coalesces identical
+        invocations and consults the property cache, if required, and
+        decodes the value, if required.
+
+        :param str name: the name of the property
+        :param str signature: the signature of the property
+        :param str policy: the EmitsChangedSignal annotation of the property
+        """
+        getter = build_property_getter(name)
+        if metrics is not None:
+            getter = instrument(metrics, interface_name, f"{name}.Get", getter)
+        if single_flight is not None:
+            getter = coalescing(single_flight, interface_name, f"{name}.Get", getter)
+        if property_cache is not None:
+            getter = cached_getter(
+                property_cache, interface_name, name, policy, getter, default_timeout
+            )
+        if decode:
+            getter = decoding(
+                interface_name,
+                name,
+                signature,
+                complete_type_decoder(signature),
+                getter,
+            )
+        return getter
+
+    def build_cached_property_setter(name: str, signature: str) -> Callable[..., Any]:
+        """
+        Build a single property setter, which invalidates the property's
+        cached value, if any.
+
+        :param str name: the name of the property
+        :param str signature: the signature of the property
+        """
+        setter = build_property_setter(name, signature)
+        if metrics is not None:
+            setter = instrument(metrics, interface_name, f"{name}.Set", setter)
+        if property_cache is None:
+            return setter
+        return invalidating_setter(
+            property_cache, interface_name, name, setter, default_timeout
+        )
+
     def build_property(
-        access: str, name: str, signature: str
+        access: str, name: str, signature: str, policy: str
     ) -> Callable[[MutableMapping[str, Callable]], None]:
         """
         Select among getter, setter, or both methods for a given property.
@@ -155,11 +459,12 @@ def prop_builder(  # noqa: PLR0915
         :param str access: "read", "write", or "readwrite"
         :param str name: the name of the property
         :param str signature: the signature of the property
+        :param str policy: the EmitsChangedSignal annotation of the property
 
         :returns: a function which adds up to two methods to the namespace
         """
         if access == "read":
-            getter = build_property_getter(name)
+            getter = build_cached_property_getter(name, signature, policy)
 
             def prop_method_builder(namespace: MutableMapping[str, Callable]) -> None:
                 """
@@ -168,7 +473,7 @@ def prop_builder(  # noqa: PLR0915
                 namespace["Get"] = staticmethod(getter)
 
         elif access == "write":  # pragma: no cover
-            setter = build_property_setter(name, signature)
+            setter = build_cached_property_setter(name, signature)
 
             def prop_method_builder(namespace: MutableMapping[str, Callable]) -> None:
                 """
@@ -177,8 +482,8 @@ def prop_builder(  # noqa: PLR0915
                 namespace["Set"] = staticmethod(setter)
 
         else:
-            getter = build_property_getter(name)
-            setter = build_property_setter(name, signature)
+            getter = build_cached_property_getter(name, signature, policy)
+            setter = build_cached_property_setter(name, signature)
 
             def prop_method_builder(namespace: MutableMapping[str, Callable]) -> None:
                 """
@@ -189,7 +494,38 @@ def prop_builder(  # noqa: PLR0915
 
         return prop_method_builder
 
-    def builder(namespace: MutableMapping[str, Type]) -> None:
+    def build_property_class(
+        access: str, name: str, signature: str, policy: str
+    ) -> Type | PropertyAccessors:
+        """
+        Build the class for a single property, or its accessors if compact.
+
+        :param str access: "read", "write", or "readwrite"
+        :param str name: the name of the property
+        :param str signature: the signature of the property
+        :param str policy: the EmitsChangedSignal annotation of the property
+        """
+        if "write" in access or decode:
+            check_property_spec(interface_name, PropertySpec(name, access, signature))
+        if compact:
+            return PropertyAccessors(
+                name,
+                access,
+                signature,
+                build_cached_property_getter(name, signature, policy)
+                if "read" in access
+                else None,
+                build_cached_property_setter(name, signature)
+                if "write" in access
+                else None,
+            )
+        return types.new_class(
+            name,
+            bases=(object,),
+            exec_body=build_property(access, name, signature, policy),
+        )
+
+    def builder(namespace: MutableMapping[str, Any]) -> None:
         """
         Fills the namespace of the parent class with class members that are
         classes. Each class member has the name of a property, and each
@@ -207,44 +543,67 @@ def prop_builder(  # noqa: PLR0915
         A class called "Version" with a single method "Get" will be added to the
         namespace.
 
+        A GetAll method, which gets all readable properties in a single call,
+        is also added, unless the interface has a property of that name.
+
         :param namespace: the class's namespace
         """
+        pending = {}
+        readable = []
+        signatures = {}
         for prop in properties:
-            try:
-                name = prop.attrib["name"]
-            except KeyError as err:  # pragma: no cover
-                fmt_str = (
-                    'No name attribute found for property belonging to interface "%s"'
+            the_property_spec = property_spec(interface_name, prop)
+            (name, access, signature) = the_property_spec
+            policy = emits_changed_signal(prop, changed_signal_default)
+            if "read" in access:
+                readable.append(name)
+                if decode:
+                    check_property_spec(interface_name, the_property_spec)
+                    signatures[name] = signature
+            if lazy:
+                if validate and "write" in access:
+                    check_property_spec(interface_name, the_property_spec)
+                pending[name] = functools.partial(
+                    build_property_class, access, name, signature, policy
                 )
-                raise DPClientGenerationError(fmt_str % interface_name) from err
-
-            try:
-                access = prop.attrib["access"]
-            except KeyError as err:  # pragma: no cover
-                fmt_str = (
-                    'No access attribute found for property "%s" '
-                    'belonging to interface "%s"'
-                )
-                raise DPClientGenerationError(fmt_str % (name, interface_name)) from err
-            try:
-                signature = prop.attrib["type"]
-            except KeyError as err:  # pragma: no cover
-                fmt_str = (
-                    'No type attribute found for property "%s" '
-                    'belonging to interface "%s"'
-                )
-                raise DPClientGenerationError(fmt_str % (name, interface_name)) from err
-
-            namespace[name] = types.new_class(
-                name, bases=(object,), exec_body=build_property(access, name, signature)
+            else:
+                namespace[name] = build_property_class(access, name, signature, policy)
+
+        if lazy:
+            namespace[_PENDING_MEMBERS] = pending
+
+        if "GetAll" not in namespace and "GetAll" not in pending:
+            get_all = make_get_all(
+                interface_name,
+                readable,
+                default_timeout,
+                asynchronous=asynchronous,
+                signatures=signatures if decode else None,
             )
+            if metrics is not None:
+                get_all = instrument(metrics, interface_name, "GetAll", get_all)
+            namespace["GetAll"] = staticmethod(get_all)
 
     return builder
 
 
-def method_builder(
-    interface_name: str, methods: Sequence[ET.Element], default_timeout: int
-) -> Callable[[MutableMapping[str, Callable]], None]:
+def method_builder(  # noqa: PLR0913, PLR0915
+    interface_name: str,
+    methods: Sequence[ET.Element],
+    default_timeout: int,
+    *,
+    compiled: bool = False,
+    lazy: bool = False,
+    validate: bool = False,
+    asynchronous: bool = False,
+    metrics: Any = None,
+    decode: bool = False,
+    named_results: bool = False,
+    single_flight: SingleFlight | None = None,
+    read_only_methods: Collection[str] = (),
+    passthrough: bool = False,
+    strict_passthrough: bool = False,
+) -> Callable[[MutableMapping[str, Any]], None]:
     """
     Returns a function that builds a method interface based on 'spec'.
 
@@ -263,40 +622,91 @@ def method_builder(
     :param methods: the iterable of interface specification for each method
     :type methods: iterator of xml.element.ElementTree.Element
     :param int default_timeout: D-Bus timeout, -1 is the libdbus default ~25s.
+    :param bool compiled: if True, generate a specialized invoker for each method
+    :param bool lazy: if True, defer generating each method until first use
+    :param bool validate: if True and lazy, check the signatures immediately
+    :param bool asynchronous: if True, generate coroutine functions
+    :param metrics: if not None, the object which records each invocation
+    :param bool decode: if True, decode results into native Python types
+    :param bool named_results: if True, return named tuples of out-arguments
+    :param single_flight: if not None, the record by which concurrent
+                          identical invocations of read-only methods are
+                          coalesced
+    :type single_flight: SingleFlight or NoneType
+    :param read_only_methods: the names of the methods which only read the
+                              state of the service
+    :type read_only_methods: collection of str
+    :param bool passthrough: if True, pass through arguments which are
+                             already of the dbus-python type of the argument
+    :param bool strict_passthrough: if True, pass through arguments only if
+                                    their contents are also of the right type
 
     :raises DPClientGenerationError:
     """
+    call_options = {"byte_arrays": True} if decode else {}
 
-    def build_method(
-        name: str, inargs: Sequence[ET.Element]
+    def build_compiled_method(
+        name: str, arg_names: Sequence[str], signature: str
     ) -> Callable[[ProxyObject, Mapping[str, Any]], Any]:
         """
-        Build a method for this class.
+        Build a specialized invoker for a method.
 
         :param str name: the name of the method
-        :param inargs: the in-arguments to this methods
-        :type inargs: iterable of Element
+        :param arg_names: the names of the in-arguments, in signature order
+        :type arg_names: sequence of str
+        :param str signature: the signature of the in-arguments
         """
         try:
-            arg_names = [e.attrib["name"] for e in inargs]
-        except KeyError as err:  # pragma: no cover
-            fmt_str = (
-                "No name attribute found for some argument for method "
-                '"%s" belonging to interface "%s"'
+            funcs = signature_xformers(
+                signature,
+                passthrough=passthrough or strict_passthrough,
+                strict=strict_passthrough,
             )
-            raise DPClientGenerationError(fmt_str % (name, interface_name)) from err
-
-        try:
-            signature = "".join(e.attrib["type"] for e in inargs)
-        except KeyError as err:  # pragma: no cover
+            if metrics is not None:
+                funcs = [timed_marshaller(func) for func in funcs]
+        except IntoDPError as err:  # pragma: no cover
             fmt_str = (
-                "No type attribute found for some argument for method "
-                '"%s" belonging to interface "%s"'
+                "Failed to generate argument-transforming functions "
+                'from signature "%s" for method "%s" belonging to '
+                'interface "%s"'
             )
-            raise DPClientGenerationError(fmt_str % (name, interface_name)) from err
+            raise DPClientGenerationError(
+                fmt_str % (signature, name, interface_name)
+            ) from err
+
+        return compile_method(
+            interface_name,
+            name,
+            arg_names,
+            signature,
+            funcs,
+            default_timeout,
+            asynchronous=asynchronous,
+            byte_arrays=decode,
+        )
+
+    def build_method(
+        name: str, arg_names: Sequence[str], signature: str
+    ) -> Callable[[ProxyObject, Mapping[str, Any]], Any]:
+        """
+        Build a method for this class.
+
+        :param str name: the name of the method
+        :param arg_names: the names of the in-arguments, in signature order
+        :type arg_names: sequence of str
+        :param str signature: the signature of the in-arguments
+        """
+        if compiled:
+            return build_compiled_method(name, arg_names, signature)
 
         try:
-            func = xformer(signature)
+            func = signature_xformer(
+                signature,
+                passthrough=passthrough or strict_passthrough,
+                strict=strict_passthrough,
+            )
+            if metrics is not None:
+                func = timed_marshaller(func)
         except IntoDPError as err:  # pragma: no cover
             fmt_str = (
                 "Failed to generate argument-transforming function "
@@ -308,6 +718,54 @@ def method_builder(
             ) from err
         arg_names_set = frozenset(arg_names)
 
+        if asynchronous:
+
+            async def async_dbus_func(
+                proxy_object: ProxyObject,
+                func_args: Mapping[str, Any],
+                *,
+                timeout=default_timeout,
+            ) -> Any:
+                """
+                The method proper, which does not block.
+
+                :param func_args: The function arguments
+                :type func_args: dict
+                :raises DPClientRuntimeError:
+                """
+                if arg_names_set != frozenset(func_args.keys()):
+                    raise method_keyword_error(
+                        interface_name, name, arg_names, func_args
+                    )
+
+                args = [func_args[arg_name] for arg_name in arg_names]
+
+                try:
+                    xformed_args = func(args)
+                except IntoDPError as err:
+                    raise method_marshalling_error(
+                        interface_name, name, signature, args
+                    ) from err
+
+                dbus_method = proxy_object.get_dbus_method(
+                    name, dbus_interface=interface_name
+                )
+
+                try:
+                    return await call_async(
+                        dbus_method,
+                        *xformed_args,
+                        signature=signature,
+                        timeout=timeout,
+                        **call_options,
+                    )
+                except dbus.DBusException as err:
+                    raise method_invocation_error(
+                        interface_name, name, xformed_args
+                    ) from err
+
+            return async_dbus_func
+
         def dbus_func(
             proxy_object: ProxyObject,
             func_args: Mapping[str, Any],
@@ -322,17 +780,7 @@ def method_builder(
             :raises DPClientRuntimeError:
             """
             if arg_names_set != frozenset(func_args.keys()):
-                param_list = list(arg_names_set)
-                arg_list = list(func_args.keys())
-                err_msg = (
-                    f"Argument keywords passed ({', '.join(arg_list)}) did not match "
-                    f"argument keywords expected ({', '.join(param_list)}) "
-                    f'for method "{name}" '
-                    f'belonging to interface "{interface_name}"',
-                )
-                raise DPClientKeywordError(
-                    err_msg, interface_name, name, arg_list, param_list
-                )
+                raise method_keyword_error(interface_name, name, arg_names, func_args)
 
             args = [
                 v
@@ -344,14 +792,8 @@ def method_builder(
             try:  # pragma: no cover
                 xformed_args = func(args)
             except IntoDPError as err:  # pragma: no cover
-                arg_str = ", ".join(str(arg) for arg in args)
-                err_msg = (
-                    f"Failed to format arguments ({arg_str}) according to "
-                    f'signature "{signature}" for method "{name}" belonging to '
-                    f'interface "{interface_name}"'
-                )
-                raise DPClientMarshallingError(
-                    err_msg, interface_name, signature, args
+                raise method_marshalling_error(
+                    interface_name, name, signature, args
                 ) from err
 
             dbus_method = proxy_object.get_dbus_method(
@@ -359,22 +801,80 @@ def method_builder(
             )  # pragma: no cover
 
             try:  # pragma: no cover
-                return dbus_method(*xformed_args, signature=signature, timeout=timeout)
-            except dbus.DBusException as err:  # pragma: no cover
-                arg_str = ", ".join(repr(arg) for arg in xformed_args)
-                err_msg = (
-                    f'Error while invoking method "{name}" belonging to '
-                    f'interface "{interface_name}" with arguments ({arg_str})'
+                return dbus_method(
+                    *xformed_args, signature=signature, timeout=timeout, **call_options
                 )
-                raise DPClientInvocationError(
-                    err_msg,
-                    interface_name,
-                    DPClientMethodCallContext(name, xformed_args),
+            except dbus.DBusException as err:  # pragma: no cover
+                raise method_invocation_error(
+                    interface_name, name, xformed_args
                 ) from err
 
         return dbus_func
 
-    def builder(namespace: MutableMapping[str, Callable]) -> None:
+    def build_decoded_method(
+        name: str, arg_names: Sequence[str], signature: str, out_spec: MethodSpec
+    ) -> Callable[[ProxyObject, Mapping[str, Any]], Any]:
+        """
+        Build a method for this class, which decodes its result and returns
+        a named tuple, if required.
+
+        :param str name: the name of the method
+        :param arg_names: the names of the in-arguments, in signature order
+        :type arg_names: sequence of str
+        :param str signature: the signature of the in-arguments
+        :param MethodSpec out_spec: the specification of the out-arguments
+        """
+        method = build_method(name, arg_names, signature)
+        if not (decode or named_results):
+            return method
+
+        out_signature = out_spec.signature
+        result_type = (
+            make_result_type(name, out_spec.arg_names)
+            if named_results and len(out_spec.arg_names) > 1
+            else None
+        )
+        try:
+            decoder = reply_decoder(
+                out_signature, decode=decode, result_type=result_type
+            )
+        except ValueError as err:
+            fmt_str = (
+                'Malformed signature "%s" for out-arguments of method "%s" '
+                'belonging to interface "%s"'
+            )
+            raise DPClientGenerationError(
+                fmt_str % (out_signature, name, interface_name)
+            ) from err
+
+        if decoder is None:
+            return method
+        method = decoding(interface_name, name, out_signature, decoder, method)
+        if result_type is not None:
+            setattr(method, "result_type", result_type)
+        return method
+
+    def build_static_method(
+        name: str, arg_names: Sequence[str], signature: str, out_spec: MethodSpec
+    ) -> staticmethod:
+        """
+        Build a method for this class as a static method.
+
+        :param str name: the name of the method
+        :param arg_names: the names of the in-arguments, in signature order
+        :type arg_names: sequence of str
+        :param str signature: the signature of the in-arguments
+        :param MethodSpec out_spec: the specification of the out-arguments
+        """
+        check_method_spec(interface_name, MethodSpec(name, tuple(arg_names), signature))
+        method = build_decoded_method(name, arg_names, signature, out_spec)
+        if metrics is not None:
+            method = instrument(metrics, interface_name, name, method)
+        if single_flight is not None and name in read_only_methods:
+            method = coalescing(single_flight, interface_name, name, method)
+        return staticmethod(method)
+
+    def builder(namespace: MutableMapping[str, Any]) -> None:
         """
         Fills the namespace of the parent class with class members that are
         methods. Each method takes a proxy object and a set of keyword
@@ -398,61 +898,443 @@ def method_builder(
 
         :param namespace: the class's namespace
         """
+        pending = {}
         for method in methods:
-            try:
-                name = method.attrib["name"]
-            except KeyError as err:  # pragma: no cover
-                fmt_str = (
-                    'No name attribute found for method belonging to interface "%s"'
+            the_method_spec = method_spec(interface_name, method)
+            (name, arg_names, signature) = the_method_spec
+            out_spec = method_out_spec(interface_name, method)
+            if lazy:
+                if validate:
+                    check_method_spec(interface_name, the_method_spec)
+                pending[name] = functools.partial(
+                    build_static_method, name, arg_names, signature, out_spec
                 )
-                raise DPClientGenerationError(fmt_str % interface_name) from err
+            else:
+                namespace[name] = build_static_method(
+                    name, arg_names, signature, out_spec
+                )
+
+        if lazy:
+            namespace[_PENDING_MEMBERS] = pending
+
+    return builder
+
+
+def signal_builder(
+    interface_name: str,
+    signals: Sequence[ET.Element],
+    *,
+    lazy: bool = False,
+    validate: bool = False,
+    decode: bool = False,
+) -> Callable[[MutableMapping[str, Any]], None]:
+    """
+    Returns a function that builds a signal interface based on 'spec'.
+
+    >>> builder = signal_builder("org.interface.inf", spec.findall("./signal"))
+    >>> Signals = types.new_class("Signals", bases=(object,), exec_body=builder)
+    >>> Signals.Changed.connect(dispatcher, handler)
+
+    :param str interface_name: name the interface to which the signals belong
+    :param signals: the iterable of interface specification for each signal
+    :type signals: iterator of xml.element.ElementTree.Element
+    :param bool lazy: if True, defer generating each signal until first use
+    :param bool validate: if True and lazy, check the signatures immediately
+    :param bool decode: if True, decode arguments into native Python types
+
+    :raises DPClientGenerationError:
+    """
+
+    def build_signal(spec: MethodSpec) -> Signal:
+        """
+        Build a signal for this class.
+
+        :param MethodSpec spec: the specification of the signal
+        """
+        (name, arg_names, signature) = spec
+        try:
+            decoder = args_decoder(signature)
+        except ValueError as err:
+            fmt_str = (
+                'Malformed signature "%s" for signal "%s" belonging to interface "%s"'
+            )
+            raise DPClientGenerationError(
+                fmt_str % (signature, name, interface_name)
+            ) from err
+        return Signal(
+            interface_name, name, arg_names, signature, decoder if decode else None
+        )
 
-            the_method = build_method(name, method.findall('./arg[@direction="in"]'))
-            namespace[name] = staticmethod(the_method)
+    def builder(namespace: MutableMapping[str, Any]) -> None:
+        """
+        Fills the namespace of the parent class with class members that are
+        signals.
+
+        :param namespace: the class's namespace
+        """
+        pending = {}
+        for signal in signals:
+            spec = signal_spec(interface_name, signal)
+            if lazy and not validate:
+                pending[spec.name] = functools.partial(build_signal, spec)
+            else:
+                namespace[spec.name] = build_signal(spec)
+
+        if lazy:
+            namespace[_PENDING_MEMBERS] = pending
 
     return builder
 
 
-def make_class(name: str, spec: ET.Element, timeout: int = -1) -> Type:
+def _select_members(
+    interface_name: str,
+    spec: ET.Element,
+    kind: str,
+    members: Collection[str] | None,
+    exclude_members: Collection[str],
+) -> tuple[list[ET.Element], frozenset[str]]:
+    """
+    Select the members of one kind which are to be generated.
+
+    :param str interface_name: the name of the interface
+    :param spec: the interface specification
+    :type spec: xml.element.ElementTree.Element
+    :param str kind: "method", "property" or "signal"
+    :param members: if not None, the names of the only members to generate
+    :type members: collection of str or NoneType
+    :param exclude_members: the names of members not to generate
+    :type exclude_members: collection of str
+    :returns: the elements selected, and the names of the members excluded
+    :raises DPClientGenerationError:
+    """
+    selected = []
+    excluded = set()
+    for element in spec.findall(f"./{kind}"):
+        try:
+            name = element.attrib["name"]
+        except KeyError as err:  # pragma: no cover
+            fmt_str = 'No name attribute found for %s belonging to interface "%s"'
+            raise DPClientGenerationError(fmt_str % (kind, interface_name)) from err
+        if (members is None or name in members) and name not in exclude_members:
+            selected.append(element)
+        else:
+            excluded.add(name)
+    return (selected, frozenset(excluded))
+
+
+def make_class(  # noqa: PLR0913
+    name: str,
+    spec: ET.Element,
+    timeout: int = -1,
+    *,
+    compiled: bool = False,
+    lazy: bool = False,
+    validate: bool = False,
+    asynchronous: bool = False,
+    property_cache: PropertyCache | None = None,
+    metrics: Any = None,
+    decode: bool = False,
+    named_results: bool = False,
+    single_flight: SingleFlight | None = None,
+    read_only_methods: Collection[str] = (),
+    members: Collection[str] | None = None,
+    exclude_members: Collection[str] = (),
+    compact_properties: bool = False,
+    passthrough: bool = False,
+    strict_passthrough: bool = False,
+) -> Type:
     """
     Make a class, name, from the given spec.
     The class defines static properties and methods according to the spec.
 
+    If compiled is True, each method is a specialized invoker, generated from
+    the method's specification, which fetches and transforms its arguments
+    without any generic per-call processing. Such methods behave exactly
+    like the default methods, but are faster to call and slower to generate.
+
+    If lazy is True, each method and property is generated on first access
+    and then cached on the Methods or Properties class. The specification
+    of each member is read immediately, but the signatures are only checked
+    when the member is generated, unless validate is also True.
+
+    If asynchronous is True, the class also has an Async member, with its
+    own Methods and Properties classes. These have the same members as the
+    class's own, but each method, getter and setter is a coroutine function
+    which invokes the D-Bus method without blocking.
+
+    If property_cache is given, property getters consult the cache before
+    fetching a value, in accordance with the EmitsChangedSignal annotation
+    of the property or, failing that, of the interface.
+
+    If metrics is given, each invocation of a method or property accessor
+    that is made on the bus is recorded by the record method of metrics,
+    e.g., an InvocationMetrics object.
+
+    If decode is True, the values returned by methods, getters and GetAll
+    are decoded from dbus-python types into native Python types, by
+    functions constructed once from the signatures of the out-arguments and
+    properties. Arrays of bytes are requested from dbus-python as bytes and
+    returned without copying.
+
+    If named_results is True, each method with several out-arguments
+    returns a named tuple, whose fields are named after the out-arguments,
+    rather than a plain tuple. The named tuple type is the result_type
+    attribute of the method.
+
+    If single_flight is given, concurrent identical invocations of property
+    getters, and of the methods named in read_only_methods, share a single
+    invocation on the bus and its result or error. Invocations are identical
+    if they are made on the same object of the same service with equal
+    arguments.
+
+    If members is given, only the methods, properties and signals it names
+    are generated; those named by exclude_members are never generated. An
+    attempt to access a member which was not generated raises an
+    AttributeError which says that the member was excluded. GetAll gets only
+    the readable properties that were generated.
+
+    If compact_properties is True, each member of the Properties class is
+    a PropertyAccessors object, with the same Get and Set members, and
+    attributes name, access and signature, rather than a class. Such
+    objects are much smaller and quicker to make than classes.
+
+    The class has a Signals member, with a Signal for each signal of the
+    interface, by which handlers are connected to the signal through a
+    SignalDispatcher. If decode is True, the arguments of each signal are
+    decoded before they are passed to the handlers.
+
+    If passthrough is True, each argument of a method, and each value given
+    to a setter, which is already of exactly the dbus-python type that it
+    would be transformed into, e.g., a dbus.String or dbus.ObjectPath
+    returned by an earlier call, is sent unchanged rather than transformed
+    again. The elements of arrays and dictionaries, and the fields of
+    structs, are not checked, but are left to dbus-python. If
+    strict_passthrough is True, such a value is sent unchanged only if all
+    of its contents are also of their exact dbus-python types; otherwise,
+    it is transformed, and any error is reported, as usual.
+
+    The class can be pickled, e.g., to send it to the workers of a process
+    pool, unless property_cache, metrics or single_flight is given. It is
+    pickled by its name, specification and options, and is made again from
+    them when it is unpickled, at most once in each process; a process
+    forked from one which has pickled or unpickled the class already has it.
+
     :param str name: the name of the class.
     :param spec: the interface specification
     :type spec: xml.element.ElementTree.Element
     :param int timeout: D-Bus timeout, -1 is libdbus default ~25s
+    :param bool compiled: if True, generate specialized method invokers
+    :param bool lazy: if True, generate each member on first access
+    :param bool validate: if True and lazy, check all signatures immediately
+    :param bool asynchronous: if True, also generate coroutine functions
+    :param property_cache: if not None, the cache consulted by getters
+    :type property_cache: PropertyCache or NoneType
+    :param metrics: if not None, the object which records each invocation
+    :param bool decode: if True, decode returned values into native types
+    :param bool named_results: if True, methods return named tuples
+    :param single_flight: if not None, the record by which concurrent
+                          identical invocations are coalesced
+    :type single_flight: SingleFlight or NoneType
+    :param read_only_methods: the names of the methods which only read the
+                              state of the service, and may be coalesced
+    :type read_only_methods: collection of str
+    :param members: if not None, the names of the only members to generate
+    :type members: collection of str or NoneType
+    :param exclude_members: the names of members not to generate
+    :type exclude_members: collection of str
+    :param bool compact_properties: if True, each property is represented
+                                    by a PropertyAccessors object
+    :param bool passthrough: if True, arguments and property values which
+                             are already of their dbus-python types are sent
+                             unchanged
+    :param bool strict_passthrough: if True, such values are sent unchanged
+                                    only if their contents are also of their
+                                    dbus-python types
     :returns: the constructed class
     :rtype: type
     """
 
-    try:
-        interface_name = spec.attrib["name"]
-    except KeyError as err:  # pragma: no cover
-        raise DPClientGenerationError("No name attribute found for interface") from err
+    interface_name = interface_name_of(spec)
+    filtered = members is not None or bool(exclude_members)
+    make_class_args = (
+        name,
+        spec,
+        {
+            "timeout": timeout,
+            "compiled": compiled,
+            "lazy": lazy,
+            "validate": validate,
+            "asynchronous": asynchronous,
+            "property_cache": property_cache,
+            "metrics": metrics,
+            "decode": decode,
+            "named_results": named_results,
+            "single_flight": single_flight,
+            "read_only_methods": read_only_methods,
+            "members": members,
+            "exclude_members": exclude_members,
+            "compact_properties": compact_properties,
+            "passthrough": passthrough,
+            "strict_passthrough": strict_passthrough,
+        },
+    )
+    kwds = {"metaclass": LazyNamespace} if lazy or filtered else None
 
-    method_builder_arg = method_builder(
-        interface_name, spec.findall("./method"), timeout
+    unknown = set(read_only_methods).difference(
+        method.attrib.get("name") for method in spec.findall("./method")
+    )
+    if unknown:
+        raise DPClientGenerationError(
+            f"Methods marked read-only ({', '.join(sorted(unknown))}) are not "
+            f'all methods of interface "{interface_name}"'
+        )
+
+    (methods, excluded_methods) = _select_members(
+        interface_name, spec, "method", members, exclude_members
+    )
+    (properties, excluded_properties) = _select_members(
+        interface_name, spec, "property", members, exclude_members
     )
-    prop_builder_arg = prop_builder(interface_name, spec.findall("./property"), timeout)
+    (signals, excluded_signals) = _select_members(
+        interface_name, spec, "signal", members, exclude_members
+    )
+    if filtered:
+        unknown = set(() if members is None else members).union(exclude_members)
+        unknown.difference_update(
+            (element.attrib["name"] for element in methods + properties + signals),
+            excluded_methods,
+            excluded_properties,
+            excluded_signals,
+        )
+        if unknown:
+            raise DPClientGenerationError(
+                f"Members selected or excluded ({', '.join(sorted(unknown))}) "
+                f'are not all members of interface "{interface_name}"'
+            )
 
-    def builder(namespace: MutableMapping[str, Type]) -> None:
+    def excluding(
+        excluded: frozenset[str], exec_body: Callable[[MutableMapping[str, Any]], None]
+    ) -> Callable[[MutableMapping[str, Any]], None]:
         """
-        Fills the namespace of the parent class with two class members,
-        Properties and Methods. Both of these are classes which themselves
-        contain static fields. Each static field in the Properties class
-        is a class corresponding to a property of the interface. Each static
-        field in the Methods class is a method corresponding to a method
-        on the interface.
+        Returns a function that fills a namespace by exec_body and records
+        the members excluded from it, if any.
 
-        :param namespace: the class's namespace
+        :param excluded: the names of the excluded members
+        :type excluded: frozenset of str
+        :param exec_body: the function which fills the namespace
         """
-        namespace["Methods"] = types.new_class(
-            "Methods", bases=(object,), exec_body=method_builder_arg
+
+        def builder(namespace: MutableMapping[str, Any]) -> None:
+            """
+            Fills the namespace, recording the excluded members.
+
+            :param namespace: the class's namespace
+            """
+            exec_body(namespace)
+            if excluded:
+                namespace[_EXCLUDED_MEMBERS] = excluded
+
+        return builder
+
+    def namespace_builder(is_async: bool) -> Callable[[MutableMapping[str, Any]], None]:
+        """
+        Returns a function that fills a namespace with Methods and Properties
+        classes.
+
+        :param bool is_async: if True, the members are coroutine functions
+        """
+        method_builder_arg = excluding(
+            excluded_methods,
+            method_builder(
+                interface_name,
+                methods,
+                timeout,
+                compiled=compiled,
+                lazy=lazy,
+                validate=validate,
+                asynchronous=is_async,
+                metrics=metrics,
+                decode=decode,
+                named_results=named_results,
+                single_flight=single_flight,
+                read_only_methods=read_only_methods,
+                passthrough=passthrough,
+                strict_passthrough=strict_passthrough,
+            ),
         )
+        prop_builder_arg = excluding(
+            excluded_properties,
+            prop_builder(
+                interface_name,
+                properties,
+                timeout,
+                lazy=lazy,
+                validate=validate,
+                asynchronous=is_async,
+                property_cache=property_cache,
+                changed_signal_default=emits_changed_signal(spec),
+                metrics=metrics,
+                decode=decode,
+                single_flight=single_flight,
+                compact=compact_properties,
+                passthrough=passthrough,
+                strict_passthrough=strict_passthrough,
+            ),
+        )
+
+        def builder(namespace: MutableMapping[str, Any]) -> None:
+            """
+            Adds the Methods and Properties classes to the namespace.
 
-        namespace["Properties"] = types.new_class(
-            "Properties", bases=(object,), exec_body=prop_builder_arg
+            :param namespace: the class's namespace
+            """
+            namespace["Methods"] = types.new_class(
+                "Methods", bases=(object,), kwds=kwds, exec_body=method_builder_arg
+            )
+
+            namespace["Properties"] = types.new_class(
+                "Properties", bases=(object,), kwds=kwds, exec_body=prop_builder_arg
+            )
+
+        return builder
+
+    members_builder = namespace_builder(False)
+    signals_builder = excluding(
+        excluded_signals,
+        signal_builder(
+            interface_name, signals, lazy=lazy, validate=validate, decode=decode
+        ),
+    )
+    async_builder = namespace_builder(True) if asynchronous else None
+
+    def builder(namespace: MutableMapping[str, Any]) -> None:
+        """
+        Fills the namespace of the parent class with three class members,
+        Properties, Methods and Signals. All of these are classes which
+        themselves contain static fields. Each static field in the Properties
+        class is a class corresponding to a property of the interface. Each
+        static field in the Methods class is a method corresponding to a
+        method on the interface. Each static field in the Signals class is a
+        Signal corresponding to a signal of the interface. A bind classmethod
+        is also added, and an Async class, if coroutine functions are to be
+        generated.
+
+        :param namespace: the class's namespace
+        """
+        members_builder(namespace)
+
+        if async_builder is not None:
+            namespace["Async"] = types.new_class(
+                "Async", bases=(object,), exec_body=async_builder
+            )
+
+        namespace["Signals"] = types.new_class(
+            "Signals", bases=(object,), kwds=kwds, exec_body=signals_builder
         )
 
-    return types.new_class(name, bases=(object,), exec_body=builder)
+        namespace["bind"] = make_bind()
+        namespace[_MAKE_CLASS_ARGS] = make_class_args
+
+    return types.new_class(
+        name, bases=(object,), kwds={"metaclass": GeneratedClass}, exec_body=builder
+    )
@@ -0,0 +1,306 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""
+Code for viewing the objects in a reply to the GetManagedObjects method of
+the org.freedesktop.DBus.ObjectManager interface, and for keeping the views
+up to date by the signals of the service.
+"""
+
+import types
+from typing import Any, Callable, Iterable, Mapping, Sequence, Type
+
+import dbus
+
+from ._errors import DPClientGenerationError
+
+_OBJECT_MANAGER_IFACE = "org.freedesktop.DBus.ObjectManager"
+
+# The result of a search which finds no views
+_NO_VIEWS: Mapping[str, Any] = types.MappingProxyType({})
+
+# The value of a property which is absent from a view
+_MISSING = object()
+
+
+class ManagedObjects:
+    """
+    Typed views of the objects of a service, for some of its interfaces.
+
+    Each view is a snapshot, as returned by the GetAll method of the
+    Properties class of a generated class, made from the properties in a
+    GetManagedObjects reply. The views of each generated class are indexed
+    by object path and, optionally, by the values of some properties.
+
+    The views are replaced, rather than modified, when they are kept up to
+    date by the InterfacesAdded, InterfacesRemoved and PropertiesChanged
+    signals, so a view that has been obtained never changes.
+
+    >>> objects = ManagedObjects([Pool, Filesystem], index=("Name", "Uuid"))
+    >>> objects.watch(bus, "org.storage.stratis3", "/org/storage/stratis3")
+    >>> objects.load(ObjectManager.Methods.GetManagedObjects(proxy_object, {}))
+    >>> objects.views(Pool)["/org/storage/stratis3/pool/1"].Name
+    >>> objects.find(Filesystem, "Uuid", uuid)
+    """
+
+    def __init__(self, klasses: Iterable[Type], index: Iterable[str] = ()):
+        """
+        Initialize with no objects.
+
+        :param klasses: the generated classes, one for each interface
+        :type klasses: iterable of type
+        :param index: the names of the properties to index by
+        :type index: iterable of str
+        :raises DPClientGenerationError: if a class has no GetAll method
+        """
+        self._index_names = tuple(index)
+        self._interfaces: dict[str, tuple[Type, Callable[..., Any]]] = {}
+        self._views: dict[Type, dict[str, Any]] = {}
+        self._indexes: dict[tuple[Type, str], dict[Any, dict[str, Any]]] = {}
+        self._matches: list[Any] = []
+
+        for klass in klasses:
+            get_all = getattr(klass.Properties, "GetAll", None)
+            try:
+                interface_name = getattr(get_all, "interface_name")
+                snapshot = getattr(get_all, "snapshot")
+            except AttributeError as err:
+                raise DPClientGenerationError(
+                    f'Class "{klass.__name__}" has no GetAll method from '
+                    "which to make views of objects"
+                ) from err
+            self._interfaces[interface_name] = (klass, snapshot)
+            self._views[klass] = {}
+            for name in self._index_names:
+                self._indexes[(klass, name)] = {}
+
+    def load(self, managed_objects: Mapping[str, Mapping[str, Mapping[str, Any]]]):
+        """
+        Replace all views with views of the objects in a GetManagedObjects
+        reply.
+
+        Interfaces for which there is no generated class are ignored.
+
+        :param managed_objects: map from object paths to maps from interface
+                                names to maps from property names to values
+        :raises DPClientUnmarshallingError: if a value can not be decoded
+        """
+        for views in self._views.values():
+            views.clear()
+        for index in self._indexes.values():
+            index.clear()
+
+        for object_path, interfaces in managed_objects.items():
+            self.add_interfaces(object_path, interfaces)
+
+    def add_interfaces(
+        self, object_path: str, interfaces: Mapping[str, Mapping[str, Any]]
+    ):
+        """
+        Add or replace the views of an object, as for the InterfacesAdded
+        signal.
+
+        :param str object_path: the object path
+        :param interfaces: map from interface names to maps from property
+                           names to values
+        :raises DPClientUnmarshallingError: if a value can not be decoded
+        """
+        for interface_name, properties in interfaces.items():
+            try:
+                (klass, snapshot) = self._interfaces[interface_name]
+            except KeyError:
+                continue
+            view = snapshot(properties)
+            self._discard(klass, object_path)
+            self._views[klass][object_path] = view
+            self._index(klass, object_path, view)
+
+    def remove_interfaces(self, object_path: str, interface_names: Iterable[str]):
+        """
+        Remove the views of an object, as for the InterfacesRemoved signal.
+
+        :param str object_path: the object path
+        :param interface_names: the names of the interfaces removed
+        :type interface_names: iterable of str
+        """
+        for interface_name in interface_names:
+            try:
+                (klass, _) = self._interfaces[interface_name]
+            except KeyError:
+                continue
+            self._discard(klass, object_path)
+
+    def properties_changed(
+        self,
+        object_path: str,
+        interface_name: str,
+        changed_properties: Mapping[str, Any],
+        invalidated_properties: Sequence[str] = (),
+    ):
+        """
+        Replace the view of an object with one in which some properties
+        have changed, as for the PropertiesChanged signal.
+
+        Invalidated properties are absent from the new view. Nothing is done
+        if the object has no view for the interface.
+
+        :param str object_path: the object path
+        :param str interface_name: the interface whose properties changed
+        :param changed_properties: the new values of changed properties
+        :type changed_properties: mapping of str * object
+        :param invalidated_properties: the names of invalidated properties
+        :type invalidated_properties: sequence of str
+        :raises DPClientUnmarshallingError: if a value can not be decoded
+        """
+        try:
+            (klass, snapshot) = self._interfaces[interface_name]
+            old_view = self._views[klass][object_path]
+        except KeyError:
+            return
+
+        view = snapshot(changed_properties)
+        for name in type(view).__slots__:
+            if (
+                name not in changed_properties
+                and name not in invalidated_properties
+                and hasattr(old_view, name)
+            ):
+                setattr(view, name, getattr(old_view, name))
+
+        self._discard(klass, object_path)
+        self._views[klass][object_path] = view
+        self._index(klass, object_path, view)
+
+    def watch(self, bus: Any, bus_name: str, object_manager_path: str = "/"):
+        """
+        Keep the views up to date by the InterfacesAdded and
+        InterfacesRemoved signals of a service's object manager, and by the
+        PropertiesChanged signals of all of the service's objects.
+
+        A single match rule is added for each signal, whatever the number of
+        objects. Call this method before load, so that no change is missed.
+        dbus-python must be running a main loop for the signals to be
+        received.
+
+        :param bus: the bus, e.g., dbus.SystemBus()
+        :param str bus_name: the name of the service
+        :param str object_manager_path: the object path of the object manager
+        """
+        self.unwatch()
+        self._matches = [
+            bus.add_signal_receiver(
+                self.add_interfaces,
+                signal_name="InterfacesAdded",
+                dbus_interface=_OBJECT_MANAGER_IFACE,
+                bus_name=bus_name,
+                path=object_manager_path,
+            ),
+            bus.add_signal_receiver(
+                self.remove_interfaces,
+                signal_name="InterfacesRemoved",
+                dbus_interface=_OBJECT_MANAGER_IFACE,
+                bus_name=bus_name,
+                path=object_manager_path,
+            ),
+            bus.add_signal_receiver(
+                self._properties_changed,
+                signal_name="PropertiesChanged",
+                dbus_interface=dbus.PROPERTIES_IFACE,
+                bus_name=bus_name,
+                path_keyword="object_path",
+            ),
+        ]
+
+    def unwatch(self):
+        """
+        Stop keeping the views up to date by signals.
+        """
+        for match in self._matches:
+            match.remove()
+        self._matches = []
+
+    def views(self, klass: Type) -> Mapping[str, Any]:
+        """
+        Get the views of the objects which implement the interface of a
+        generated class.
+
+        :param type klass: the generated class
+        :returns: a read-only map from object paths to views
+        :raises KeyError: if the class was not given to the constructor
+        """
+        return types.MappingProxyType(self._views[klass])
+
+    def find(self, klass: Type, property_name: str, value: Any) -> Mapping[str, Any]:
+        """
+        Find the views of a generated class with a given property value.
+
+        :param type klass: the generated class
+        :param str property_name: the name of an indexed property
+        :param value: the value of the property
+        :returns: a read-only map from object paths to views
+        :raises KeyError: if the class or the property is not indexed
+        """
+        try:
+            found = self._indexes[(klass, property_name)].get(value)
+        except TypeError:
+            found = None
+        return _NO_VIEWS if found is None else types.MappingProxyType(found)
+
+    def _properties_changed(
+        self,
+        interface_name: str,
+        changed_properties: Mapping[str, Any],
+        invalidated_properties: Sequence[str],
+        *,
+        object_path: str,
+    ):
+        """
+        Handle the PropertiesChanged signal of any object.
+        """
+        self.properties_changed(
+            object_path, interface_name, changed_properties, invalidated_properties
+        )
+
+    def _index(self, klass: Type, object_path: str, view: Any):
+        """
+        Add a view to the indexes of its class.
+
+        Values that are absent or unhashable are not indexed.
+
+        :param type klass: the generated class
+        :param str object_path: the object path
+        :param view: the view
+        """
+        for name in self._index_names:
+            value = getattr(view, name, _MISSING)
+            if value is _MISSING:
+                continue
+            try:
+                found = self._indexes[(klass, name)].setdefault(value, {})
+            except TypeError:
+                continue
+            found[object_path] = view
+
+    def _discard(self, klass: Type, object_path: str):
+        """
+        Remove a view, if any, from the views and indexes of its class.
+
+        :param type klass: the generated class
+        :param str object_path: the object path
+        """
+        view = self._views[klass].pop(object_path, None)
+        if view is None:
+            return
+
+        for name in self._index_names:
+            value = getattr(view, name, _MISSING)
+            if value is _MISSING:
+                continue
+            index = self._indexes[(klass, name)]
+            try:
+                found = index[value]
+            except TypeError:
+                continue
+            del found[object_path]
+            if not found:
+                del index[value]
@@ -0,0 +1,366 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""
+Code for recording the number, errors and latency of invocations of
+generated methods and property accessors.
+
+A class is instrumented only if make_class is passed a metrics object, so
+uninstrumented classes bear no cost. A metrics object is any object with a
+record method taking the same arguments as InvocationMetrics.record.
+
+The time spent transforming arguments to dbus-python types is measured by
+wrapping the transforming functions; the time is accumulated in a context
+variable, so that concurrent invocations, in threads or in asyncio tasks,
+are measured separately.
+
+The time spent on the bus is measured by passing the generated function a
+wrapper of its proxy object, which times each call of a dbus-python method
+obtained from it: until the call returns or, if the call does not block,
+until its reply handler or error handler is called. Resolving the method,
+and decoding and transforming the reply, are not part of the time.
+"""
+
+import bisect
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from typing import Any, Callable, Sequence
+
+from ._errors import DPClientError
+
+# Upper bounds, in seconds, of the buckets of a latency histogram
+DEFAULT_BOUNDS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+# The marshalling time accumulated by the current invocation, if any
+_MARSHAL_TIME: contextvars.ContextVar[list[float] | None] = contextvars.ContextVar(
+    "_MARSHAL_TIME", default=None
+)
+
+
+class Histogram:
+    """
+    A histogram of durations, with a fixed set of buckets.
+
+    counts[i] is the number of durations no greater than bounds[i] and
+    greater than any lesser bound; the last count is the number of durations
+    greater than every bound.
+    """
+
+    def __init__(self, bounds: Sequence[float]):
+        """
+        Initialize an empty histogram.
+
+        :param bounds: the upper bound of each bucket, in increasing order
+        :type bounds: sequence of float
+        """
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, duration: float):
+        """
+        Add a duration to the histogram.
+
+        :param float duration: the duration, in seconds
+        """
+        self.counts[bisect.bisect_left(self.bounds, duration)] += 1
+        self.count += 1
+        self.total += duration
+
+    def __repr__(self) -> str:
+        return f"Histogram(count={self.count}, total={self.total})"
+
+
+class MemberMetrics:
+    """
+    The metrics of a single method or property accessor.
+    """
+
+    def __init__(self, bounds: Sequence[float]):
+        """
+        Initialize metrics with no invocations.
+
+        :param bounds: the upper bound of each histogram bucket
+        :type bounds: sequence of float
+        """
+        self.calls = 0
+        self.errors: dict[type, int] = {}
+        self.marshal_time = Histogram(bounds)
+        self.bus_time = Histogram(bounds)
+
+    def __repr__(self) -> str:
+        return (
+            f"MemberMetrics(calls={self.calls}, errors={self.errors!r}, "
+            f"marshal_time={self.marshal_time!r}, bus_time={self.bus_time!r})"
+        )
+
+
+class InvocationMetrics:
+    """
+    Records, for each interface and member, the number of invocations, the
+    number of errors of each DPClientError subclass, and histograms of the
+    time spent transforming arguments and of the time spent on the bus.
+
+    Members are named as they are accessed on the generated class, e.g.,
+    "CreatePool", "Name.Get", "Name.Set" or "GetAll".
+
+    >>> metrics = InvocationMetrics()
+    >>> Manager = make_class("Manager", spec, metrics=metrics)
+    >>> Manager.Methods.CreatePool(proxy_object, {"name": "pool", ...})
+    >>> metrics.members()[(interface_name, "CreatePool")].bus_time.total
+    """
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BOUNDS):
+        """
+        Initialize the metrics.
+
+        :param bounds: the upper bound of each histogram bucket, in seconds
+        :type bounds: sequence of float
+        """
+        self.bounds = tuple(bounds)
+        self._lock = threading.Lock()
+        self._members: dict[tuple[str, str], MemberMetrics] = {}
+
+    def record(  # noqa: PLR0913, PLR0917
+        self,
+        interface_name: str,
+        member_name: str,
+        marshal_time: float,
+        bus_time: float,
+        error: DPClientError | None,
+    ):
+        """
+        Record a single invocation.
+
+        :param str interface_name: the name of the interface
+        :param str member_name: the name of the member
+        :param float marshal_time: seconds spent transforming arguments
+        :param float bus_time: seconds spent on the bus
+        :param error: the error raised, or None
+        :type error: DPClientError or NoneType
+        """
+        key = (interface_name, member_name)
+        with self._lock:
+            try:
+                member = self._members[key]
+            except KeyError:
+                member = self._members[key] = MemberMetrics(self.bounds)
+            member.calls += 1
+            if error is not None:
+                error_type = type(error)
+                member.errors[error_type] = member.errors.get(error_type, 0) + 1
+            member.marshal_time.observe(marshal_time)
+            member.bus_time.observe(bus_time)
+
+    def members(self) -> dict[tuple[str, str], MemberMetrics]:
+        """
+        Get the metrics recorded so far.
+
+        :returns: map from interface and member names to their metrics
+        :rtype: dict of (str * str) * MemberMetrics
+        """
+        with self._lock:
+            return dict(self._members)
+
+    def clear(self):
+        """
+        Discard the metrics recorded so far.
+        """
+        with self._lock:
+            self._members.clear()
+
+
+def timed_marshaller(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wrap a transforming function so that the time it takes is accumulated
+    by the invocation in progress.
+
+    :param func: the transforming function
+    :returns: the wrapped function
+    """
+
+    @functools.wraps(func)
+    def the_func(*args: Any, **kwargs: Any) -> Any:
+        """
+        Transform the arguments, measuring the time taken.
+        """
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = _MARSHAL_TIME.get()
+            if elapsed is not None:
+                elapsed[0] += time.perf_counter() - start
+
+    return the_func
+
+
+def _timed_method(method: Callable[..., Any], elapsed: list[float]) -> Any:
+    """
+    Wrap a dbus-python method so that the time spent on the bus by each of
+    its calls is accumulated.
+
+    :param method: the dbus-python method
+    :param elapsed: the marshalling time and the bus time of the invocation
+    :returns: the wrapped method
+    """
+
+    def timed_method(*args: Any, **kwargs: Any) -> Any:
+        """
+        Call the method, measuring the time until its reply.
+        """
+        start = time.perf_counter()
+        reply_handler = kwargs.get("reply_handler")
+        if reply_handler is None:
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed[1] += time.perf_counter() - start
+
+        error_handler = kwargs["error_handler"]
+
+        def timed_reply_handler(*values: Any):
+            """
+            Handle the reply, measuring the time since the call.
+            """
+            elapsed[1] += time.perf_counter() - start
+            reply_handler(*values)
+
+        def timed_error_handler(exception: BaseException):
+            """
+            Handle the error, measuring the time since the call.
+            """
+            elapsed[1] += time.perf_counter() - start
+            error_handler(exception)
+
+        kwargs["reply_handler"] = timed_reply_handler
+        kwargs["error_handler"] = timed_error_handler
+        return method(*args, **kwargs)
+
+    return timed_method
+
+
+class _TimingProxy:
+    """
+    Wraps a proxy object, timing the calls of the dbus-python methods that
+    generated methods and property accessors obtain from it, either by
+    get_dbus_method() or by attribute access.
+    """
+
+    __slots__ = ("_elapsed", "_proxy")
+
+    def __init__(self, proxy_object: Any, elapsed: list[float]):
+        """
+        Initialize the wrapper.
+
+        :param proxy_object: the proxy object to wrap
+        :param elapsed: the marshalling time and the bus time of the
+                        invocation
+        """
+        self._proxy = proxy_object
+        self._elapsed = elapsed
+
+    def get_dbus_method(self, member: str, dbus_interface: str | None = None) -> Any:
+        """
+        Get the method from the proxy object, timing its calls.
+
+        :param str member: the name of the method
+        :param dbus_interface: the interface to which the method belongs
+        :type dbus_interface: str or NoneType
+        """
+        return _timed_method(
+            self._proxy.get_dbus_method(member, dbus_interface=dbus_interface),
+            self._elapsed,
+        )
+
+    def __getattr__(self, member: str) -> Any:
+        """
+        Get an attribute of the proxy object, timing its calls if it is a
+        method.
+
+        :param str member: the name of the attribute
+        """
+        if member.startswith("__") and member.endswith("__"):
+            raise AttributeError(member)
+        value = getattr(self._proxy, member)
+        return _timed_method(value, self._elapsed) if callable(value) else value
+
+
+def instrument(
+    metrics: Any, interface_name: str, member_name: str, func: Callable[..., Any]
+) -> Callable[..., Any]:
+    """
+    Wrap a generated method or property accessor so that each invocation is
+    recorded, whether it succeeds or raises any exception; only a
+    DPClientError is recorded as an error.
+
+    :param metrics: the object which records invocations
+    :param str interface_name: the name of the interface
+    :param str member_name: the name of the member
+    :param func: the function or coroutine function
+    :returns: a function of the same kind
+    """
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_dbus_func(proxy_object: Any, *args: Any, **kwargs: Any) -> Any:
+            """
+            Invoke the coroutine function, recording the invocation.
+            """
+            elapsed = [0.0, 0.0]
+            token = _MARSHAL_TIME.set(elapsed)
+            error: DPClientError | None = None
+            try:
+                return await func(_TimingProxy(proxy_object, elapsed), *args, **kwargs)
+            except DPClientError as err:
+                error = err
+                raise
+            finally:
+                _MARSHAL_TIME.reset(token)
+                metrics.record(
+                    interface_name, member_name, elapsed[0], elapsed[1], error
+                )
+
+        return async_dbus_func
+
+    @functools.wraps(func)
+    def dbus_func(proxy_object: Any, *args: Any, **kwargs: Any) -> Any:
+        """
+        Invoke the function, recording the invocation.
+        """
+        elapsed = [0.0, 0.0]
+        token = _MARSHAL_TIME.set(elapsed)
+        error: DPClientError | None = None
+        try:
+            return func(_TimingProxy(proxy_object, elapsed), *args, **kwargs)
+        except DPClientError as err:
+            error = err
+            raise
+        finally:
+            _MARSHAL_TIME.reset(token)
+            metrics.record(interface_name, member_name, elapsed[0], elapsed[1], error)
+
+    return dbus_func
@@ -0,0 +1,106 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""
+Code for generating classes for the interfaces of a whole introspection
+document.
+"""
+
+import io
+import os
+import xml.etree.ElementTree as ET  # nosec B405
+from typing import IO, Any, Iterable, Iterator, Type
+
+from ._errors import DPClientGenerationError
+from ._invokers import make_class
+
+
+def _interface_elements(
+    source: str | ET.Element | os.PathLike | IO,
+) -> Iterator[ET.Element]:
+    """
+    Get the interface elements of an introspection document, in order.
+
+    :param source: the text of the document, its element, or a path, or a
+                   file object, from which to read it
+    :returns: the interface elements
+    """
+    if isinstance(source, ET.Element):
+        yield from source.iter("interface")
+        return
+
+    for _, element in ET.iterparse(  # nosec B314
+        io.StringIO(source) if isinstance(source, str) else source
+    ):
+        if element.tag == "interface":
+            yield element
+
+
+def make_classes(
+    source: str | ET.Element | os.PathLike | IO,
+    interface_names: Iterable[str] | None = None,
+    **kwargs: Any,
+) -> dict[str, Type]:
+    """
+    Make a class for each interface of an introspection document, or for
+    each of the interfaces named.
+
+    The document, a <node> element, possibly with child nodes, is given as
+    its text, as its element or, alternatively, as a path or a file object
+    from which to read it. A str is always the text of the document, never
+    a path; a path must be an os.PathLike, e.g., a pathlib.Path.
+
+    Text and files are parsed incrementally, in a single pass. The elements
+    of each interface whose class is not required are discarded at once,
+    while each class keeps the elements of its interface, which are
+    serialized only if the class is pickled, and parsing stops as soon as
+    every interface named has been found. An interface that appears in
+    several nodes is made only once. Each class is named after its
+    interface.
+
+    >>> classes = make_classes(
+    ...     proxy_object.Introspect(),
+    ...     ["org.storage.stratis3.pool.r5"],
+    ...     decode=True,
+    ... )
+    >>> Pool = classes["org.storage.stratis3.pool.r5"]
+
+    :param source: the text of the document, its element, or a path, or a
+                   file object, from which to read it
+    :type source: str or Element or os.PathLike or file object
+    :param interface_names: the names of the interfaces, default all
+    :type interface_names: iterable of str or NoneType
+    :param kwargs: keyword arguments for make_class, e.g., timeout
+    :returns: a map from interface names to classes
+    :rtype: dict of str * type
+    :raises DPClientGenerationError: if the document is malformed or does
+            not contain every interface named
+    """
+    wanted = None if interface_names is None else set(interface_names)
+    classes: dict[str, Type] = {}
+
+    parsed = not isinstance(source, ET.Element)
+
+    try:
+        for element in _interface_elements(source):
+            name = element.attrib.get("name")
+            if (
+                name is not None
+                and name not in classes
+                and (wanted is None or name in wanted)
+            ):
+                classes[name] = make_class(name, element, **kwargs)
+                if wanted is not None and wanted.issubset(classes):
+                    break
+            elif parsed:
+                element.clear()
+    except ET.ParseError as err:
+        raise DPClientGenerationError("Malformed introspection document") from err
+
+    if wanted is not None and not wanted.issubset(classes):
+        missing = ", ".join(sorted(wanted.difference(classes)))
+        raise DPClientGenerationError(
+            f"Interfaces ({missing}) not found in introspection document"
+        )
+
+    return classes
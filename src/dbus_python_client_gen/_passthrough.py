@@ -0,0 +1,194 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""
+Code for passing arguments which are already of the dbus-python type of
+their signature to dbus-python unchanged, rather than transforming them.
+
+A checking function is constructed once for each signature. A value is
+passed through if it is of exactly the dbus-python type that transforming
+it would construct, e.g., a dbus.String for "s" but not a str, and, if it
+is an array, dictionary or struct, if its signature, if any, is the one
+expected; if the value is sent in a variant, its signature must be given,
+since dbus-python would otherwise guess the signature of the variant from
+its contents. Only strict checking functions check the contents of arrays,
+dictionaries and structs as well; otherwise, dbus-python itself checks
+them as it sends the value. Values for a variant are always transformed.
+"""
+
+import functools
+from typing import Any, Callable
+
+import dbus
+
+from ._signature import BASIC_TYPES, split_signature
+
+# The maximum number of checking functions that are cached
+CHECKER_CACHE_SIZE = 1024
+
+# Every dbus-python type whose values may be found in a variant
+_DBUS_TYPES = frozenset(
+    [getattr(dbus.types, type_name) for type_name in BASIC_TYPES.values()]
+    + [dbus.Array, dbus.ByteArray, dbus.Dictionary, dbus.Struct]
+)
+
+
+def _is_dbus_value(value: Any) -> bool:
+    """
+    Whether a value, the contents of a variant, is of a dbus-python type.
+    """
+    return type(value) in _DBUS_TYPES
+
+
+def _container_checker(
+    dbus_type: type, signature: str, check_contents: Callable[..., bool] | None
+) -> Callable[..., bool]:
+    """
+    Get a function which checks an array, dictionary or struct.
+
+    :param type dbus_type: the dbus-python type of the container
+    :param str signature: the signature of its contents
+    :param check_contents: if not None, the function which checks its
+                           contents
+    :returns: the checking function
+    """
+
+    def check_container(value: Any, variant: int = 0) -> bool:
+        """
+        Check the container.
+
+        :param value: the value
+        :param int variant: the variant level at which the value is sent
+        """
+        return (
+            type(value) is dbus_type
+            and (
+                value.signature == signature
+                or (value.signature is None and variant == 0)
+            )
+            and (check_contents is None or check_contents(value))
+        )
+
+    return check_container
+
+
+@functools.lru_cache(maxsize=CHECKER_CACHE_SIZE)
+def complete_type_checker(
+    signature: str, *, strict: bool = False
+) -> Callable[..., bool] | None:
+    """
+    Get the function which checks whether a value of a single complete type
+    may be passed through unchanged. The function takes the value and,
+    optionally, the variant level at which the value is sent.
+
+    :param str signature: the signature of a single complete type
+    :param bool strict: if True, check the contents of containers
+    :returns: the checking function, or None for a variant
+    """
+    code = signature[0]
+    if code in BASIC_TYPES:
+        basic_type = getattr(dbus.types, BASIC_TYPES[code])
+        return lambda value, variant=0: type(value) is basic_type
+
+    if code == "v":
+        return None
+
+    def element_checker(element_signature: str) -> Callable[..., bool]:
+        """
+        Get the function which strictly checks a member of a container.
+        """
+        check = complete_type_checker(element_signature, strict=True)
+        return _is_dbus_value if check is None else check
+
+    if signature == "ay":
+        check_bytes = _container_checker(
+            dbus.Array,
+            "y",
+            (lambda value: all(type(v) is dbus.Byte for v in value))
+            if strict
+            else None,
+        )
+        return lambda value, variant=0: (
+            type(value) is dbus.ByteArray or check_bytes(value, variant)
+        )
+
+    if code == "a" and signature[1] == "{":
+        ((key_start, key_end), (value_start, value_end)) = split_signature(signature, 2)
+        check_key = element_checker(signature[key_start:key_end])
+        check_value = element_checker(signature[value_start:value_end])
+
+        def check_dict(value: Any) -> bool:
+            """
+            Check the keys and values of a dictionary.
+            """
+            return all(check_key(k) and check_value(v) for (k, v) in value.items())
+
+        return _container_checker(
+            dbus.Dictionary, signature[2:-1], check_dict if strict else None
+        )
+
+    if code == "a":
+        check_element = element_checker(signature[1:])
+
+        def check_array(value: Any) -> bool:
+            """
+            Check the elements of an array.
+            """
+            return all(map(check_element, value))
+
+        return _container_checker(
+            dbus.Array, signature[1:], check_array if strict else None
+        )
+
+    check_fields = [
+        element_checker(signature[start:end])
+        for (start, end) in split_signature(signature, 1)
+    ]
+
+    def check_struct(value: Any) -> bool:
+        """
+        Check the fields of a struct.
+        """
+        return len(value) == len(check_fields) and all(
+            check(v) for (check, v) in zip(check_fields, value)
+        )
+
+    return _container_checker(
+        dbus.Struct, signature[1:-1], check_struct if strict else None
+    )
+
+
+def passing_through(
+    signature: str, func: Callable[..., Any], *, strict: bool = False
+) -> Callable[..., Any]:
+    """
+    Wrap a transforming function for a single complete type so that values
+    which are already of the type it constructs are returned unchanged.
+
+    A value which is sent in a variant is passed through only if it is
+    itself in no more than one variant, e.g., a value returned by Get, and,
+    if it is an array, dictionary or struct, only if its signature is given.
+
+    :param str signature: the signature of a single complete type
+    :param func: the transforming function
+    :param bool strict: if True, check the contents of containers
+    :returns: a transforming function
+    """
+    check = complete_type_checker(signature, strict=strict)
+    if check is None:
+        return func
+
+    def the_func(value: Any, variant: int = 0) -> Any:
+        """
+        Return the value unchanged if it may be passed through, otherwise
+        transform it.
+
+        :param value: the value
+        :param int variant: the variant level at which to send the value
+        :raises IntoDPError:
+        """
+        if check(value, variant) and value.variant_level <= max(variant, 1):
+            return value
+        return func(value, variant=variant)
+
+    return the_func
@@ -0,0 +1,460 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""
+A client-side cache of property values, kept up to date by the
+PropertiesChanged signal.
+
+Whether and how a property's value can be cached is determined by its
+org.freedesktop.DBus.Property.EmitsChangedSignal annotation:
+
+* "const": the value never changes, and is cached until evicted.
+* "true": PropertiesChanged carries the new value, which replaces the
+  cached value.
+* "invalidates": PropertiesChanged names the property, and the cached
+  value is discarded.
+* "false", or any other value: the property is always fetched.
+"""
+
+import functools
+import inspect
+import threading
+import warnings
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Mapping, NamedTuple, Sequence
+
+import dbus
+from dbus.proxies import ProxyObject
+
+# The policies for which values are cached, and whether each requires the
+# PropertiesChanged signal to be watched.
+_WATCHED = {"const": False, "true": True, "invalidates": True}
+
+
+class PropertyCacheInfo(NamedTuple):
+    """
+    Statistics for a property cache.
+    """
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class PropertyCache:
+    """
+    A bounded cache of property values, keyed by object path, interface and
+    property name, which evicts the least recently used value when full.
+
+    The PropertiesChanged signal of an object path is watched for as long
+    as any value obtained from that object path is cached. A cache should
+    be used only with proxy objects of a single service.
+
+    dbus-python delivers the signal only while a main loop is running, e.g.,
+    after dbus.mainloop.glib.DBusGMainLoop(set_as_default=True); without
+    one, values which the signal would update or invalidate become stale.
+    A RuntimeWarning is issued the first time the cache watches the signal
+    if dbus-python has no default main loop. A FakeProxyObject delivers the
+    signal as it is emitted, so the warning does not apply to it.
+
+    >>> cache = PropertyCache(maxsize=4096)
+    >>> Pool = make_class("Pool", spec, property_cache=cache)
+    >>> Pool.Properties.Uuid.Get(proxy_object)
+    >>> cache.cache_info()
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        Initialize the cache.
+
+        :param int maxsize: the maximum number of values cached
+        :raises ValueError: if maxsize is less than 1
+        """
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be at least 1, but is {maxsize}")
+
+        self.maxsize = maxsize
+        self._lock = threading.RLock()
+        self._values: OrderedDict[tuple[str, str, str], Any] = OrderedDict()
+        # map from object path to the number of its values cached
+        self._counts: dict[str, int] = {}
+        # map from object path to the match for its PropertiesChanged signal
+        self._matches: dict[str, Any] = {}
+        # map from object path to the number of signals received and matches
+        # removed, so that a value fetched meanwhile is known to be stale
+        self._generations: dict[str, int] = {}
+        self._hits = 0
+        self._misses = 0
+        self._main_loop_checked = False
+
+    def cache_info(self) -> PropertyCacheInfo:
+        """
+        Get statistics for the cache.
+
+        :returns: the hits, misses, maximum size and current size of the cache
+        :rtype: PropertyCacheInfo
+        """
+        with self._lock:
+            return PropertyCacheInfo(
+                self._hits, self._misses, self.maxsize, len(self._values)
+            )
+
+    def clear(self):
+        """
+        Discard all values, stop watching all signals and reset the
+        statistics.
+        """
+        with self._lock:
+            for match in self._matches.values():
+                match.remove()
+            self._values.clear()
+            self._counts.clear()
+            self._matches.clear()
+            self._generations.clear()
+            self._hits = self._misses = 0
+
+    def forget(self, object_path: str):
+        """
+        Discard all values obtained from an object path, e.g., because the
+        object has been removed.
+
+        :param str object_path: the object path
+        """
+        with self._lock:
+            for key in [key for key in self._values if key[0] == object_path]:
+                self._discard(key)
+            self._unwatch(object_path)
+
+    def invalidate(self, proxy_object: ProxyObject, interface_name: str, name: str):
+        """
+        Discard the value of a single property, if cached.
+
+        :param proxy_object: the proxy object for the object path
+        :param str interface_name: the interface to which the property belongs
+        :param str name: the name of the property
+        """
+        with self._lock:
+            self._discard((proxy_object.object_path, interface_name, name))
+
+    def get(  # noqa: PLR0913, PLR0917
+        self,
+        proxy_object: ProxyObject,
+        interface_name: str,
+        name: str,
+        policy: str,
+        fetch: Callable[[], Any],
+    ) -> Any:
+        """
+        Get the value of a property from the cache, fetching and caching it
+        if it is not present.
+
+        :param proxy_object: the proxy object for the object path
+        :param str interface_name: the interface to which the property belongs
+        :param str name: the name of the property
+        :param str policy: the value of the EmitsChangedSignal annotation
+        :param fetch: a function which fetches the value
+        :returns: the value of the property
+        """
+        if policy not in _WATCHED:
+            return fetch()
+
+        key = (proxy_object.object_path, interface_name, name)
+        (found, value, generation) = self._lookup(proxy_object, key, policy)
+        if found:
+            return value
+
+        try:
+            value = fetch()
+        except BaseException:
+            self._abandon(key[0])
+            raise
+        self._store(key, value, generation, _WATCHED[policy])
+        return value
+
+    async def get_async(  # noqa: PLR0913, PLR0917
+        self,
+        proxy_object: ProxyObject,
+        interface_name: str,
+        name: str,
+        policy: str,
+        fetch: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Get the value of a property from the cache, fetching and caching it
+        without blocking if it is not present.
+
+        :param proxy_object: the proxy object for the object path
+        :param str interface_name: the interface to which the property belongs
+        :param str name: the name of the property
+        :param str policy: the value of the EmitsChangedSignal annotation
+        :param fetch: a coroutine function which fetches the value
+        :returns: the value of the property
+        """
+        if policy not in _WATCHED:
+            return await fetch()
+
+        key = (proxy_object.object_path, interface_name, name)
+        (found, value, generation) = self._lookup(proxy_object, key, policy)
+        if found:
+            return value
+
+        try:
+            value = await fetch()
+        except BaseException:
+            self._abandon(key[0])
+            raise
+        self._store(key, value, generation, _WATCHED[policy])
+        return value
+
+    def _lookup(
+        self, proxy_object: ProxyObject, key: tuple[str, str, str], policy: str
+    ) -> tuple[bool, Any, int]:
+        """
+        Look up a value, watching the signal for its object path on a miss
+        if the policy requires it.
+
+        :param proxy_object: the proxy object for the object path
+        :param key: the object path, interface and property name
+        :param str policy: the value of the EmitsChangedSignal annotation
+        :returns: whether the value was found, the value, and the generation
+                  of the object path at the time of the lookup
+        """
+        object_path = key[0]
+        with self._lock:
+            try:
+                value = self._values[key]
+            except KeyError:
+                pass
+            else:
+                self._values.move_to_end(key)
+                self._hits += 1
+                return (True, value, 0)
+
+            self._misses += 1
+            if _WATCHED[policy] and object_path not in self._matches:
+                self._check_main_loop()
+                self._matches[object_path] = proxy_object.connect_to_signal(
+                    "PropertiesChanged",
+                    self._properties_changed,
+                    dbus_interface=dbus.PROPERTIES_IFACE,
+                    path_keyword="object_path",
+                )
+            return (False, None, self._generations.get(object_path, 0))
+
+    def _check_main_loop(self):
+        """
+        Warn, once, if dbus-python has no default main loop by which the
+        PropertiesChanged signal could be delivered.
+        """
+        if self._main_loop_checked:
+            return
+
+        self._main_loop_checked = True
+        if dbus.get_default_main_loop() is None:
+            warnings.warn(
+                "dbus-python has no default main loop, so the PropertiesChanged "
+                "signal will not be received and cached property values which "
+                "change will become stale",
+                RuntimeWarning,
+            )
+
+    def _store(
+        self, key: tuple[str, str, str], value: Any, generation: int, watched: bool
+    ):
+        """
+        Cache a fetched value, unless it may have become stale while it was
+        being fetched, or it was cached meanwhile.
+
+        :param key: the object path, interface and property name
+        :param object value: the value
+        :param int generation: the generation at the time of the lookup
+        :param bool watched: whether the value requires the signal be watched
+        """
+        object_path = key[0]
+        with self._lock:
+            if (
+                self._generations.get(object_path, 0) != generation
+                or (watched and object_path not in self._matches)
+                or key in self._values
+            ):
+                return
+
+            self._values[key] = value
+            self._counts[object_path] = self._counts.get(object_path, 0) + 1
+            if len(self._values) > self.maxsize:
+                self._discard(next(iter(self._values)))
+
+    def _abandon(self, object_path: str):
+        """
+        Stop watching the signal for an object path for which a value could
+        not be fetched, unless other values for it are cached.
+
+        :param str object_path: the object path
+        """
+        with self._lock:
+            if object_path not in self._counts:
+                self._unwatch(object_path)
+
+    def _discard(self, key: tuple[str, str, str]):
+        """
+        Discard a value if present, and stop watching the signal for its
+        object path if no other value for it remains.
+
+        :param key: the object path, interface and property name
+        """
+        try:
+            del self._values[key]
+        except KeyError:
+            return
+
+        object_path = key[0]
+        self._counts[object_path] -= 1
+        if self._counts[object_path] == 0:
+            del self._counts[object_path]
+            self._unwatch(object_path)
+
+    def _unwatch(self, object_path: str):
+        """
+        Stop watching the signal for an object path.
+
+        :param str object_path: the object path
+        """
+        match = self._matches.pop(object_path, None)
+        if match is not None:
+            match.remove()
+            self._generations[object_path] = self._generations.get(object_path, 0) + 1
+
+    def _properties_changed(
+        self,
+        interface_name: str,
+        changed_properties: Mapping[str, Any],
+        invalidated_properties: Sequence[str],
+        *,
+        object_path: str,
+    ):
+        """
+        Handle the PropertiesChanged signal for an object path.
+
+        :param str interface_name: the interface whose properties changed
+        :param changed_properties: the new values of changed properties
+        :type changed_properties: mapping of str * object
+        :param invalidated_properties: the names of invalidated properties
+        :type invalidated_properties: sequence of str
+        :param str object_path: the object path
+        """
+        with self._lock:
+            self._generations[object_path] = self._generations.get(object_path, 0) + 1
+            for name, value in changed_properties.items():
+                key = (object_path, interface_name, name)
+                if key in self._values:
+                    self._values[key] = value
+            for name in invalidated_properties:
+                self._discard((object_path, interface_name, name))
+
+
+def cached_getter(  # noqa: PLR0913, PLR0917
+    cache: PropertyCache,
+    interface_name: str,
+    name: str,
+    policy: str,
+    getter: Callable[..., Any],
+    default_timeout: int,
+) -> Callable[..., Any]:
+    """
+    Wrap a generated property getter so that it consults the cache.
+
+    :param PropertyCache cache: the cache
+    :param str interface_name: the interface to which the property belongs
+    :param str name: the name of the property
+    :param str policy: the value of the EmitsChangedSignal annotation
+    :param getter: the getter, a function or a coroutine function
+    :param int default_timeout: the D-Bus timeout, -1 is the libdbus default ~25s
+    :returns: a getter of the same kind
+    """
+    if inspect.iscoroutinefunction(getter):
+
+        async def async_dbus_func(
+            proxy_object: ProxyObject, *, timeout: int = default_timeout
+        ) -> Any:
+            """
+            The property getter, which does not block.
+
+            :raises DPClientInvocationError:
+            """
+            return await cache.get_async(
+                proxy_object,
+                interface_name,
+                name,
+                policy,
+                functools.partial(getter, proxy_object, timeout=timeout),
+            )
+
+        return async_dbus_func
+
+    def dbus_func(proxy_object: ProxyObject, *, timeout: int = default_timeout) -> Any:
+        """
+        The property getter.
+
+        :raises DPClientInvocationError:
+        """
+        return cache.get(
+            proxy_object,
+            interface_name,
+            name,
+            policy,
+            functools.partial(getter, proxy_object, timeout=timeout),
+        )
+
+    return dbus_func
+
+
+def invalidating_setter(
+    cache: PropertyCache,
+    interface_name: str,
+    name: str,
+    setter: Callable[..., Any],
+    default_timeout: int,
+) -> Callable[..., Any]:
+    """
+    Wrap a generated property setter so that it discards the cached value
+    of the property once the value has been set.
+
+    :param PropertyCache cache: the cache
+    :param str interface_name: the interface to which the property belongs
+    :param str name: the name of the property
+    :param setter: the setter, a function or a coroutine function
+    :param int default_timeout: the D-Bus timeout, -1 is the libdbus default ~25s
+    :returns: a setter of the same kind
+    """
+    if inspect.iscoroutinefunction(setter):
+
+        async def async_dbus_func(
+            proxy_object: ProxyObject, value: Any, *, timeout: int = default_timeout
+        ) -> None:
+            """
+            The property setter, which does not block.
+
+            :raises DPClientRuntimeError:
+            """
+            try:
+                await setter(proxy_object, value, timeout=timeout)
+            finally:
+                cache.invalidate(proxy_object, interface_name, name)
+
+        return async_dbus_func
+
+    def dbus_func(
+        proxy_object: ProxyObject, value: Any, *, timeout: int = default_timeout
+    ) -> None:
+        """
+        The property setter.
+
+        :raises DPClientRuntimeError:
+        """
+        try:
+            setter(proxy_object, value, timeout=timeout)
+        finally:
+            cache.invalidate(proxy_object, interface_name, name)
+
+    return dbus_func
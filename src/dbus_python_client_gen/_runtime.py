@@ -0,0 +1,193 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""
+Helpers used by generated methods while they execute.
+"""
+
+from typing import Any, Mapping, Sequence
+
+from ._errors import (
+    DPClientGetPropertyContext,
+    DPClientInvocationError,
+    DPClientKeywordError,
+    DPClientMarshallingError,
+    DPClientMethodCallContext,
+    DPClientSetPropertyContext,
+    DPClientUnmarshallingError,
+)
+from ._xformers import variant_xformer
+
+
+def method_keyword_error(
+    interface_name: str,
+    method_name: str,
+    arg_names: Sequence[str],
+    func_args: Mapping[str, Any],
+) -> DPClientKeywordError:
+    """
+    Construct the error for a method invoked with the wrong keywords.
+
+    :param str interface_name: the name of the interface
+    :param str method_name: the name of the method
+    :param arg_names: the keywords the method expects
+    :type arg_names: sequence of str
+    :param func_args: the arguments actually passed
+    :type func_args: mapping of str * object
+    :rtype: DPClientKeywordError
+    """
+    param_list = list(arg_names)
+    arg_list = list(func_args.keys())
+    err_msg = (
+        f"Argument keywords passed ({', '.join(arg_list)}) did not match "
+        f"argument keywords expected ({', '.join(param_list)}) "
+        f'for method "{method_name}" '
+        f'belonging to interface "{interface_name}"'
+    )
+    return DPClientKeywordError(
+        err_msg, interface_name, method_name, param_list, arg_list
+    )
+
+
+def method_marshalling_error(
+    interface_name: str, method_name: str, signature: str, args: Sequence[Any]
+) -> DPClientMarshallingError:
+    """
+    Construct the error for method arguments that could not be transformed.
+
+    :param str interface_name: the name of the interface
+    :param str method_name: the name of the method
+    :param str signature: the signature of the in-arguments
+    :param args: the arguments in signature order
+    :type args: sequence of object
+    :rtype: DPClientMarshallingError
+    """
+    arg_str = ", ".join(str(arg) for arg in args)
+    err_msg = (
+        f"Failed to format arguments ({arg_str}) according to "
+        f'signature "{signature}" for method "{method_name}" belonging to '
+        f'interface "{interface_name}"'
+    )
+    return DPClientMarshallingError(err_msg, interface_name, signature, list(args))
+
+
+def method_invocation_error(
+    interface_name: str, method_name: str, xformed_args: Sequence[Any]
+) -> DPClientInvocationError:  # pragma: no cover
+    """
+    Construct the error for a method call that failed on the bus.
+
+    :param str interface_name: the name of the interface
+    :param str method_name: the name of the method
+    :param xformed_args: the arguments as passed to dbus-python
+    :type xformed_args: sequence of object
+    :rtype: DPClientInvocationError
+    """
+    arg_str = ", ".join(repr(arg) for arg in xformed_args)
+    err_msg = (
+        f'Error while invoking method "{method_name}" belonging to '
+        f'interface "{interface_name}" with arguments ({arg_str})'
+    )
+    return DPClientInvocationError(
+        err_msg, interface_name, DPClientMethodCallContext(method_name, xformed_args)
+    )
+
+
+def property_get_error(
+    interface_name: str, property_name: str
+) -> DPClientInvocationError:  # pragma: no cover
+    """
+    Construct the error for a property getter that failed on the bus.
+
+    :param str interface_name: the name of the interface
+    :param str property_name: the name of the property
+    :rtype: DPClientInvocationError
+    """
+    err_msg = (
+        f'Error while getting value for property "{property_name}" '
+        f'belonging to interface "{interface_name}"'
+    )
+    return DPClientInvocationError(
+        err_msg, interface_name, DPClientGetPropertyContext(property_name)
+    )
+
+
+def property_marshalling_error(
+    interface_name: str, property_name: str, signature: str, value: Any
+) -> DPClientMarshallingError:
+    """
+    Construct the error for a property value that could not be transformed.
+
+    :param str interface_name: the name of the interface
+    :param str property_name: the name of the property
+    :param str signature: the signature of the property
+    :param object value: the value
+    :rtype: DPClientMarshallingError
+    """
+    err_msg = (
+        f'Failed to format argument "{value}" according to signature '
+        f'"{signature}" for setter method for property "{property_name}" '
+        f'belonging to interface "{interface_name}"'
+    )
+    return DPClientMarshallingError(err_msg, interface_name, signature, [value])
+
+
+def property_set_error(
+    interface_name: str, property_name: str, xformed_value: Any
+) -> DPClientInvocationError:  # pragma: no cover
+    """
+    Construct the error for a property setter that failed on the bus.
+
+    :param str interface_name: the name of the interface
+    :param str property_name: the name of the property
+    :param object xformed_value: the value as passed to dbus-python
+    :rtype: DPClientInvocationError
+    """
+    err_msg = (
+        f'Error while setting value of property "{property_name}" '
+        f'belonging to interface "{interface_name}" to value "{xformed_value!r}"'
+    )
+    return DPClientInvocationError(
+        err_msg,
+        interface_name,
+        DPClientSetPropertyContext(property_name, xformed_value),
+    )
+
+
+def unmarshalling_error(
+    interface_name: str, member_name: str, signature: str, value: Any
+) -> DPClientUnmarshallingError:
+    """
+    Construct the error for a returned value that could not be decoded.
+
+    :param str interface_name: the name of the interface
+    :param str member_name: the name of the method or property
+    :param str signature: the signature of the value
+    :param object value: the value returned by dbus-python
+    :rtype: DPClientUnmarshallingError
+    """
+    err_msg = (
+        f'Failed to decode value "{value!r}" according to signature '
+        f'"{signature}" returned for "{member_name}" belonging to '
+        f'interface "{interface_name}"'
+    )
+    return DPClientUnmarshallingError(
+        err_msg, interface_name, member_name, signature, value
+    )
+
+
+def marshal_variant(value: Any, *, variant: int = 0) -> Any:
+    """
+    Transform a pair of a signature and a value into a variant value.
+
+    Used by generated modules, which can not know the signatures of variant
+    values in advance. The transforming function for each signature is
+    taken from the process-wide cache of functions for variants.
+
+    :param value: the signature and the value
+    :type value: tuple of str * object
+    :param int variant: the variant level of the enclosing value
+    :returns: the transformed value
+    """
+    (signature, obj) = value
+    return variant_xformer(signature)(obj, variant=variant + 1)
@@ -0,0 +1,300 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""
+Code for receiving the signals of an interface.
+
+Handlers are not connected to the bus individually. A SignalDispatcher
+adds a single signal receiver, and so a single match rule, for each
+interface whose signals are handled, and dispatches each signal it
+receives by a table keyed by interface, member and object path.
+
+A handler which raises an exception, or arguments which can not be decoded
+for some handlers, do not prevent the signal from being delivered to the
+other handlers; the exception is logged, and is not propagated into the
+main loop.
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Sequence
+
+from ._decoders import DECODING_ERRORS
+from ._runtime import unmarshalling_error
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Signal:
+    """
+    A signal of an interface, with the function which decodes its
+    arguments, if they are to be decoded.
+
+    >>> subscription = Pool.Signals.Renamed.connect(dispatcher, handler)
+    >>> subscription.remove()
+    """
+
+    __slots__ = ("arg_names", "decoder", "interface_name", "name", "signature")
+
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        interface_name: str,
+        name: str,
+        arg_names: Sequence[str],
+        signature: str,
+        decoder: Callable[[Any], tuple[Any, ...]] | None = None,
+    ):
+        """
+        Initialize the signal.
+
+        :param str interface_name: the name of the interface
+        :param str name: the name of the signal
+        :param arg_names: the names of the arguments, "" if unnamed
+        :type arg_names: sequence of str
+        :param str signature: the signature of the arguments
+        :param decoder: if not None, the function which decodes the tuple
+                        of arguments
+        """
+        self.interface_name = interface_name
+        self.name = name
+        self.arg_names = tuple(arg_names)
+        self.signature = signature
+        self.decoder = decoder
+
+    def __repr__(self) -> str:
+        return f"Signal({self.interface_name!r}, {self.name!r})"
+
+    def decode(self, args: Sequence[Any]) -> tuple[Any, ...]:
+        """
+        Decode the arguments of the signal, if they are to be decoded.
+
+        :param args: the arguments, as dbus-python passes them
+        :type args: sequence of object
+        :returns: the arguments
+        :raises DPClientUnmarshallingError:
+        """
+        if self.decoder is None:
+            return tuple(args)
+        try:
+            return self.decoder(args)
+        except DECODING_ERRORS as err:
+            raise unmarshalling_error(
+                self.interface_name, self.name, self.signature, args
+            ) from err
+
+    def connect(
+        self,
+        dispatcher: "SignalDispatcher",
+        handler: Callable[..., Any],
+        object_path: str | None = None,
+    ) -> "Subscription":
+        """
+        Arrange for a function to be called whenever the signal is emitted.
+
+        The handler is called with the arguments of the signal, and the
+        object path that emitted it as the keyword argument object_path.
+
+        :param SignalDispatcher dispatcher: the dispatcher
+        :param handler: the function to call
+        :param object_path: the object path, or None for any object path
+        :type object_path: str or NoneType
+        :returns: the subscription, whose remove method disconnects handler
+        :rtype: Subscription
+        """
+        return dispatcher.subscribe(self, handler, object_path)
+
+
+class Subscription:
+    """
+    A handler connected to a signal by a SignalDispatcher.
+    """
+
+    __slots__ = ("_dispatcher", "handler", "object_path", "signal")
+
+    def __init__(
+        self,
+        dispatcher: "SignalDispatcher",
+        signal: Signal,
+        handler: Callable[..., Any],
+        object_path: str | None,
+    ):
+        """
+        Initialize the subscription.
+
+        :param SignalDispatcher dispatcher: the dispatcher
+        :param Signal signal: the signal
+        :param handler: the function to call
+        :param object_path: the object path, or None for any object path
+        :type object_path: str or NoneType
+        """
+        self._dispatcher = dispatcher
+        self.signal = signal
+        self.handler = handler
+        self.object_path = object_path
+
+    def remove(self):
+        """
+        Disconnect the handler. Removing it again has no effect.
+        """
+        self._dispatcher.unsubscribe(self)
+
+
+class SignalDispatcher:
+    """
+    Dispatches the signals of a service to the handlers connected to them.
+
+    One signal receiver is added to the bus for each interface with a
+    connected handler, and removed when its last handler is disconnected.
+
+    >>> dispatcher = SignalDispatcher(dbus.SystemBus(), "org.storage.stratis3")
+    >>> Pool.Signals.Renamed.connect(dispatcher, handler, pool_path)
+    """
+
+    def __init__(self, bus: Any, bus_name: str | None = None):
+        """
+        Initialize the dispatcher.
+
+        :param bus: the bus, e.g., dbus.SystemBus()
+        :param bus_name: the name of the service, or None for any sender
+        :type bus_name: str or NoneType
+        """
+        self.bus = bus
+        self.bus_name = bus_name
+        self._lock = threading.Lock()
+        # map from interface and signal name to map from object path, or
+        # None, to the subscriptions for that signal and object path
+        self._table: dict[
+            tuple[str, str], dict[str | None, tuple[Subscription, ...]]
+        ] = {}
+        # map from interface name to the signal receiver and the number of
+        # subscriptions to signals of the interface
+        self._receivers: dict[str, tuple[Any, int]] = {}
+
+    def subscribe(
+        self,
+        signal: Signal,
+        handler: Callable[..., Any],
+        object_path: str | None = None,
+    ) -> Subscription:
+        """
+        Connect a handler to a signal.
+
+        :param Signal signal: the signal
+        :param handler: the function to call
+        :param object_path: the object path, or None for any object path
+        :type object_path: str or NoneType
+        :returns: the subscription
+        :rtype: Subscription
+        """
+        subscription = Subscription(self, signal, handler, object_path)
+        interface_name = signal.interface_name
+        with self._lock:
+            by_path = self._table.setdefault((interface_name, signal.name), {})
+            by_path[object_path] = by_path.get(object_path, ()) + (subscription,)
+
+            (receiver, count) = self._receivers.get(interface_name, (None, 0))
+            if receiver is None:
+                receiver = self.bus.add_signal_receiver(
+                    self._dispatch,
+                    dbus_interface=interface_name,
+                    bus_name=self.bus_name,
+                    interface_keyword="interface_name",
+                    member_keyword="member",
+                    path_keyword="object_path",
+                )
+            self._receivers[interface_name] = (receiver, count + 1)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """
+        Disconnect a handler, if it is connected.
+
+        :param Subscription subscription: the subscription
+        """
+        interface_name = subscription.signal.interface_name
+        key = (interface_name, subscription.signal.name)
+        object_path = subscription.object_path
+        with self._lock:
+            by_path = self._table.get(key, {})
+            subscriptions = by_path.get(object_path, ())
+            if subscription not in subscriptions:
+                return
+
+            remaining = tuple(s for s in subscriptions if s is not subscription)
+            if remaining:
+                by_path[object_path] = remaining
+            else:
+                del by_path[object_path]
+                if not by_path:
+                    del self._table[key]
+
+            (receiver, count) = self._receivers[interface_name]
+            if count == 1:
+                del self._receivers[interface_name]
+                receiver.remove()
+            else:
+                self._receivers[interface_name] = (receiver, count - 1)
+
+    def close(self):
+        """
+        Disconnect all handlers.
+        """
+        with self._lock:
+            for receiver, _ in self._receivers.values():
+                receiver.remove()
+            self._receivers.clear()
+            self._table.clear()
+
+    def _dispatch(self, *args: Any, interface_name: str, member: str, object_path: str):
+        """
+        Call the handlers connected to a signal that has been received.
+
+        The arguments are decoded once for each distinct kind of decoding
+        required by the handlers. An exception raised by a handler, or by
+        decoding the arguments, is logged; the handlers which require
+        arguments that could not be decoded are skipped, and the others are
+        called.
+
+        :param args: the arguments of the signal
+        :param str interface_name: the interface of the signal
+        :param str member: the name of the signal
+        :param str object_path: the object path that emitted the signal
+        """
+        by_path = self._table.get((interface_name, member))
+        if by_path is None:
+            return
+
+        decoded: dict[Any, tuple[Any, ...] | None] = {}
+        for subscriptions in (by_path.get(object_path, ()), by_path.get(None, ())):
+            for subscription in subscriptions:
+                signal = subscription.signal
+                try:
+                    values = decoded[signal.decoder]
+                except KeyError:
+                    try:
+                        values = signal.decode(args)
+                    except Exception:
+                        _LOGGER.exception(
+                            'Failed to decode the arguments of signal "%s" of '
+                            'interface "%s" emitted by "%s"',
+                            member,
+                            interface_name,
+                            object_path,
+                        )
+                        values = None
+                    decoded[signal.decoder] = values
+
+                if values is None:
+                    continue
+
+                try:
+                    subscription.handler(*values, object_path=object_path)
+                except Exception:
+                    _LOGGER.exception(
+                        'Handler %r for signal "%s" of interface "%s" emitted '
+                        'by "%s" raised an exception',
+                        subscription.handler,
+                        member,
+                        interface_name,
+                        object_path,
+                    )
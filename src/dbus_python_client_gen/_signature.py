@@ -0,0 +1,91 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""
+Code for checking and splitting D-Bus signatures.
+"""
+
+# The dbus-python type for each basic type code
+BASIC_TYPES = {
+    "y": "Byte",
+    "b": "Boolean",
+    "n": "Int16",
+    "q": "UInt16",
+    "i": "Int32",
+    "u": "UInt32",
+    "x": "Int64",
+    "t": "UInt64",
+    "d": "Double",
+    "h": "UnixFd",
+    "s": "String",
+    "o": "ObjectPath",
+    "g": "Signature",
+}
+
+
+def split_signature(signature: str, index: int = 0) -> list[tuple[int, int]]:
+    """
+    Split a signature, or a part of it, into complete types.
+
+    :param str signature: the signature
+    :param int index: the position at which to start
+    :returns: the start and end position of each complete type
+    :raises ValueError: if the signature is malformed
+    """
+    result = []
+    while index < len(signature) and signature[index] not in ")}":
+        end = _complete_type_end(signature, index)
+        result.append((index, end))
+        index = end
+    return result
+
+
+def _complete_type_end(signature: str, index: int) -> int:
+    """
+    Find the end of the complete type which begins at index.
+
+    :param str signature: the signature
+    :param int index: the start of the complete type
+    :returns: the position just past the end of the complete type
+    :raises ValueError: if the signature is malformed
+    """
+    code = signature[index : index + 1]
+    if code in BASIC_TYPES or code == "v":
+        return index + 1
+
+    if code == "a":
+        if signature[index + 1 : index + 2] == "{":
+            entries = split_signature(signature, index + 2)
+            end = entries[-1][1] if entries else index + 2
+            if (
+                len(entries) != 2  # noqa: PLR2004
+                or signature[entries[0][0]] not in BASIC_TYPES
+                or signature[end : end + 1] != "}"
+            ):
+                raise ValueError(f'malformed dict entry in signature "{signature}"')
+            return end + 1
+        return _complete_type_end(signature, index + 1)
+
+    if code == "(":
+        fields = split_signature(signature, index + 1)
+        end = fields[-1][1] if fields else index + 1
+        if not fields or signature[end : end + 1] != ")":
+            raise ValueError(f'malformed struct in signature "{signature}"')
+        return end + 1
+
+    raise ValueError(f'unexpected type code "{code}" in signature "{signature}"')
+
+
+def complete_types(signature: str) -> list[str]:
+    """
+    Split a signature into its complete types.
+
+    :param str signature: the signature
+    :returns: the signature of each complete type
+    :rtype: list of str
+    :raises ValueError: if the signature is malformed
+    """
+    spans = split_signature(signature)
+    if (spans[-1][1] if spans else 0) != len(signature):
+        raise ValueError(f'malformed signature "{signature}"')
+    return [signature[start:end] for (start, end) in spans]
@@ -0,0 +1,247 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""
+Coalescing of concurrent identical calls which only read the state of a
+service.
+
+While a call is in flight, any identical call, i.e., one to the same
+member of the same interface of the same object of the same service with
+equal arguments, does not go to the bus, but waits for the call in flight
+and shares its result or error.
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import inspect
+import threading
+from typing import Any, Awaitable, Callable, Hashable, Mapping, NamedTuple
+
+from dbus.proxies import ProxyObject
+
+
+class SingleFlightInfo(NamedTuple):
+    """
+    Statistics for coalesced calls.
+    """
+
+    calls: int
+    coalesced: int
+    in_flight: int
+
+
+def _freeze(value: Any) -> Hashable:
+    """
+    Make a key from an argument, which distinguishes arguments that would
+    be marshalled differently, e.g., True and 1 in a variant.
+
+    :param value: the argument
+    :raises TypeError: if some part of the argument is unhashable
+    """
+    if isinstance(value, Mapping):
+        frozen: Any = tuple((_freeze(k), _freeze(v)) for (k, v) in value.items())
+    elif isinstance(value, (list, tuple)):
+        frozen = tuple(_freeze(v) for v in value)
+    else:
+        frozen = value
+    key = (type(value), frozen)
+    hash(key)
+    return key
+
+
+def call_key(
+    proxy_object: ProxyObject,
+    interface_name: str,
+    member_name: str,
+    args: tuple[Any, ...],
+) -> Hashable | None:
+    """
+    Make the key which identifies a call.
+
+    :param proxy_object: the proxy object
+    :param str interface_name: the name of the interface
+    :param str member_name: the name of the member
+    :param args: the arguments other than the proxy object
+    :returns: the key, or None if the arguments can not be keyed
+    """
+    try:
+        frozen = _freeze(args)
+    except TypeError:
+        return None
+    return (
+        getattr(proxy_object, "bus_name", None),
+        proxy_object.object_path,
+        interface_name,
+        member_name,
+        frozen,
+    )
+
+
+class SingleFlight:
+    """
+    Shares one in-flight call among concurrent identical calls, whether
+    made from several threads or from several tasks of an event loop.
+
+    >>> single_flight = SingleFlight()
+    >>> Pool = make_class("Pool", spec, single_flight=single_flight)
+    >>> Pool.Properties.TotalPhysicalSize.Get(proxy_object)
+    >>> single_flight.info()
+    """
+
+    def __init__(self):
+        """
+        Initialize with no calls in flight.
+        """
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, concurrent.futures.Future] = {}
+        self._tasks: dict[tuple[Any, Hashable], asyncio.Future] = {}
+        self._leaders = 0
+        self._coalesced = 0
+
+    def info(self) -> SingleFlightInfo:
+        """
+        Get statistics for the calls made.
+
+        :returns: the number of calls made on the bus, the number of calls
+                  which shared another's result, and the number in flight
+        :rtype: SingleFlightInfo
+        """
+        with self._lock:
+            return SingleFlightInfo(
+                self._leaders, self._coalesced, len(self._calls) + len(self._tasks)
+            )
+
+    def call(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """
+        Make a call, unless an identical call is in flight, in which case
+        wait for it and share its result.
+
+        :param key: the key which identifies the call
+        :param func: the function which makes the call
+        :returns: the result of the call
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            if future is None:
+                future = self._calls[key] = concurrent.futures.Future()
+                self._leaders += 1
+                leader = True
+            else:
+                self._coalesced += 1
+                leader = False
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = func()
+        except BaseException as err:
+            self._finish(key)
+            future.set_exception(err)
+            raise
+        self._finish(key)
+        future.set_result(result)
+        return result
+
+    async def call_async(
+        self, key: Hashable, func: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Make a call without blocking, unless an identical call is in flight
+        on the same event loop, in which case await it and share its result.
+
+        The call in flight is not cancelled if the task awaiting it is.
+
+        :param key: the key which identifies the call
+        :param func: the coroutine function which makes the call
+        :returns: the result of the call
+        """
+        loop = asyncio.get_running_loop()
+        loop_key = (loop, key)
+        with self._lock:
+            task = self._tasks.get(loop_key)
+            if task is None:
+                task = self._tasks[loop_key] = asyncio.ensure_future(func())
+                task.add_done_callback(functools.partial(self._forget_task, loop_key))
+                self._leaders += 1
+            else:
+                self._coalesced += 1
+
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable):
+        """
+        Stop sharing a call that has completed.
+
+        :param key: the key which identifies the call
+        """
+        with self._lock:
+            del self._calls[key]
+
+    def _forget_task(self, loop_key: tuple[Any, Hashable], task: asyncio.Future):
+        """
+        Stop sharing a task that has completed.
+
+        The task's error is retrieved, in case no task was left awaiting it.
+
+        :param loop_key: the event loop and the key which identifies the call
+        :param task: the task
+        """
+        with self._lock:
+            del self._tasks[loop_key]
+        if not task.cancelled():
+            task.exception()
+
+
+def coalescing(
+    single_flight: SingleFlight,
+    interface_name: str,
+    member_name: str,
+    func: Callable[..., Any],
+) -> Callable[..., Any]:
+    """
+    Wrap a generated method or property getter so that concurrent identical
+    calls share one call in flight.
+
+    Calls are identified by the proxy object's bus name and object path, the
+    interface and member and the arguments other than the keyword arguments,
+    e.g., timeout. Calls whose arguments are unhashable are not coalesced.
+
+    :param SingleFlight single_flight: the record of calls in flight
+    :param str interface_name: the name of the interface
+    :param str member_name: the name of the member, e.g., "Name.Get"
+    :param func: the function or coroutine function
+    :returns: a function of the same kind
+    """
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_dbus_func(
+            proxy_object: ProxyObject, *args: Any, **kwargs: Any
+        ) -> Any:
+            """
+            Invoke the coroutine function, or share an identical invocation.
+            """
+            key = call_key(proxy_object, interface_name, member_name, args)
+            if key is None:
+                return await func(proxy_object, *args, **kwargs)
+            return await single_flight.call_async(
+                key, functools.partial(func, proxy_object, *args, **kwargs)
+            )
+
+        return async_dbus_func
+
+    @functools.wraps(func)
+    def dbus_func(proxy_object: ProxyObject, *args: Any, **kwargs: Any) -> Any:
+        """
+        Invoke the function, or share an identical invocation.
+        """
+        key = call_key(proxy_object, interface_name, member_name, args)
+        if key is None:
+            return func(proxy_object, *args, **kwargs)
+        return single_flight.call(
+            key, functools.partial(func, proxy_object, *args, **kwargs)
+        )
+
+    return dbus_func
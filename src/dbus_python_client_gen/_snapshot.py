@@ -0,0 +1,250 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""
+Code for reading all the properties of an interface in a single call.
+"""
+
+from typing import Any, Callable, Iterable, Mapping, Sequence, Type
+
+import dbus
+from dbus.proxies import ProxyObject
+
+from ._async import call_async
+from ._decoders import DECODING_ERRORS, complete_type_decoder
+from ._errors import (
+    DPClientGetAllPropertiesContext,
+    DPClientInvocationError,
+    DPClientKeywordError,
+)
+from ._runtime import unmarshalling_error
+
+
+def _snapshot_repr(self) -> str:
+    """
+    Show the properties that are present in the snapshot.
+    """
+    fields = ", ".join(
+        f"{name}={getattr(self, name)!r}"
+        for name in type(self).__slots__
+        if hasattr(self, name)
+    )
+    return f"{type(self).__name__}({fields})"
+
+
+def make_snapshot_class(interface_name: str, names: Sequence[str]) -> Type:
+    """
+    Make a class with a slot for each readable property of an interface.
+
+    :param str interface_name: the name of the interface
+    :param names: the names of the readable properties
+    :type names: sequence of str
+    :returns: the snapshot class
+    """
+    return type(
+        "Snapshot",
+        (object,),
+        {
+            "__slots__": tuple(names),
+            "__doc__": f'Values of properties of interface "{interface_name}".',
+            "__repr__": _snapshot_repr,
+        },
+    )
+
+
+def make_get_all(  # noqa: PLR0915
+    interface_name: str,
+    names: Sequence[str],
+    default_timeout: int,
+    *,
+    asynchronous: bool = False,
+    signatures: Mapping[str, str] | None = None,
+) -> Callable[..., Any]:
+    """
+    Make a function which gets the values of all the readable properties
+    of an interface with a single call to GetAll.
+
+    The function returns a snapshot object, with an attribute for each
+    property whose value was obtained. The properties to include can be
+    restricted by passing their names; attributes for the properties that
+    are not included, or that the GetAll call did not return, are unset.
+
+    >>> snapshot = Klass.Properties.GetAll(proxy_object)
+    >>> snapshot.Name
+    >>> Klass.Properties.GetAll(proxy_object, ["Name", "Uuid"])
+
+    The function has two attributes: interface_name, and snapshot, a
+    function which makes a snapshot from property values that were obtained
+    otherwise, e.g., from a GetManagedObjects reply.
+
+    :param str interface_name: the name of the interface
+    :param names: the names of the readable properties
+    :type names: sequence of str
+    :param int default_timeout: the D-Bus timeout, -1 is the libdbus default ~25s
+    :param bool asynchronous: if True, make a coroutine function
+    :param signatures: if not None, the signature of each readable property,
+                       according to which its value is decoded
+    :type signatures: mapping of str * str or NoneType
+    :returns: the GetAll function
+    """
+    snapshot_class = make_snapshot_class(interface_name, names)
+    readable = frozenset(names)
+    all_names = tuple(names)
+    decoders = (
+        None
+        if signatures is None
+        else {
+            name: (signatures[name], complete_type_decoder(signatures[name]))
+            for name in names
+        }
+    )
+    call_options = {} if signatures is None else {"byte_arrays": True}
+
+    def requested_names(property_names: Iterable[str] | None) -> tuple[str, ...]:
+        """
+        Get the names of the properties to include.
+
+        :param property_names: the properties requested, default all
+        :type property_names: iterable of str or NoneType
+        :raises DPClientKeywordError:
+        """
+        if property_names is None:
+            return all_names
+
+        requested = tuple(property_names)
+        if not readable.issuperset(requested):
+            param_list = sorted(readable)
+            arg_list = list(requested)
+            err_msg = (
+                f"Properties requested ({', '.join(arg_list)}) are not all "
+                f"readable properties ({', '.join(param_list)}) "
+                f'of interface "{interface_name}"'
+            )
+            raise DPClientKeywordError(
+                err_msg, interface_name, "GetAll", param_list, arg_list
+            )
+        return requested
+
+    def get_all_error(requested: Sequence[str]) -> DPClientInvocationError:
+        """
+        Construct the error for a GetAll call that failed on the bus.
+
+        :param requested: the names of the properties requested
+        :type requested: sequence of str
+        """
+        err_msg = (
+            "Error while getting values for all properties belonging to "
+            f'interface "{interface_name}"'
+        )
+        return DPClientInvocationError(
+            err_msg, interface_name, DPClientGetAllPropertiesContext(list(requested))
+        )
+
+    def make_snapshot(values: Mapping[str, Any], requested: Sequence[str]) -> Any:
+        """
+        Construct a snapshot from the values returned by GetAll.
+
+        :param values: map from property names to values
+        :type values: mapping of str * object
+        :param requested: the names of the properties to include
+        :type requested: sequence of str
+        :raises DPClientUnmarshallingError:
+        """
+        snapshot = object.__new__(snapshot_class)
+        for name in requested:
+            try:
+                value = values[name]
+            except KeyError:
+                continue
+            if decoders is not None:
+                (signature, decoder) = decoders[name]
+                try:
+                    value = decoder(value)
+                except DECODING_ERRORS as err:
+                    raise unmarshalling_error(
+                        interface_name, name, signature, value
+                    ) from err
+            setattr(snapshot, name, value)
+        return snapshot
+
+    def snapshot_of(values: Mapping[str, Any]) -> Any:
+        """
+        Construct a snapshot from property values.
+
+        Values of properties which are not readable properties of the
+        interface are ignored.
+
+        :param values: map from property names to values
+        :type values: mapping of str * object
+        :returns: the snapshot
+        :raises DPClientUnmarshallingError:
+        """
+        return make_snapshot(values, all_names)
+
+    def describe(func: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Attach the interface name and the snapshot function to func.
+        """
+        setattr(func, "interface_name", interface_name)
+        setattr(func, "snapshot", snapshot_of)
+        return func
+
+    if asynchronous:
+
+        async def async_dbus_func(
+            proxy_object: ProxyObject,
+            property_names: Iterable[str] | None = None,
+            *,
+            timeout: int = default_timeout,
+        ) -> Any:
+            """
+            Get all the readable properties, or only those specified,
+            without blocking.
+
+            :param property_names: the properties to include, default all
+            :type property_names: iterable of str or NoneType
+            :returns: a snapshot of the property values
+            :raises DPClientRuntimeError:
+            """
+            requested = requested_names(property_names)
+            try:
+                values = await call_async(
+                    proxy_object.GetAll,
+                    interface_name,
+                    dbus_interface=dbus.PROPERTIES_IFACE,
+                    timeout=timeout,
+                    **call_options,
+                )
+            except dbus.DBusException as err:
+                raise get_all_error(requested) from err
+            return make_snapshot(values, requested)
+
+        return describe(async_dbus_func)
+
+    def dbus_func(
+        proxy_object: ProxyObject,
+        property_names: Iterable[str] | None = None,
+        *,
+        timeout: int = default_timeout,
+    ) -> Any:
+        """
+        Get all the readable properties, or only those specified.
+
+        :param property_names: the properties to include, default all
+        :type property_names: iterable of str or NoneType
+        :returns: a snapshot of the property values
+        :raises DPClientRuntimeError:
+        """
+        requested = requested_names(property_names)
+        try:
+            values: Any = proxy_object.GetAll(
+                interface_name,
+                dbus_interface=dbus.PROPERTIES_IFACE,
+                timeout=timeout,
+                **call_options,
+            )
+        except dbus.DBusException as err:  # pragma: no cover
+            raise get_all_error(requested) from err
+        return make_snapshot(values, requested)
+
+    return describe(dbus_func)
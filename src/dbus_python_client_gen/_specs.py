@@ -0,0 +1,251 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""
+Code for extracting the parts of an interface specification that are
+needed to generate classes.
+"""
+
+import xml.etree.ElementTree as ET  # nosec B405
+from typing import NamedTuple
+
+from ._errors import DPClientGenerationError
+from ._signature import complete_types
+
+# The annotation which specifies whether a property's changes are signalled
+EMITS_CHANGED_SIGNAL = "org.freedesktop.DBus.Property.EmitsChangedSignal"
+
+
+class MethodSpec(NamedTuple):
+    """
+    The specification of a single method.
+    """
+
+    name: str
+    arg_names: tuple[str, ...]
+    signature: str
+
+
+class PropertySpec(NamedTuple):
+    """
+    The specification of a single property.
+    """
+
+    name: str
+    access: str
+    signature: str
+
+
+def interface_name_of(spec: ET.Element) -> str:
+    """
+    Get the name of the interface.
+
+    :param spec: the interface specification
+    :type spec: xml.element.ElementTree.Element
+    :raises DPClientGenerationError:
+    """
+    try:
+        return spec.attrib["name"]
+    except KeyError as err:  # pragma: no cover
+        raise DPClientGenerationError("No name attribute found for interface") from err
+
+
+def method_spec(interface_name: str, method: ET.Element) -> MethodSpec:
+    """
+    Get the specification of a method.
+
+    :param str interface_name: the interface to which the method belongs
+    :param method: the method element
+    :type method: xml.element.ElementTree.Element
+    :raises DPClientGenerationError:
+    """
+    try:
+        name = method.attrib["name"]
+    except KeyError as err:  # pragma: no cover
+        fmt_str = 'No name attribute found for method belonging to interface "%s"'
+        raise DPClientGenerationError(fmt_str % interface_name) from err
+
+    inargs = method.findall('./arg[@direction="in"]')
+
+    try:
+        arg_names = tuple(e.attrib["name"] for e in inargs)
+    except KeyError as err:  # pragma: no cover
+        fmt_str = (
+            "No name attribute found for some argument for method "
+            '"%s" belonging to interface "%s"'
+        )
+        raise DPClientGenerationError(fmt_str % (name, interface_name)) from err
+
+    try:
+        signature = "".join(e.attrib["type"] for e in inargs)
+    except KeyError as err:  # pragma: no cover
+        fmt_str = (
+            "No type attribute found for some argument for method "
+            '"%s" belonging to interface "%s"'
+        )
+        raise DPClientGenerationError(fmt_str % (name, interface_name)) from err
+
+    return MethodSpec(name, arg_names, signature)
+
+
+def method_out_spec(interface_name: str, method: ET.Element) -> MethodSpec:
+    """
+    Get the specification of the out-arguments of a method.
+
+    Out-arguments need not be named; the name of an unnamed out-argument
+    is the empty string.
+
+    :param str interface_name: the interface to which the method belongs
+    :param method: the method element
+    :type method: xml.element.ElementTree.Element
+    :returns: the method name, out-argument names and their signature
+    :raises DPClientGenerationError:
+    """
+    name = method.attrib.get("name", "")
+    outargs = method.findall('./arg[@direction="out"]')
+    try:
+        signature = "".join(e.attrib["type"] for e in outargs)
+    except KeyError as err:  # pragma: no cover
+        fmt_str = (
+            "No type attribute found for some out-argument for method "
+            '"%s" belonging to interface "%s"'
+        )
+        raise DPClientGenerationError(fmt_str % (name, interface_name)) from err
+
+    return MethodSpec(name, tuple(e.attrib.get("name", "") for e in outargs), signature)
+
+
+def signal_spec(interface_name: str, signal: ET.Element) -> MethodSpec:
+    """
+    Get the specification of a signal.
+
+    Arguments of signals need not be named; the name of an unnamed argument
+    is the empty string.
+
+    :param str interface_name: the interface to which the signal belongs
+    :param signal: the signal element
+    :type signal: xml.element.ElementTree.Element
+    :returns: the signal name, argument names and their signature
+    :raises DPClientGenerationError:
+    """
+    try:
+        name = signal.attrib["name"]
+    except KeyError as err:  # pragma: no cover
+        fmt_str = 'No name attribute found for signal belonging to interface "%s"'
+        raise DPClientGenerationError(fmt_str % interface_name) from err
+
+    args = signal.findall("./arg")
+    try:
+        signature = "".join(e.attrib["type"] for e in args)
+    except KeyError as err:  # pragma: no cover
+        fmt_str = (
+            "No type attribute found for some argument for signal "
+            '"%s" belonging to interface "%s"'
+        )
+        raise DPClientGenerationError(fmt_str % (name, interface_name)) from err
+
+    return MethodSpec(name, tuple(e.attrib.get("name", "") for e in args), signature)
+
+
+def property_spec(interface_name: str, prop: ET.Element) -> PropertySpec:
+    """
+    Get the specification of a property.
+
+    :param str interface_name: the interface to which the property belongs
+    :param prop: the property element
+    :type prop: xml.element.ElementTree.Element
+    :raises DPClientGenerationError:
+    """
+    try:
+        name = prop.attrib["name"]
+    except KeyError as err:  # pragma: no cover
+        fmt_str = 'No name attribute found for property belonging to interface "%s"'
+        raise DPClientGenerationError(fmt_str % interface_name) from err
+
+    try:
+        access = prop.attrib["access"]
+    except KeyError as err:  # pragma: no cover
+        fmt_str = (
+            'No access attribute found for property "%s" belonging to interface "%s"'
+        )
+        raise DPClientGenerationError(fmt_str % (name, interface_name)) from err
+
+    try:
+        signature = prop.attrib["type"]
+    except KeyError as err:  # pragma: no cover
+        fmt_str = (
+            'No type attribute found for property "%s" belonging to interface "%s"'
+        )
+        raise DPClientGenerationError(fmt_str % (name, interface_name)) from err
+
+    return PropertySpec(name, access, signature)
+
+
+def emits_changed_signal(element: ET.Element, default: str = "true") -> str:
+    """
+    Get the value of the EmitsChangedSignal annotation of a property or of
+    an interface.
+
+    :param element: the property or interface element
+    :type element: xml.element.ElementTree.Element
+    :param str default: the value if the element is not annotated
+    :returns: "const", "true", "invalidates", "false", or default
+    :rtype: str
+    """
+    annotation = element.find(f'./annotation[@name="{EMITS_CHANGED_SIGNAL}"]')
+    return default if annotation is None else annotation.attrib.get("value", default)
+
+
+def check_method_spec(interface_name: str, spec: MethodSpec):
+    """
+    Check that the signature of a method has one complete type for each
+    of its arguments.
+
+    :param str interface_name: the interface to which the method belongs
+    :param MethodSpec spec: the method specification
+    :raises DPClientGenerationError:
+    """
+    try:
+        types = complete_types(spec.signature)
+    except ValueError as err:
+        fmt_str = 'Malformed signature "%s" for method "%s" belonging to interface "%s"'
+        raise DPClientGenerationError(
+            fmt_str % (spec.signature, spec.name, interface_name)
+        ) from err
+
+    if len(types) != len(spec.arg_names):
+        fmt_str = (
+            'Signature "%s" does not specify exactly one type for each '
+            'argument of method "%s" belonging to interface "%s"'
+        )
+        raise DPClientGenerationError(
+            fmt_str % (spec.signature, spec.name, interface_name)
+        )
+
+
+def check_property_spec(interface_name: str, spec: PropertySpec):
+    """
+    Check that the signature of a property is a single complete type.
+
+    :param str interface_name: the interface to which the property belongs
+    :param PropertySpec spec: the property specification
+    :raises DPClientGenerationError:
+    """
+    try:
+        types = complete_types(spec.signature)
+    except ValueError as err:
+        fmt_str = (
+            'Malformed signature "%s" for property "%s" belonging to interface "%s"'
+        )
+        raise DPClientGenerationError(
+            fmt_str % (spec.signature, spec.name, interface_name)
+        ) from err
+
+    if len(types) != 1:
+        fmt_str = (
+            'Signature "%s" for property "%s" belonging to interface "%s" '
+            "is not a single complete type"
+        )
+        raise DPClientGenerationError(
+            fmt_str % (spec.signature, spec.name, interface_name)
+        )
@@ -0,0 +1,259 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""
+A process-wide cache of argument-transforming functions.
+
+Transforming functions are constructed by into_dbus_python for a single
+complete type and cached by that type's signature. A signature with several
+complete types, such as the signature of a method's in-arguments, is split
+before the cache is consulted, so that its complete types are shared with
+every other signature in which they occur.
+
+Arrays of a basic type, arrays of bytes, and dictionaries from a basic type
+to a basic type or a variant, e.g., "as", "ay" or "a{sv}", are transformed
+in bulk, by constructing their elements with a single call to map or a
+single comprehension, rather than by a call to a generic transforming
+function for each element; objects which support the buffer protocol, e.g.,
+bytes or memoryview, are transformed to arrays of bytes in a single copy;
+a memoryview whose items are not bytes is an error.
+Any value which can not be transformed in bulk is transformed by the
+function that into_dbus_python constructs, which raises the usual error if
+the value is wrong.
+
+Transforming functions which pass through values that are already of the
+right dbus-python type are made from the cached functions on request.
+"""
+
+import functools
+from collections.abc import Mapping
+from typing import Any, Callable, Sequence
+
+import dbus
+from into_dbus_python import IntoDPError, xformers
+
+from ._passthrough import passing_through
+from ._signature import BASIC_TYPES, complete_types, split_signature
+
+# The maximum number of transforming functions that are cached
+XFORMER_CACHE_SIZE = 1024
+
+# The maximum number of transforming functions for the contents of variants
+# that are cached
+VARIANT_XFORMER_CACHE_SIZE = 256
+
+# The errors raised by dbus-python constructors if a value is inappropriate,
+# e.g., OverflowError by dbus.UInt64(-1)
+_CONSTRUCTOR_ERRORS = (OverflowError, TypeError, ValueError)
+
+# The formats of memoryviews whose items are bytes
+_BYTE_FORMATS = frozenset(["B", "c"])
+
+
+@functools.lru_cache(maxsize=XFORMER_CACHE_SIZE)
+def _complete_type_xformer(signature: str) -> Callable[..., Any]:
+    """
+    Get the transforming function for a single complete type.
+
+    :param str signature: the signature of a single complete type
+    :returns: the transforming function
+    :raises IntoDPError:
+    """
+    ((func, _),) = xformers(signature)
+    return _bulk_xformer(signature, func)
+
+
+@functools.lru_cache(maxsize=VARIANT_XFORMER_CACHE_SIZE)
+def variant_xformer(signature: str) -> Callable[..., Any]:
+    """
+    Get the transforming function for the contents of a variant.
+
+    The signatures of the contents of variants are chosen by callers, not
+    by specifications, so their functions are cached separately, where they
+    can not evict the functions for the signatures of specifications.
+
+    :param str signature: the signature of a single complete type
+    :returns: the transforming function
+    :raises ValueError: if the signature is not a single complete type
+    :raises IntoDPError:
+    """
+    (signature,) = complete_types(signature)
+    ((func, _),) = xformers(signature)
+    return _bulk_xformer(signature, func)
+
+
+def _transform_variant(value: Any) -> Any:
+    """
+    Transform a pair of a signature and a value into a value in a variant.
+
+    :param value: the signature and the value
+    :type value: tuple of str * object
+    :raises IntoDPError:
+    :raises ValueError: if the signature is not a single complete type
+    """
+    (signature, obj) = value
+    return variant_xformer(signature)(obj, variant=1)
+
+
+def _bulk_xformer(signature: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Get a transforming function which transforms a value in bulk, if the
+    signature allows it, and falls back on a generic function otherwise.
+
+    :param str signature: the signature of a single complete type
+    :param func: the generic transforming function
+    :returns: the transforming function
+    """
+    if signature == "ay":
+
+        def transform_bytes(value: Any, *, variant: int = 0) -> Any:
+            """
+            Transform an array of bytes, in a single copy if it is bytes-like.
+
+            :raises IntoDPError:
+            """
+            if isinstance(value, memoryview) and value.format not in _BYTE_FORMATS:
+                raise IntoDPError(
+                    "expected a buffer of bytes for an array of bytes but found "
+                    f'a buffer of format "{value.format}"'
+                )
+            if isinstance(value, (bytes, bytearray, memoryview)):
+                return dbus.ByteArray(value, variant_level=variant)
+            if isinstance(value, (list, tuple)):
+                try:
+                    return dbus.ByteArray(bytes(value), variant_level=variant)
+                except _CONSTRUCTOR_ERRORS:
+                    return func(value, variant=variant)
+            return func(value, variant=variant)
+
+        return transform_bytes
+
+    if signature[:1] == "a" and signature[1:] in BASIC_TYPES:
+        element_signature = signature[1:]
+        element_type = getattr(dbus.types, BASIC_TYPES[element_signature])
+
+        def transform_array(value: Any, *, variant: int = 0) -> Any:
+            """
+            Transform an array of a basic type, in bulk if it is a list or
+            a tuple.
+
+            :raises IntoDPError:
+            """
+            if isinstance(value, (list, tuple)):
+                try:
+                    return dbus.Array(
+                        map(element_type, value),
+                        signature=element_signature,
+                        variant_level=variant,
+                    )
+                except _CONSTRUCTOR_ERRORS:
+                    return func(value, variant=variant)
+            return func(value, variant=variant)
+
+        return transform_array
+
+    if signature[:2] == "a{" and len(signature) == 5:  # noqa: PLR2004
+        ((key_start, key_end), (value_start, value_end)) = split_signature(signature, 2)
+        key_type = getattr(dbus.types, BASIC_TYPES[signature[key_start:key_end]])
+        value_signature = signature[value_start:value_end]
+        value_func: Callable[[Any], Any] = (
+            _transform_variant
+            if value_signature == "v"
+            else getattr(dbus.types, BASIC_TYPES[value_signature])
+        )
+        entry_signature = signature[2:-1]
+
+        def transform_dict(value: Any, *, variant: int = 0) -> Any:
+            """
+            Transform a dictionary from a basic type to a basic type or a
+            variant, in bulk if it is a mapping.
+
+            :raises IntoDPError:
+            """
+            if not isinstance(value, Mapping):
+                return func(value, variant=variant)
+            try:
+                return dbus.Dictionary(
+                    {key_type(k): value_func(v) for (k, v) in value.items()},
+                    signature=entry_signature,
+                    variant_level=variant,
+                )
+            except _CONSTRUCTOR_ERRORS:
+                return func(value, variant=variant)
+
+        return transform_dict
+
+    return func
+
+
+def signature_xformers(
+    signature: str, *, passthrough: bool = False, strict: bool = False
+) -> list[Callable[..., Any]]:
+    """
+    Get a transforming function for each complete type in the signature.
+
+    :param str signature: the signature
+    :param bool passthrough: if True, pass through values of the right type
+    :param bool strict: if True, check the contents of containers passed
+                        through
+    :returns: the transforming functions, in signature order
+    :raises ValueError: if the signature is malformed
+    :raises IntoDPError:
+    """
+    signatures = complete_types(signature)
+    if not passthrough:
+        return [_complete_type_xformer(sig) for sig in signatures]
+    return [
+        passing_through(sig, _complete_type_xformer(sig), strict=strict)
+        for sig in signatures
+    ]
+
+
+def signature_xformer(
+    signature: str, *, passthrough: bool = False, strict: bool = False
+) -> Callable[[Sequence[Any]], list[Any]]:
+    """
+    Get a function that transforms a list of values, one for each complete
+    type in the signature.
+
+    :param str signature: the signature
+    :param bool passthrough: if True, pass through values of the right type
+    :param bool strict: if True, check the contents of containers passed
+                        through
+    :returns: the transforming function
+    :raises ValueError: if the signature is malformed
+    :raises IntoDPError:
+    """
+    funcs = signature_xformers(signature, passthrough=passthrough, strict=strict)
+
+    def the_func(objects: Sequence[Any]) -> list[Any]:
+        """
+        Transform the objects.
+
+        :param objects: one object for each complete type in the signature
+        :type objects: sequence of object
+        :returns: the transformed objects
+        :raises IntoDPError:
+        """
+        return [f(a) for (f, a) in zip(funcs, objects)]
+
+    return the_func
+
+
+def xformer_cache_info():
+    """
+    Get statistics for the cache of transforming functions for the
+    signatures of specifications.
+
+    :returns: the hits, misses, maximum size and current size of the cache
+    :rtype: functools._CacheInfo
+    """
+    return _complete_type_xformer.cache_info()
+
+
+def xformer_cache_clear():
+    """
+    Empty the caches of transforming functions and reset their statistics.
+    """
+    _complete_type_xformer.cache_clear()
+    variant_xformer.cache_clear()
@@ -0,0 +1,180 @@
+"""
+Stand-ins for a dbus-python proxy object and a bus.
+"""
+
+from unittest import mock
+
+import dbus
+import dbus.mainloop
+
+from dbus_python_client_gen import FakeProxyObject
+
+# The keyword arguments of a method which are not recorded
+_UNRECORDED_KEYWORDS = frozenset(["dbus_interface", "reply_handler", "error_handler"])
+
+
+def default_main_loop():
+    """
+    Patch dbus-python so that it appears to have a default main loop.
+    """
+    return mock.patch.object(
+        dbus, "get_default_main_loop", return_value=dbus.mainloop.NULL_MAIN_LOOP
+    )
+
+
+class ReplyingProxy(FakeProxyObject):
+    """
+    Stands in for a proxy object of no particular interfaces; every method
+    replies with the same value, or fails with the same exception.
+    """
+
+    def __init__(self, reply=None, error=None, object_path="/org/example"):
+        """
+        Initialize the proxy.
+
+        :param reply: the value to return from every method invoked
+        :param error: if not None, the exception every method raises
+        :param object_path: the object path of the proxy
+        """
+        super().__init__([], object_path, bus_name="org.example")
+        self.reply = reply
+        self.error = error
+
+    def _invoke(self, dbus_interface, member, args, signature):
+        """
+        Reply to a method with the reply or the error.
+        """
+        self._count(dbus_interface or "", member)
+        if self.error is not None:
+            raise self.error
+        return [] if self.reply is None else [self.reply]
+
+
+class RecordingProxy(ReplyingProxy):
+    """
+    Stands in for a proxy object, recording the D-Bus methods invoked and
+    the methods resolved.
+    """
+
+    def __init__(self, reply=None, error=None, object_path="/org/example"):
+        """
+        Initialize the proxy.
+
+        :param reply: the value to return from every method invoked
+        :param error: if not None, the exception every method raises
+        :param object_path: the object path of the proxy
+        """
+        super().__init__(reply, error, object_path)
+        self.invocations = []
+        self.resolved = []
+
+    @property
+    def matches(self):
+        """
+        The signal matches which have not been removed.
+        """
+        return list(self._handlers)
+
+    def get_dbus_method(self, member, dbus_interface=None):
+        """
+        Return a function that records its invocation.
+        """
+        self.resolved.append((dbus_interface, member))
+        method = super().get_dbus_method(member, dbus_interface)
+
+        def recording_method(*args, **kwargs):
+            self.invocations.append(
+                (
+                    kwargs.get("dbus_interface", dbus_interface),
+                    member,
+                    args,
+                    {
+                        key: value
+                        for (key, value) in kwargs.items()
+                        if key not in _UNRECORDED_KEYWORDS
+                    },
+                )
+            )
+            return method(*args, **kwargs)
+
+        return recording_method
+
+    def emit(self, signal_name, *args):
+        """
+        Emit the PropertiesChanged signal.
+        """
+        assert signal_name == "PropertiesChanged"
+        self._emit_properties_changed(*args)
+
+
+class RecordingBus:
+    """
+    Stands in for a bus, recording the signal receivers added.
+    """
+
+    def __init__(self):
+        self.receivers = []
+
+    def add_signal_receiver(self, handler, signal_name=None, **kwargs):
+        """
+        Record a handler for a signal.
+        """
+        receiver = _Receiver(self, signal_name, handler, kwargs)
+        self.receivers.append(receiver)
+        return receiver
+
+    def emit(self, signal_name, object_path, *args, dbus_interface=None):
+        """
+        Call the handlers for a signal emitted by an object path.
+        """
+        for receiver in list(self.receivers):
+            if receiver.matches(signal_name, object_path, dbus_interface):
+                receiver.handler(
+                    *args, **receiver.keywords(signal_name, object_path, dbus_interface)
+                )
+
+
+class _Receiver:
+    """
+    Stands in for a signal match added to a bus.
+    """
+
+    def __init__(self, bus, signal_name, handler, kwargs):
+        self.bus = bus
+        self.signal_name = signal_name
+        self.handler = handler
+        self.kwargs = kwargs
+        self.path = kwargs.get("path")
+
+    def matches(self, signal_name, object_path, dbus_interface):
+        """
+        Whether the signal matches the receiver.
+        """
+        return all(
+            expected in (None, actual)
+            for (expected, actual) in (
+                (self.signal_name, signal_name),
+                (self.path, object_path),
+                (self.kwargs.get("dbus_interface"), dbus_interface),
+            )
+        )
+
+    def keywords(self, signal_name, object_path, dbus_interface):
+        """
+        The keyword arguments passed to the handler.
+        """
+        return {
+            self.kwargs[keyword]: value
+            for (keyword, value) in (
+                ("path_keyword", object_path),
+                ("member_keyword", signal_name),
+                ("interface_keyword", dbus_interface),
+            )
+            if keyword in self.kwargs
+        }
+
+    def remove(self):
+        """
+        Remove the match.
+        """
+        self.bus.receivers.remove(self)
@@ -0,0 +1,145 @@
+"""
+Test coroutine functions of generated classes.
+"""
+
+import asyncio
+import unittest
+import xml.etree.ElementTree as ET
+
+import dbus
+
+from dbus_python_client_gen import (
+    DPClientInvocationError,
+    DPClientKeywordError,
+    DPClientMarshallingError,
+    make_class,
+)
+from dbus_python_client_gen._async import call_async
+from tests._introspect import SPECS
+from tests._proxy import RecordingProxy
+
+INTERFACE_NAME = "org.storage.stratis3.pool.r5"
+
+
+class AsyncTestCase(unittest.TestCase):
+    """
+    Test the behavior of the Async members of generated classes.
+    """
+
+    def setUp(self):
+        spec = ET.fromstring(SPECS[INTERFACE_NAME])
+        self.klasses = [
+            make_class("Pool", spec, 120, asynchronous=True),
+            make_class("Pool", spec, 120, asynchronous=True, compiled=True),
+            make_class("Pool", spec, 120, asynchronous=True, lazy=True),
+        ]
+
+    def test_no_async(self):
+        """
+        The Async member is only generated on request.
+        """
+        klass = make_class("Pool", ET.fromstring(SPECS[INTERFACE_NAME]))
+        self.assertFalse(hasattr(klass, "Async"))
+
+    def test_calls(self):
+        """
+        Coroutine functions make the same calls as the blocking functions.
+        """
+        for klass in self.klasses:
+            with self.subTest(klass=klass):
+                proxy = RecordingProxy("reply")
+                bound = klass.bind(proxy)
+                results = asyncio.run(
+                    _gather(
+                        klass.Async.Methods.SetName(proxy, {"name": "pool"}),
+                        bound.Async.Properties.Name.Get(),
+                        bound.Async.Properties.FsLimit.Set(64),
+                        klass.Async.Properties.GetAll(proxy, []),
+                    )
+                )
+                self.assertEqual(results[:3], ["reply", "reply", None])
+                self.assertEqual(
+                    [
+                        (iface, name, kwargs)
+                        for (iface, name, _, kwargs) in proxy.invocations
+                    ],
+                    [
+                        (INTERFACE_NAME, "SetName", {"signature": "s", "timeout": 120}),
+                        (dbus.PROPERTIES_IFACE, "Get", {"timeout": 120}),
+                        (dbus.PROPERTIES_IFACE, "Set", {"timeout": 120}),
+                        (dbus.PROPERTIES_IFACE, "GetAll", {"timeout": 120}),
+                    ],
+                )
+
+    def test_errors(self):
+        """
+        Coroutine functions raise the same errors as the blocking functions.
+        """
+        for klass in self.klasses:
+            with self.subTest(klass=klass):
+                proxy = RecordingProxy()
+                with self.assertRaises(DPClientKeywordError):
+                    asyncio.run(klass.Async.Methods.SetName(proxy, {}))
+                with self.assertRaises(DPClientMarshallingError):
+                    asyncio.run(
+                        klass.Async.Methods.DestroyFilesystems(
+                            proxy, {"filesystems": ["fs"]}
+                        )
+                    )
+                with self.assertRaises(DPClientMarshallingError):
+                    asyncio.run(klass.Async.Properties.FsLimit.Set(proxy, None))
+                self.assertEqual(proxy.invocations, [])
+
+                proxy = RecordingProxy(error=dbus.DBusException("failed"))
+                for coroutine in (
+                    klass.Async.Methods.SetName(proxy, {"name": "pool"}),
+                    klass.Async.Properties.Name.Get(proxy),
+                    klass.Async.Properties.FsLimit.Set(proxy, 64),
+                    klass.Async.Properties.GetAll(proxy),
+                ):
+                    with self.assertRaises(DPClientInvocationError) as context:
+                        asyncio.run(coroutine)
+                    self.assertIsInstance(
+                        context.exception.__cause__, dbus.DBusException
+                    )
+
+    def test_out_args(self):
+        """
+        The result is a tuple only if there are several out-arguments.
+        """
+
+        def method(*values, reply_handler, error_handler):
+            reply_handler(*values)
+
+        async def call(*values):
+            return await call_async(method, *values)
+
+        self.assertIsNone(asyncio.run(call()))
+        self.assertEqual(asyncio.run(call(1)), 1)
+        self.assertEqual(asyncio.run(call(1, 2)), (1, 2))
+
+    def test_cancelled(self):
+        """
+        A reply to a cancelled call is ignored.
+        """
+        handlers = {}
+
+        def method(**kwargs):
+            handlers.update(kwargs)
+
+        async def call():
+            future = call_async(method)
+            future.cancel()
+            handlers["reply_handler"]()
+            handlers["error_handler"](dbus.DBusException("failed"))
+            await asyncio.sleep(0)
+            return future.cancelled()
+
+        self.assertTrue(asyncio.run(call()))
+
+
+async def _gather(*coroutines):
+    """
+    Run the coroutines concurrently.
+    """
+    return await asyncio.gather(*coroutines)
@@ -0,0 +1,164 @@
+"""
+Test batch invocation of generated coroutine functions.
+"""
+
+import asyncio
+import unittest
+import xml.etree.ElementTree as ET
+
+from dbus_python_client_gen import (
+    DPClientDeadlineError,
+    DPClientKeywordError,
+    batch_call,
+    make_class,
+)
+from tests._introspect import SPECS
+from tests._proxy import RecordingProxy
+
+INTERFACE_NAME = "org.storage.stratis3.pool.r5"
+
+
+class DelayedProxy(RecordingProxy):
+    """
+    Stands in for a proxy object, replying to each method after a delay.
+    """
+
+    in_progress = 0
+    max_in_progress = 0
+
+    def __init__(self, reply=None, delay: float | None = 0.01):
+        """
+        Initialize the proxy.
+
+        :param reply: the value to return from every method invoked
+        :param delay: seconds before replying, or None to never reply
+        """
+        super().__init__(reply)
+        self.delay = delay
+
+    def get_dbus_method(self, member, dbus_interface=None):
+        """
+        Return a function that replies after the delay.
+        """
+
+        def the_method(*args, reply_handler, error_handler, **kwargs):
+            self.invocations.append((dbus_interface, member, args, kwargs))
+            if self.delay is None:
+                return
+
+            DelayedProxy.in_progress += 1
+            DelayedProxy.max_in_progress = max(
+                DelayedProxy.max_in_progress, DelayedProxy.in_progress
+            )
+
+            def reply():
+                DelayedProxy.in_progress -= 1
+                reply_handler(self.reply)
+
+            asyncio.get_running_loop().call_later(self.delay, reply)
+
+        return the_method
+
+
+class BrokenProxy(DelayedProxy):
+    """
+    Stands in for a proxy object whose methods can not be obtained.
+    """
+
+    def get_dbus_method(self, member, dbus_interface=None):
+        """
+        Fail to return a method.
+        """
+        raise RuntimeError(member)
+
+
+class BatchTestCase(unittest.TestCase):
+    """
+    Test the behavior of batch_call.
+    """
+
+    def setUp(self):
+        self.klass = make_class(
+            "Pool", ET.fromstring(SPECS[INTERFACE_NAME]), asynchronous=True
+        )
+        DelayedProxy.in_progress = DelayedProxy.max_in_progress = 0
+
+    def test_results_in_order(self):
+        """
+        Results and errors are returned in the order of the calls.
+        """
+        proxies = [DelayedProxy(index, delay=0.01 * (5 - index)) for index in range(5)]
+        calls = [(proxy, {"name": "pool"}) for proxy in proxies]
+        calls[2] = (proxies[2], {})
+        results = asyncio.run(batch_call(self.klass.Async.Methods.SetName, calls))
+        self.assertEqual([results[index] for index in (0, 1, 3, 4)], [0, 1, 3, 4])
+        self.assertIsInstance(results[2], DPClientKeywordError)
+        self.assertEqual(DelayedProxy.max_in_progress, 4)
+
+    def test_limit(self):
+        """
+        No more than limit calls are in progress at once.
+        """
+        proxies = [DelayedProxy(index) for index in range(6)]
+        results = asyncio.run(
+            batch_call(
+                self.klass.Async.Properties.Name.Get,
+                [(proxy,) for proxy in proxies],
+                limit=2,
+            )
+        )
+        self.assertEqual(results, list(range(6)))
+        self.assertEqual(DelayedProxy.max_in_progress, 2)
+
+        with self.assertRaises(ValueError):
+            asyncio.run(batch_call(self.klass.Async.Properties.Name.Get, [], limit=0))
+
+    def test_deadline(self):
+        """
+        Calls that do not complete within the deadline are errors.
+        """
+        proxies = [DelayedProxy("name"), DelayedProxy(delay=None), DelayedProxy("name")]
+        results = asyncio.run(
+            batch_call(
+                self.klass.Async.Properties.Name.Get,
+                [(proxy,) for proxy in proxies],
+                limit=2,
+                deadline=0.1,
+            )
+        )
+        self.assertEqual(results[0], "name")
+        self.assertEqual(results[2], "name")
+        self.assertIsInstance(results[1], DPClientDeadlineError)
+        self.assertEqual(results[1].deadline, 0.1)
+        self.assertLessEqual(proxies[0].invocations[0][3]["timeout"], 0.1)
+
+    def test_deadline_passed(self):
+        """
+        Calls that can not start before the deadline are not made.
+        """
+        proxies = [DelayedProxy(delay=None), DelayedProxy("name")]
+        results = asyncio.run(
+            batch_call(
+                self.klass.Async.Properties.Name.Get,
+                [(proxy,) for proxy in proxies],
+                limit=1,
+                deadline=0.05,
+            )
+        )
+        self.assertTrue(all(isinstance(r, DPClientDeadlineError) for r in results))
+        self.assertEqual(proxies[1].invocations, [])
+
+    def test_partial_failure(self):
+        """
+        An unexpected exception is the result of its invocation only, and
+        the other invocations complete.
+        """
+        proxies = [DelayedProxy("name"), BrokenProxy(), DelayedProxy("name", 0.05)]
+        results = asyncio.run(
+            batch_call(
+                self.klass.Async.Properties.Name.Get, [(proxy,) for proxy in proxies]
+            )
+        )
+        self.assertEqual([results[0], results[2]], ["name", "name"])
+        self.assertIsInstance(results[1], RuntimeError)
+        self.assertEqual(DelayedProxy.in_progress, 0)
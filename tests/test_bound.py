@@ -0,0 +1,83 @@
+"""
+Test binding generated classes to proxy objects.
+"""
+
+import gc
+import unittest
+import weakref
+import xml.etree.ElementTree as ET
+
+from dbus_python_client_gen import make_class
+from tests._introspect import SPECS
+from tests._proxy import RecordingProxy
+
+INTERFACE_NAME = "org.storage.stratis3.pool.r5"
+
+
+class BindTestCase(unittest.TestCase):
+    """
+    Test the behavior of bound objects.
+    """
+
+    def setUp(self):
+        self.klass = make_class("Pool", ET.fromstring(SPECS[INTERFACE_NAME]))
+
+    def test_methods_resolved_once(self):
+        """
+        Each dbus-python method is obtained from the proxy object only once.
+        """
+        proxy = RecordingProxy()
+        bound = self.klass.bind(proxy)
+        for _ in range(3):
+            bound.Methods.SetName({"name": "pool"})
+            bound.Properties.Name.Get()
+            bound.Properties.FsLimit.Set(64)
+
+        self.assertEqual(len(proxy.invocations), 9)
+        self.assertEqual(
+            sorted(proxy.resolved, key=str),
+            sorted(
+                [(None, "Get"), (None, "Set"), (INTERFACE_NAME, "SetName")], key=str
+            ),
+        )
+
+    def test_same_bound_object(self):
+        """
+        Binding the same proxy object twice yields the same bound object.
+        """
+        proxy = RecordingProxy()
+        self.assertIs(self.klass.bind(proxy), self.klass.bind(proxy))
+        self.assertIsNot(self.klass.bind(proxy), self.klass.bind(RecordingProxy()))
+
+    def test_proxy_released(self):
+        """
+        The class does not keep discarded proxy objects alive.
+        """
+        proxy = RecordingProxy()
+        bound = self.klass.bind(proxy)
+        bound.Methods.SetName({"name": "pool"})
+        proxy_ref = weakref.ref(proxy)
+
+        del bound
+        del proxy
+        gc.collect()
+        self.assertIsNone(proxy_ref())
+
+    def test_missing_member(self):
+        """
+        Members not defined by the interface are not found.
+        """
+        bound = self.klass.bind(RecordingProxy())
+        with self.assertRaises(AttributeError):
+            getattr(bound.Methods, "Bogus")
+        with self.assertRaises(AttributeError):
+            getattr(bound.Properties.Name, "Set")
+
+    def test_special_names(self):
+        """
+        Special names are not looked up as members or as D-Bus methods.
+        """
+        bound = self.klass.bind(RecordingProxy())
+        self.assertFalse(hasattr(bound, "__wrapped__"))
+        caching_proxy = bound.Properties.Name.Get.args[0]
+        self.assertFalse(hasattr(caching_proxy, "__wrapped__"))
@@ -0,0 +1,134 @@
+"""
+Test transforming arrays and dictionaries in bulk.
+"""
+
+import unittest
+import xml.etree.ElementTree as ET
+
+import dbus
+from into_dbus_python import IntoDPError
+
+from dbus_python_client_gen import DPClientMarshallingError, make_class
+from dbus_python_client_gen._xformers import signature_xformers
+from tests._introspect import SPECS
+from tests._proxy import RecordingProxy
+
+MANAGER = "org.storage.stratis3.Manager.r5"
+
+DICT_SPEC = """
+<interface name="org.example.Dict">
+    <method name="Configure">
+      <arg name="opts" type="a{sv}" direction="in" />
+    </method>
+    <property name="Labels" type="a{ss}" access="readwrite" />
+</interface>
+"""
+
+
+def _xformer(signature):
+    """
+    Get the transforming function for a single complete type.
+    """
+    (func,) = signature_xformers(signature)
+    return func
+
+
+class BulkTestCase(unittest.TestCase):
+    """
+    Test the values constructed in bulk.
+    """
+
+    def test_basic_arrays(self):
+        """
+        Arrays of basic types are arrays of dbus-python values.
+        """
+        for signature, value, element_type in (
+            ("as", ["a", "b"], dbus.String),
+            ("ao", ("/a", "/b"), dbus.ObjectPath),
+            ("at", [1, 2], dbus.UInt64),
+        ):
+            with self.subTest(signature=signature):
+                result = _xformer(signature)(value, variant=1)
+                self.assertIsInstance(result, dbus.Array)
+                self.assertEqual(result.signature, signature[1:])
+                self.assertEqual(result.variant_level, 1)
+                self.assertEqual(list(result), list(value))
+                self.assertTrue(all(type(v) is element_type for v in result))
+
+    def test_generic_fallback(self):
+        """
+        Values which can not be transformed in bulk are transformed
+        generically, or raise the usual error.
+        """
+        result = _xformer("as")(v for v in ["a", "b"])
+        self.assertEqual((list(result), result.signature), (["a", "b"], "s"))
+
+        for signature, value in (("at", [-1]), ("ao", ["bad"]), ("ay", [256])):
+            with self.subTest(signature=signature, value=value):
+                with self.assertRaises(IntoDPError):
+                    _xformer(signature)(value)
+
+        klass = make_class("Manager", ET.fromstring(SPECS[MANAGER]))
+        for devices in ({"a": 1}, 1):
+            with self.subTest(devices=devices):
+                with self.assertRaises(DPClientMarshallingError):
+                    klass.Methods.CreatePool(
+                        RecordingProxy(reply=()),
+                        {
+                            "name": "pool",
+                            "devices": devices,
+                            "key_desc": (False, ""),
+                            "clevis_info": (False, ("", "")),
+                        },
+                    )
+
+    def test_bytes(self):
+        """
+        Bytes-like objects and sequences of integers become byte arrays.
+        """
+        func = _xformer("ay")
+        for value in (b"ab", bytearray(b"ab"), memoryview(b"ab"), [97, 98], (97, 98)):
+            with self.subTest(value=value):
+                result = func(value)
+                self.assertIsInstance(result, dbus.ByteArray)
+                self.assertEqual(result, b"ab")
+
+        with self.assertRaisesRegex(IntoDPError, "format"):
+            func(memoryview(b"abcd").cast("H"))
+
+        result = func([dbus.Byte(97), True])
+        self.assertEqual((type(result), result), (dbus.ByteArray, b"a\x01"))
+
+        for value in ([256], [-1], "ab"):
+            with self.subTest(value=value):
+                with self.assertRaises(IntoDPError):
+                    func(value)
+
+    def test_dictionaries(self):
+        """
+        Dictionaries of variants transform each value by its signature.
+        """
+        result = _xformer("a{sv}")({"Name": ("s", "pool"), "Size": ("t", 2)})
+        self.assertIsInstance(result, dbus.Dictionary)
+        self.assertEqual(result.signature, "sv")
+        self.assertEqual(result, {"Name": "pool", "Size": 2})
+        self.assertIs(type(result["Size"]), dbus.UInt64)
+        self.assertEqual(result["Size"].variant_level, 1)
+
+        result = _xformer("a{ss}")({"a": "b"})
+        self.assertEqual((result, result.signature), ({"a": "b"}, "ss"))
+
+        with self.assertRaises(IntoDPError):
+            _xformer("a{sv}")({"Name": ("ss", "pool")})
+
+    def test_not_mappings(self):
+        """
+        Values for dictionaries which are not mappings are marshalling errors.
+        """
+        for compiled in (False, True):
+            with self.subTest(compiled=compiled):
+                klass = make_class("Dict", ET.fromstring(DICT_SPEC), compiled=compiled)
+                with self.assertRaises(DPClientMarshallingError):
+                    klass.Methods.Configure(RecordingProxy(), {"opts": [1, 2]})
+                with self.assertRaises(DPClientMarshallingError):
+                    klass.Properties.Labels.Set(RecordingProxy(), "abc")
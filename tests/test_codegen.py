@@ -0,0 +1,311 @@
+"""
+Test generation of Python modules from interface specifications.
+"""
+
+import importlib.util
+import os
+import sys
+import tempfile
+import types
+import unittest
+import xml.etree.ElementTree as ET
+
+import dbus
+
+from dbus_python_client_gen import (
+    DPClientGenerationError,
+    DPClientKeywordError,
+    DPClientMarshallingError,
+    load_module,
+    make_class,
+    make_module_source,
+    write_module,
+)
+from tests._introspect import SPECS
+from tests._proxy import RecordingProxy
+
+TIMEOUT = 120
+
+EXTRA_SPEC = """
+<interface name="org.example.Extra">
+    <method name="Configure">
+      <arg name="options" type="a{sv}" direction="in" />
+      <arg name="pairs" type="a(sy)" direction="in" />
+      <arg name="single" type="(t)" direction="in" />
+    </method>
+    <method name="Attach">
+      <arg name="fd" type="h" direction="in" />
+    </method>
+    <property name="Tags" type="as" access="write" />
+  </interface>
+"""
+
+
+class _Unreadable:
+    """
+    A value whose elements can not be read, because of a bug.
+    """
+
+    def __iter__(self):
+        raise RuntimeError("bug")
+
+
+def _modules(directory):
+    """
+    Get the names of the modules in a directory.
+    """
+    return [f for f in os.listdir(directory) if f.endswith(".py")]
+
+
+def _specs():
+    """
+    Get the specifications to generate the module from.
+    """
+    specs = {key.split(".")[-2]: ET.fromstring(value) for key, value in SPECS.items()}
+    specs["Extra"] = ET.fromstring(EXTRA_SPEC)
+    return specs
+
+
+def _load(source):
+    """
+    Load a module from source.
+    """
+    module = types.ModuleType("generated")
+    exec(compile(source, "generated.py", "exec"), module.__dict__)  # nosec B102
+    return module
+
+
+class CodegenTestCase(unittest.TestCase):
+    """
+    Test the behavior of generated modules.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.module = _load(make_module_source(_specs(), TIMEOUT))
+
+    def _assert_same_calls(self, klass_name, member, *args):
+        """
+        Assert that the generated module and make_class invoke the proxy
+        identically.
+        """
+        spec = _specs()[klass_name]
+        expected_proxy = RecordingProxy()
+        actual_proxy = RecordingProxy()
+
+        getattr(make_class(klass_name, spec, TIMEOUT).Methods, member)(
+            expected_proxy, *args
+        )
+        getattr(getattr(self.module, klass_name).Methods, member)(actual_proxy, *args)
+
+        self.assertEqual(actual_proxy.invocations, expected_proxy.invocations)
+        for actual, expected in zip(
+            actual_proxy.invocations[0][2], expected_proxy.invocations[0][2]
+        ):
+            self.assertIs(type(actual), type(expected))
+            self.assertEqual(
+                getattr(actual, "signature", None), getattr(expected, "signature", None)
+            )
+
+    def test_same_surface(self):
+        """
+        The generated classes have the same members as those made by make_class.
+        """
+        for name, spec in _specs().items():
+            klass = getattr(self.module, name)
+            made = make_class(name, spec, TIMEOUT)
+            self.assertEqual(
+                {m for m in vars(klass.Methods) if not m.startswith("_")},
+                {m for m in vars(made.Methods) if not m.startswith("_")},
+            )
+            for prop in spec.findall("./property"):
+                prop_name = prop.attrib["name"]
+                for accessor in ("Get", "Set"):
+                    self.assertEqual(
+                        hasattr(getattr(klass.Properties, prop_name), accessor),
+                        hasattr(getattr(made.Properties, prop_name), accessor),
+                    )
+            self.assertTrue(hasattr(klass, "bind"))
+
+    def test_method_calls(self):
+        """
+        Generated methods pass the same values as those made by make_class.
+        """
+        self._assert_same_calls(
+            "Manager",
+            "CreatePool",
+            {
+                "name": "pool",
+                "devices": ["/dev/one"],
+                "key_desc": (True, "key"),
+                "clevis_info": (False, ("", "")),
+            },
+        )
+        self._assert_same_calls("Manager", "EngineStateReport", {})
+        self._assert_same_calls(
+            "Extra",
+            "Configure",
+            {
+                "options": {"a": ("s", "b"), "c": ("as", ["d"])},
+                "pairs": [("e", 1)],
+                "single": (2,),
+            },
+        )
+
+    def test_setter(self):
+        """
+        Generated setters pass the same values as those made by make_class.
+        """
+        expected_proxy = RecordingProxy()
+        actual_proxy = RecordingProxy()
+        make_class("Extra", _specs()["Extra"], TIMEOUT).Properties.Tags.Set(
+            expected_proxy, ["a"]
+        )
+        self.module.Extra.Properties.Tags.Set(actual_proxy, ["a"])
+        self.assertEqual(actual_proxy.invocations, expected_proxy.invocations)
+        self.assertEqual(actual_proxy.invocations[0][2][2].variant_level, 1)
+
+    def test_errors(self):
+        """
+        Generated methods raise the same errors as those made by make_class.
+        """
+        methods = self.module.Manager.Methods
+        with self.assertRaises(DPClientKeywordError):
+            methods.DestroyPool(RecordingProxy(), {"bogus_keyword": None})
+        with self.assertRaises(DPClientKeywordError):
+            methods.EngineStateReport(RecordingProxy(), {"bogus_keyword": None})
+        with self.assertRaises(DPClientMarshallingError):
+            methods.DestroyPool(RecordingProxy(), {"pool": None})
+        for value in ({"a": "b"}, [1, 2], ["1"]):
+            with self.assertRaises(DPClientMarshallingError):
+                self.module.Extra.Methods.Configure(
+                    RecordingProxy(), {"options": {}, "pairs": value, "single": (1,)}
+                )
+        for value in ([1, 2], "abc"):
+            with self.assertRaises(DPClientMarshallingError):
+                self.module.Extra.Methods.Configure(
+                    RecordingProxy(), {"options": value, "pairs": [], "single": (1,)}
+                )
+        with self.assertRaises(DPClientMarshallingError):
+            self.module.Extra.Properties.Tags.Set(RecordingProxy(), {})
+
+    def test_unexpected_errors(self):
+        """
+        Errors other than those raised for inappropriate values are not
+        reported as marshalling errors.
+        """
+        with self.assertRaises(RuntimeError):
+            self.module.Extra.Methods.Configure(
+                RecordingProxy(),
+                {"options": {}, "pairs": _Unreadable(), "single": (1,)},
+            )
+        with self.assertRaises(RuntimeError):
+            self.module.Extra.Properties.Tags.Set(RecordingProxy(), _Unreadable())
+
+    def test_unix_fd(self):
+        """
+        Unix file descriptors are transformed to dbus.types.UnixFd.
+        """
+        (read_fd, write_fd) = os.pipe()
+        self.addCleanup(os.close, read_fd)
+        self.addCleanup(os.close, write_fd)
+        proxy = RecordingProxy()
+        self.module.Extra.Methods.Attach(proxy, {"fd": read_fd})
+        ((_, _, (arg,), _),) = proxy.invocations
+        self.assertIs(type(arg), dbus.types.UnixFd)
+
+    def test_interface_name_literal(self):
+        """
+        An interface name is quoted in the generated source, whatever it
+        contains.
+        """
+        interface_name = 'a.b"""\nraise SystemExit\n"""'
+        spec = ET.Element("interface", name=interface_name)
+        module = _load(make_module_source({"Klass": spec}))
+        self.assertIn(interface_name, module.Klass.__doc__)
+
+    def test_bad_specs(self):
+        """
+        Specifications which can not be generated are rejected.
+        """
+        for spec in (
+            '<interface name="a.b"><method name="M"><arg name="x" type="z" '
+            'direction="in"/></method></interface>',
+            '<interface name="a.b"><method name="M"><arg name="x" type="a{vs}" '
+            'direction="in"/></method></interface>',
+            '<interface name="a.b"><method name="M"><arg name="x" type="(s" '
+            'direction="in"/></method></interface>',
+            '<interface name="a.b"><method name="M"><arg name="x" type="ss" '
+            'direction="in"/></method></interface>',
+            '<interface name="a.b"><method name="M"><arg name="x" type="s)" '
+            'direction="in"/></method></interface>',
+            '<interface name="a.b"><property name="P" type="ss" '
+            'access="readwrite"/></interface>',
+            '<interface name="a.b"><method name="class"/></interface>',
+        ):
+            with self.assertRaises(DPClientGenerationError):
+                make_module_source({"Klass": ET.fromstring(spec)})
+
+    def test_write_module(self):
+        """
+        A written module can be imported.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "stratis_client.py")
+            write_module(path, _specs(), TIMEOUT)
+            module_spec = importlib.util.spec_from_file_location("stratis_client", path)
+            assert module_spec is not None and module_spec.loader is not None
+            module = importlib.util.module_from_spec(module_spec)
+            module_spec.loader.exec_module(module)
+            self.assertTrue(hasattr(module.Manager.Methods, "CreatePool"))
+            self.assertEqual(
+                [f for f in os.listdir(directory) if f.endswith(".py")],
+                ["stratis_client.py"],
+            )
+
+    def test_load_module(self):
+        """
+        Modules are generated once for each key and then loaded from the
+        cache directory.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            cache_dir = os.path.join(directory, "cache")
+            specs = {"Manager": SPECS["org.storage.stratis3.Manager.r5"]}
+            module = load_module(cache_dir, specs, TIMEOUT)
+            self.assertTrue(hasattr(module.Manager.Methods, "CreatePool"))
+            self.assertIs(load_module(cache_dir, specs, TIMEOUT), module)
+            self.assertEqual(len(_modules(cache_dir)), 1)
+
+            path = os.path.join(cache_dir, _modules(cache_dir)[0])
+            with open(path, "a", encoding="utf-8") as module_file:
+                module_file.write("CACHED = True\n")
+            other = load_module(cache_dir, specs, -1)
+            self.assertFalse(hasattr(other, "CACHED"))
+            self.assertEqual(len(_modules(cache_dir)), 2)
+
+            sys.modules.pop(module.__name__)
+            reloaded = load_module(cache_dir, specs, TIMEOUT)
+            self.assertIsNot(reloaded, module)
+            self.assertTrue(reloaded.CACHED)
+
+            elements = {"Manager": ET.fromstring(specs["Manager"])}
+            self.assertTrue(load_module(cache_dir, elements, TIMEOUT).Manager)
+
+            with self.assertRaises(DPClientGenerationError):
+                load_module(cache_dir, {"Manager": "<interface"})
+
+    def test_get_all(self):
+        """
+        Generated classes get all properties as those made by make_class do.
+        """
+        snapshot = self.module.filesystem.Properties.GetAll(
+            RecordingProxy({"Name": "fs"}), ["Name"]
+        )
+        self.assertEqual(snapshot.Name, "fs")
+
+        spec = ET.fromstring(
+            '<interface name="a.b"><property name="GetAll" type="s" '
+            'access="read"/></interface>'
+        )
+        module = _load(make_module_source({"Klass": spec}))
+        self.assertTrue(hasattr(module.Klass.Properties.GetAll, "Get"))
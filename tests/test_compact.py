@@ -0,0 +1,65 @@
+"""
+Test the compact layout of properties.
+"""
+
+import asyncio
+import unittest
+import xml.etree.ElementTree as ET
+
+from dbus_python_client_gen import FakeProxyObject, PropertyAccessors, make_class
+from tests._introspect import SPECS
+
+POOL = "org.storage.stratis3.pool.r5"
+
+SPEC = """
+<interface name="org.example.Compact">
+    <property name="Secret" type="s" access="write" />
+    <property name="Limit" type="t" access="readwrite" />
+</interface>
+"""
+
+
+class CompactTestCase(unittest.TestCase):
+    """
+    Test the behavior of classes made with compact_properties=True.
+    """
+
+    def test_accessors(self):
+        """
+        Properties are accessors with the members of property classes.
+        """
+        klass = make_class(
+            "Compact", ET.fromstring(SPEC), compact_properties=True, lazy=True
+        )
+        limit = klass.Properties.Limit
+        self.assertIsInstance(limit, PropertyAccessors)
+        self.assertEqual(
+            (limit.name, limit.access, limit.signature), ("Limit", "readwrite", "t")
+        )
+        self.assertEqual(repr(limit), "PropertyAccessors('Limit', 'readwrite', 't')")
+        self.assertTrue(callable(klass.Properties.Secret.Set))
+        with self.assertRaises(AttributeError):
+            klass.Properties.Secret.Get  # noqa: B018
+
+        proxy = FakeProxyObject([ET.fromstring(SPEC)])
+        limit.Set(proxy, 64)
+        self.assertEqual(limit.Get(proxy), 64)
+
+        bound = klass.bind(proxy)
+        bound.Properties.Limit.Set(32)
+        self.assertEqual(bound.Properties.Limit.Get(), 32)
+        self.assertEqual(bound.Properties.Limit.signature, "t")
+
+    def test_same_behavior(self):
+        """
+        Accessors behave as the accessors of property classes do.
+        """
+        spec = ET.fromstring(SPECS[POOL])
+        proxy = FakeProxyObject([spec])
+        proxy.set_property(POOL, "Name", "pool")
+        klass = make_class(
+            "Pool", spec, compact_properties=True, asynchronous=True, decode=True
+        )
+        self.assertEqual(klass.Properties.Name.Get(proxy), "pool")
+        self.assertEqual(asyncio.run(klass.Async.Properties.Name.Get(proxy)), "pool")
+        self.assertEqual(klass.Properties.GetAll(proxy).Name, "pool")
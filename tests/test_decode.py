@@ -0,0 +1,191 @@
+"""
+Test decoding of returned values into native Python types.
+"""
+
+import asyncio
+import unittest
+import xml.etree.ElementTree as ET
+
+import dbus
+
+from dbus_python_client_gen import (
+    DPClientGenerationError,
+    DPClientUnmarshallingError,
+    FakeProxyObject,
+    PropertyCache,
+    make_class,
+)
+from tests._introspect import SPECS
+from tests._proxy import RecordingProxy, default_main_loop
+
+MANAGER = "org.storage.stratis3.Manager.r5"
+INTERFACE_NAME = "org.example.Decode"
+
+SPEC = """
+<interface name="org.example.Decode">
+    <method name="Fetch">
+      <arg name="blob" type="ay" direction="out" />
+      <arg name="props" type="a{sv}" direction="out" />
+    </method>
+    <method name="Ping" />
+    <method name="Open">
+      <arg name="fd" type="h" direction="out" />
+    </method>
+    <property name="Blob" type="ay" access="read" />
+    <property name="Objects" type="a{oa{sa{sv}}}" access="read" />
+</interface>
+"""
+
+OBJECTS = dbus.Dictionary(
+    {
+        dbus.ObjectPath("/1"): dbus.Dictionary(
+            {
+                dbus.String("a.b"): dbus.Dictionary(
+                    {
+                        dbus.String("Name"): dbus.String("name", variant_level=1),
+                        dbus.String("Sizes"): dbus.Array(
+                            [dbus.UInt64(1), dbus.UInt64(2)], variant_level=1
+                        ),
+                        dbus.String("Key"): dbus.Struct(
+                            (dbus.Boolean(True), dbus.String("key")), variant_level=1
+                        ),
+                        dbus.String("Info"): dbus.Dictionary(
+                            {dbus.String("x"): dbus.Double(1.5)}, variant_level=1
+                        ),
+                        dbus.String("Raw"): dbus.ByteArray(b"raw", variant_level=1),
+                    }
+                )
+            }
+        )
+    }
+)
+
+
+class DecodeTestCase(unittest.TestCase):
+    """
+    Test the behavior of classes which decode returned values.
+    """
+
+    def setUp(self):
+        self.spec = ET.fromstring(SPEC)
+        self.proxy = FakeProxyObject([self.spec, ET.fromstring(SPECS[MANAGER])])
+        self.proxy.set_property(INTERFACE_NAME, "Objects", OBJECTS)
+        self.proxy.set_property(INTERFACE_NAME, "Blob", dbus.ByteArray(b"blob"))
+
+    def test_methods(self):
+        """
+        Results of methods are decoded, whether the method is compiled or not.
+        """
+        for compiled in (False, True):
+            with self.subTest(compiled=compiled):
+                manager = make_class(
+                    "Manager",
+                    ET.fromstring(SPECS[MANAGER]),
+                    compiled=compiled,
+                    decode=True,
+                )
+                ((exists, (path, paths)), code, message) = manager.Methods.CreatePool(
+                    self.proxy,
+                    {
+                        "name": "pool",
+                        "devices": [],
+                        "key_desc": (False, ""),
+                        "clevis_info": (False, ("", "")),
+                    },
+                )
+                self.assertIs(type(exists), bool)
+                self.assertIs(type(path), str)
+                self.assertIs(type(paths), list)
+                self.assertIs(type(code), int)
+                self.assertIs(type(message), str)
+
+        klass = make_class("Klass", self.spec, decode=True)
+        self.proxy.set_reply(
+            INTERFACE_NAME, "Fetch", (dbus.ByteArray(b"blob"), OBJECTS["/1"]["a.b"])
+        )
+        (blob, props) = klass.Methods.Fetch(self.proxy, {})
+        self.assertIsInstance(blob, bytes)
+        self.assertEqual(
+            props,
+            {
+                "Name": "name",
+                "Sizes": [1, 2],
+                "Key": (True, "key"),
+                "Info": {"x": 1.5},
+                "Raw": b"raw",
+            },
+        )
+        self.assertIs(type(props["Sizes"][0]), int)
+        self.assertIsNone(klass.Methods.Ping(self.proxy, {}))
+
+        unix_fd = object()
+        self.proxy.set_reply(INTERFACE_NAME, "Open", unix_fd)
+        self.assertIs(klass.Methods.Open(self.proxy, {}), unix_fd)
+
+    def test_properties(self):
+        """
+        Values of properties are decoded by getters and by GetAll.
+        """
+        self.enterContext(default_main_loop())
+        klass = make_class(
+            "Klass",
+            self.spec,
+            decode=True,
+            asynchronous=True,
+            property_cache=PropertyCache(),
+        )
+        objects = klass.Properties.Objects.Get(self.proxy)
+        self.assertIs(type(next(iter(objects))), str)
+        self.assertIs(type(objects["/1"]["a.b"]["Name"]), str)
+        self.assertEqual(klass.Properties.Objects.Get(self.proxy), objects)
+
+        snapshot = asyncio.run(klass.Async.Properties.GetAll(self.proxy))
+        self.assertEqual(snapshot.Objects, objects)
+        self.assertEqual(snapshot.Blob, b"blob")
+        self.assertEqual(
+            asyncio.run(klass.Async.Properties.Blob.Get(self.proxy)), b"blob"
+        )
+
+    def test_byte_arrays(self):
+        """
+        dbus-python is asked for arrays of bytes as bytes.
+        """
+        klass = make_class("Klass", self.spec, decode=True)
+        proxy = RecordingProxy(b"blob")
+        self.assertEqual(klass.Properties.Blob.Get(proxy), b"blob")
+        self.assertTrue(proxy.invocations[0][3]["byte_arrays"])
+
+        proxy = RecordingProxy([1, 2])
+        self.assertEqual(klass.Properties.Blob.Get(proxy), b"\x01\x02")
+
+        klass = make_class("Klass", self.spec)
+        klass.Properties.Blob.Get(proxy)
+        self.assertNotIn("byte_arrays", proxy.invocations[-1][3])
+
+    def test_unmarshalling_error(self):
+        """
+        A value which does not agree with its signature is an error.
+        """
+        klass = make_class("Klass", self.spec, decode=True)
+        proxy = RecordingProxy((b"blob",))
+        with self.assertRaises(DPClientUnmarshallingError) as ctx:
+            klass.Methods.Fetch(proxy, {})
+        self.assertEqual(ctx.exception.signature, "aya{sv}")
+        self.assertEqual(ctx.exception.member_name, "Fetch")
+
+        proxy = RecordingProxy({"Objects": [], "Blob": b""})
+        with self.assertRaises(DPClientUnmarshallingError) as ctx:
+            klass.Properties.GetAll(proxy)
+        self.assertEqual(ctx.exception.value, [])
+
+    def test_malformed(self):
+        """
+        A malformed signature of the out-arguments is detected.
+        """
+        spec = ET.fromstring(
+            '<interface name="a.b"><method name="Bad">'
+            '<arg name="x" type="a{" direction="out"/></method></interface>'
+        )
+        make_class("Klass", spec)
+        with self.assertRaises(DPClientGenerationError):
+            make_class("Klass", spec, decode=True)
@@ -0,0 +1,264 @@
+"""
+Test the in-process stand-in for a proxy object.
+"""
+
+import asyncio
+import threading
+import unittest
+import xml.etree.ElementTree as ET
+
+import dbus
+
+from dbus_python_client_gen import (
+    DPClientInvocationError,
+    FakeProxyObject,
+    PropertyCache,
+    batch_call,
+    make_class,
+)
+from tests._introspect import SPECS
+from tests._proxy import default_main_loop
+
+MANAGER = "org.storage.stratis3.Manager.r5"
+POOL = "org.storage.stratis3.pool.r5"
+FILESYSTEM = "org.storage.stratis3.filesystem.r5"
+
+EXTRA_SPEC = """
+<interface name="org.example.Extra">
+    <method name="Ping" />
+    <method name="Echo">
+      <arg name="value" type="s" direction="in" />
+      <arg name="echo" type="s" direction="out" />
+    </method>
+    <property name="Secret" type="s" access="write" />
+    <property name="Quiet" type="v" access="readwrite">
+      <annotation name="org.freedesktop.DBus.Property.EmitsChangedSignal"
+                  value="false" />
+    </property>
+</interface>
+"""
+
+
+class FakeProxyObjectTestCase(unittest.TestCase):
+    """
+    Test the behavior of generated classes invoked on a FakeProxyObject.
+    """
+
+    def setUp(self):
+        specs = [ET.fromstring(SPECS[name]) for name in (MANAGER, POOL, FILESYSTEM)]
+        self.proxy = FakeProxyObject(
+            specs + [ET.fromstring(EXTRA_SPEC)], "/org/example/1", seed=0
+        )
+        self.manager = make_class("Manager", specs[0], asynchronous=True)
+        self.pool = make_class("Pool", specs[1])
+        self.filesystem = make_class("Filesystem", specs[2])
+
+    def test_default_replies(self):
+        """
+        Methods and properties reply with default values of their types.
+        """
+        self.assertEqual(
+            self.manager.Methods.CreatePool(
+                self.proxy,
+                {
+                    "name": "pool",
+                    "devices": ["/dev/sda"],
+                    "key_desc": (False, ""),
+                    "clevis_info": (False, ("", "")),
+                },
+            ),
+            ((False, ("/", [])), 0, ""),
+        )
+        self.assertEqual(self.pool.Properties.FsLimit.Get(self.proxy), 0)
+        self.assertIsNone(self.proxy.Ping(dbus_interface="org.example.Extra"))
+        self.assertEqual(self.proxy.calls[(MANAGER, "CreatePool")], 1)
+        self.assertEqual(self.proxy.calls[(POOL, "FsLimit.Get")], 1)
+
+    def test_set_reply(self):
+        """
+        A reply may be set in advance, or computed from the arguments.
+        """
+        self.proxy.set_reply(POOL, "SetName", ((True, "name"), 0, "ok"))
+        self.assertEqual(
+            self.pool.Methods.SetName(self.proxy, {"name": "name"}),
+            ((True, "name"), 0, "ok"),
+        )
+
+        self.proxy.set_reply(
+            POOL, "GrowPhysicalDevice", lambda dev: (dev == "/dev/sda", 0, "")
+        )
+        self.assertEqual(self.proxy.GrowPhysicalDevice("/dev/sda")[0], True)
+
+        self.proxy.set_reply("org.example.Extra", "Ping", lambda: None)
+        self.assertIsNone(self.proxy.get_dbus_method("Ping", "org.example.Extra")())
+
+        self.proxy.set_reply("org.example.Extra", "Echo", lambda value: value)
+        self.assertEqual(self.proxy.Echo("echo"), "echo")
+
+        with self.assertRaises(KeyError):
+            self.proxy.set_reply(POOL, "Unknown", None)
+
+    def test_properties(self):
+        """
+        Set values are stored and returned by Get and GetAll.
+        """
+        self.pool.Properties.FsLimit.Set(self.proxy, 64)
+        self.assertEqual(self.pool.Properties.FsLimit.Get(self.proxy), 64)
+        self.assertEqual(self.pool.Properties.GetAll(self.proxy).FsLimit, 64)
+
+        self.proxy.set_property(POOL, "Name", "pool")
+        self.assertEqual(self.pool.Properties.Name.Get(self.proxy), "pool")
+        self.assertEqual(self.proxy.get_property(POOL, "Name"), "pool")
+
+        properties = self.proxy.get_dbus_method("GetAll", dbus.PROPERTIES_IFACE)
+        self.proxy.Set(
+            "org.example.Extra", "Secret", "", dbus_interface=dbus.PROPERTIES_IFACE
+        )
+        self.proxy.Set(
+            "org.example.Extra", "Quiet", "", dbus_interface=dbus.PROPERTIES_IFACE
+        )
+        self.assertEqual(properties("org.example.Extra"), {"Quiet": ""})
+
+    def test_errors(self):
+        """
+        Invalid invocations reply with errors, as a service does.
+        """
+        for func, name in (
+            (self.proxy.Unknown, "UnknownMethod"),
+            (lambda: self.proxy.Unknown(dbus_interface=POOL), "UnknownMethod"),
+            (lambda: self.proxy.SetName(dbus_interface=POOL), "InvalidArgs"),
+            (
+                lambda: self.proxy.SetName("name", dbus_interface=POOL, signature="o"),
+                "InvalidArgs",
+            ),
+            (
+                lambda: self.proxy.Get(
+                    POOL, "Unknown", dbus_interface=dbus.PROPERTIES_IFACE
+                ),
+                "UnknownProperty",
+            ),
+            (
+                lambda: self.proxy.Set(
+                    POOL, "Name", "", dbus_interface=dbus.PROPERTIES_IFACE
+                ),
+                "PropertyReadOnly",
+            ),
+            (
+                lambda: self.proxy.Get(
+                    "org.example.Extra", "Secret", dbus_interface=dbus.PROPERTIES_IFACE
+                ),
+                "Failed",
+            ),
+            (
+                lambda: self.proxy.Delete(dbus_interface=dbus.PROPERTIES_IFACE),
+                "UnknownMethod",
+            ),
+        ):
+            with self.subTest(name=name), self.assertRaises(dbus.DBusException) as ctx:
+                func()
+            self.assertEqual(
+                ctx.exception.get_dbus_name(), f"org.freedesktop.DBus.Error.{name}"
+            )
+
+        with self.assertRaises(AttributeError):
+            self.proxy.__wrapped__  # noqa: B018
+
+    def test_inject_error(self):
+        """
+        Injected errors are raised for the given number of invocations.
+        """
+        self.proxy.inject_error(POOL, "Name.Get", count=2)
+        for _ in range(2):
+            with self.assertRaises(DPClientInvocationError):
+                self.pool.Properties.Name.Get(self.proxy)
+        self.pool.Properties.Name.Get(self.proxy)
+
+        error = ValueError("error")
+        self.proxy.inject_error(POOL, "GetAll", error, probability=0.5)
+        failures = 0
+        attempts = 100
+        for _ in range(attempts):
+            try:
+                self.proxy.GetAll(POOL, dbus_interface=dbus.PROPERTIES_IFACE)
+            except ValueError as err:
+                self.assertIs(err, error)
+                failures += 1
+        self.assertTrue(0 < failures < attempts)
+
+        self.proxy.clear_errors()
+        self.proxy.GetAll(POOL, dbus_interface=dbus.PROPERTIES_IFACE)
+        self.assertEqual(self.proxy.calls[(POOL, "GetAll")], attempts + 1)
+
+    def test_properties_changed(self):
+        """
+        Setting a property emits PropertiesChanged, which updates a cache.
+        """
+        self.enterContext(default_main_loop())
+        cache = PropertyCache()
+        klass = make_class(
+            "Filesystem", ET.fromstring(SPECS[FILESYSTEM]), property_cache=cache
+        )
+        klass.Properties.Name.Get(self.proxy)
+        klass.Properties.Devnode.Get(self.proxy)
+
+        self.proxy.set_property(FILESYSTEM, "Name", "new")
+        self.assertEqual(klass.Properties.Name.Get(self.proxy), "new")
+        self.proxy.set_property(FILESYSTEM, "Devnode", "/dev/new")
+        self.assertEqual(klass.Properties.Devnode.Get(self.proxy), "/dev/new")
+        self.assertEqual(self.proxy.calls[(FILESYSTEM, "Name.Get")], 1)
+        self.assertEqual(self.proxy.calls[(FILESYSTEM, "Devnode.Get")], 2)
+
+        cache.clear()
+        match = self.proxy.connect_to_signal("PropertiesChanged", print)
+        match.remove()
+        match.remove()
+        self.proxy.set_property(FILESYSTEM, "Name", "newer")
+
+    def test_latency(self):
+        """
+        Replies are delayed, and are errors if the delay exceeds the timeout.
+        """
+        self.proxy.latency = lambda: 0.01
+        self.pool.Methods.SetName(self.proxy, {"name": "pool"})
+        with self.assertRaises(DPClientInvocationError) as ctx:
+            self.pool.Methods.SetName(self.proxy, {"name": "pool"}, timeout=0)
+        cause = ctx.exception.__cause__
+        assert isinstance(cause, dbus.DBusException)
+        self.assertEqual(cause.get_dbus_name(), "org.freedesktop.DBus.Error.NoReply")
+
+        self.proxy.latency = 0.01
+        self.proxy.inject_error(POOL, "SetName")
+        with self.assertRaises(DPClientInvocationError):
+            self.pool.Methods.SetName(self.proxy, {"name": "pool"})
+        results = asyncio.run(
+            batch_call(
+                self.manager.Async.Methods.DestroyPool,
+                [(self.proxy, {"pool": f"/{i}"}) for i in range(50)]
+                + [(self.proxy, {"pool": "/"})],
+                deadline=1,
+            )
+        )
+        self.assertEqual(results[0], ((False, ""), 0, ""))
+        self.assertEqual(self.proxy.calls[(MANAGER, "DestroyPool")], 51)
+
+    def test_handlers_without_loop(self):
+        """
+        Without a running event loop, handlers are called on another thread.
+        """
+        replied = threading.Event()
+        failed = threading.Event()
+        errors = []
+
+        def error_handler(err):
+            errors.append(err)
+            failed.set()
+
+        self.proxy.Ping(
+            dbus_interface="org.example.Extra",
+            reply_handler=replied.set,
+            error_handler=error_handler,
+        )
+        self.proxy.Unknown(reply_handler=replied.set, error_handler=error_handler)
+        self.assertTrue(replied.wait(1))
+        self.assertTrue(failed.wait(1))
+        self.assertIsInstance(errors[0], dbus.DBusException)
@@ -12,6 +12,7 @@ from dbus_python_client_gen import (
     make_class,
 )
 from tests._introspect import SPECS
+from tests._proxy import RecordingProxy
 
 try:
     interfaces = list(SPECS)
@@ -19,10 +20,16 @@ try:
     TIMEOUT = 120000
 
     klasses = {}
+    compiled_klasses = {}
+    lazy_klasses = {}
     for key, value in SPECS.items():
         xml_spec = ET.fromstring(value)
         klass_def = make_class(key.split(".")[-2], xml_spec, TIMEOUT)
         klasses[key] = (xml_spec, klass_def)
+        klass_def = make_class(key.split(".")[-2], xml_spec, TIMEOUT, compiled=True)
+        compiled_klasses[key] = (xml_spec, klass_def)
+        klass_def = make_class(key.split(".")[-2], xml_spec, TIMEOUT, lazy=True)
+        lazy_klasses[key] = (xml_spec, klass_def)
 
 except DPClientGenerationError as err:
     raise RuntimeError(
@@ -87,9 +94,11 @@ class TestCase(unittest.TestCase):
         with self.assertRaises(DPClientKeywordError):
             method(None, {"bogus_keyword": None})
 
-    def _test_klasses(self):
+    def _test_klasses(self, klasses):
         """
         Test the standard classes specified.
+
+        :param klasses: map of interface names to specs and classes
         """
         for _, (spec, klass) in klasses.items():
             self.assertTrue(hasattr(klass, "Properties"))
@@ -108,4 +117,68 @@ class TestCase(unittest.TestCase):
         """
         Test properties and methods of all specs available.
         """
-        self._test_klasses()
+        self._test_klasses(klasses)
+
+    def test_compiled_specs(self):
+        """
+        Test properties and compiled methods of all specs available.
+        """
+        self._test_klasses(compiled_klasses)
+
+    def test_lazy_specs(self):
+        """
+        Test lazily generated properties and methods of all specs available.
+        """
+        self._test_klasses(lazy_klasses)
+
+
+class CompiledTestCase(unittest.TestCase):
+    """
+    Test the behavior of compiled methods.
+    """
+
+    def setUp(self):
+        self.methods = compiled_klasses["org.storage.stratis3.Manager.r5"][1].Methods
+
+    def test_argument_order(self):
+        """
+        Arguments are passed in signature order regardless of keyword order.
+        """
+        proxy = RecordingProxy()
+        self.methods.CreatePool(
+            proxy,
+            {
+                "clevis_info": (False, ("", "")),
+                "key_desc": (False, ""),
+                "devices": ["/dev/one", "/dev/two"],
+                "name": "pool",
+            },
+        )
+        ((interface, name, args, kwargs),) = proxy.invocations
+        self.assertEqual(interface, "org.storage.stratis3.Manager.r5")
+        self.assertEqual(name, "CreatePool")
+        self.assertEqual(args[0], "pool")
+        self.assertEqual(list(args[1]), ["/dev/one", "/dev/two"])
+        self.assertEqual(kwargs, {"signature": "sas(bs)(b(ss))", "timeout": TIMEOUT})
+
+    def test_keyword_errors(self):
+        """
+        Missing and additional keywords are both rejected.
+        """
+        proxy = RecordingProxy()
+        with self.assertRaises(DPClientKeywordError) as context:
+            self.methods.DestroyPool(proxy, {})
+        self.assertEqual(context.exception.expected, ["pool"])
+        self.assertEqual(context.exception.actual, [])
+
+        with self.assertRaises(DPClientKeywordError):
+            self.methods.DestroyPool(proxy, {"pool": "/", "force": True})
+        self.assertEqual(proxy.invocations, [])
+
+    def test_marshalling_error(self):
+        """
+        Arguments which can not be transformed are rejected.
+        """
+        with self.assertRaises(DPClientMarshallingError) as context:
+            self.methods.DestroyPool(RecordingProxy(), {"pool": None})
+        self.assertEqual(context.exception.arguments, [None])
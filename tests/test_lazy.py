@@ -0,0 +1,83 @@
+"""
+Test lazy generation of classes.
+"""
+
+import unittest
+import xml.etree.ElementTree as ET
+
+from dbus_python_client_gen import DPClientGenerationError, make_class
+from tests._introspect import SPECS
+
+BAD_SPEC = """
+<interface name="org.example.Bad">
+    <method name="Good">
+      <arg name="name" type="s" direction="in" />
+    </method>
+    <method name="Bad">
+      <arg name="name" type="a{" direction="in" />
+    </method>
+    <method name="TooFew">
+      <arg name="first" type="s" direction="in" />
+      <arg name="second" type="" direction="in" />
+    </method>
+    <property name="GoodProperty" type="s" access="readwrite" />
+    <property name="BadProperty" type="(s" access="write" />
+    <property name="TooMany" type="ss" access="readwrite" />
+  </interface>
+"""
+
+
+class LazyTestCase(unittest.TestCase):
+    """
+    Test the behavior of lazily generated classes.
+    """
+
+    def test_generated_on_access(self):
+        """
+        Members are generated on first access and then cached.
+        """
+        klass = make_class(
+            "Pool", ET.fromstring(SPECS["org.storage.stratis3.pool.r5"]), lazy=True
+        )
+        self.assertNotIn("SetName", vars(klass.Methods))
+        self.assertNotIn("Name", vars(klass.Properties))
+        self.assertIn("SetName", dir(klass.Methods))
+        self.assertIn("Name", dir(klass.Properties))
+
+        method = klass.Methods.SetName
+        self.assertIn("SetName", vars(klass.Methods))
+        self.assertIs(klass.Methods.SetName, method)
+
+        prop = klass.Properties.Name
+        self.assertIn("Name", vars(klass.Properties))
+        self.assertIs(klass.Properties.Name, prop)
+
+        self.assertFalse(hasattr(klass.Methods, "Bogus"))
+
+    def test_errors_on_access(self):
+        """
+        Malformed signatures are reported when the member is generated.
+        """
+        klass = make_class("Bad", ET.fromstring(BAD_SPEC), lazy=True)
+        self.assertTrue(hasattr(klass.Methods, "Good"))
+        self.assertTrue(hasattr(klass.Properties, "GoodProperty"))
+        for name in ("Bad", "TooFew"):
+            with self.assertRaises(DPClientGenerationError):
+                getattr(klass.Methods, name)
+        for name in ("BadProperty", "TooMany"):
+            with self.assertRaises(DPClientGenerationError):
+                getattr(klass.Properties, name)
+
+    def test_errors_on_validate(self):
+        """
+        Malformed signatures are reported immediately if validate is True,
+        or if the class is not lazy.
+        """
+        for spec in (
+            BAD_SPEC.replace('type="(s"', 'type="s"').replace('type="ss"', 'type="s"'),
+            BAD_SPEC.replace('type="a{"', 'type="s"').replace('type=""', 'type="s"'),
+        ):
+            with self.assertRaises(DPClientGenerationError):
+                make_class("Bad", ET.fromstring(spec), lazy=True, validate=True)
+            with self.assertRaises(DPClientGenerationError):
+                make_class("Bad", ET.fromstring(spec))
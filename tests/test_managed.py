@@ -0,0 +1,204 @@
+"""
+Test views of the objects in a GetManagedObjects reply.
+"""
+
+import unittest
+import xml.etree.ElementTree as ET
+
+from dbus_python_client_gen import (
+    DPClientGenerationError,
+    ManagedObjects,
+    make_class,
+    make_module_source,
+)
+from tests._introspect import SPECS
+from tests._proxy import RecordingBus
+
+POOL = "org.storage.stratis3.pool.r5"
+FILESYSTEM = "org.storage.stratis3.filesystem.r5"
+OBJECT_MANAGER = "org.freedesktop.DBus.ObjectManager"
+
+
+def _filesystem(name, uuid, pool="/pool/1"):
+    """
+    The properties of a filesystem, as in a GetManagedObjects reply.
+    """
+    return {"Name": name, "Uuid": uuid, "Pool": pool, "Used": (True, "1")}
+
+
+MANAGED_OBJECTS = {
+    "/": {"org.freedesktop.DBus.ObjectManager": {}},
+    "/pool/1": {
+        POOL: {"Name": "pool", "Uuid": "p1", "FsLimit": 4},
+        "org.freedesktop.DBus.Properties": {},
+    },
+    "/fs/1": {FILESYSTEM: _filesystem("fs", "f1")},
+    "/fs/2": {FILESYSTEM: _filesystem("fs", "f2", pool="/pool/2")},
+}
+
+
+class ManagedObjectsTestCase(unittest.TestCase):
+    """
+    Test the behavior of ManagedObjects.
+    """
+
+    def setUp(self):
+        self.pool = make_class("Pool", ET.fromstring(SPECS[POOL]))
+        self.filesystem = make_class(
+            "Filesystem", ET.fromstring(SPECS[FILESYSTEM]), decode=True
+        )
+        self.objects = ManagedObjects(
+            [self.pool, self.filesystem], index=("Name", "Uuid", "Used")
+        )
+        self.objects.load(MANAGED_OBJECTS)
+
+    def test_views(self):
+        """
+        Each object has a view for each interface with a class.
+        """
+        self.assertEqual(list(self.objects.views(self.pool)), ["/pool/1"])
+        pool = self.objects.views(self.pool)["/pool/1"]
+        self.assertEqual((pool.Name, pool.FsLimit), ("pool", 4))
+        self.assertFalse(hasattr(pool, "Encrypted"))
+
+        filesystems = self.objects.views(self.filesystem)
+        self.assertEqual(filesystems["/fs/2"].Pool, "/pool/2")
+        self.assertIs(type(filesystems["/fs/1"].Used), tuple)
+
+    def test_find(self):
+        """
+        Views are indexed by the values of properties.
+        """
+        self.assertEqual(
+            sorted(self.objects.find(self.filesystem, "Name", "fs")), ["/fs/1", "/fs/2"]
+        )
+        self.assertEqual(list(self.objects.find(self.pool, "Uuid", "p1")), ["/pool/1"])
+        self.assertEqual(self.objects.find(self.pool, "Name", "other"), {})
+        self.assertEqual(self.objects.find(self.pool, "Name", ["unhashable"]), {})
+        self.assertEqual(
+            len(self.objects.find(self.filesystem, "Used", (True, "1"))), 2
+        )
+        with self.assertRaises(KeyError):
+            self.objects.find(self.pool, "Size", "1")
+
+    def test_changes(self):
+        """
+        Views are added and removed as for InterfacesAdded and
+        InterfacesRemoved.
+        """
+        self.objects.add_interfaces("/fs/1", {FILESYSTEM: _filesystem("new", "f1")})
+        self.assertEqual(
+            list(self.objects.find(self.filesystem, "Name", "fs")), ["/fs/2"]
+        )
+        self.assertEqual(self.objects.views(self.filesystem)["/fs/1"].Name, "new")
+
+        self.objects.remove_interfaces("/fs/2", [FILESYSTEM, "org.example.Other"])
+        self.objects.remove_interfaces("/fs/3", [FILESYSTEM])
+        self.assertEqual(self.objects.find(self.filesystem, "Name", "fs"), {})
+        self.assertEqual(list(self.objects.views(self.filesystem)), ["/fs/1"])
+
+        self.objects.remove_interfaces("/pool/1", [POOL])
+        self.assertEqual(self.objects.views(self.pool), {})
+        self.assertEqual(self.objects.find(self.pool, "Name", "pool"), {})
+
+        self.objects.load({})
+        self.assertEqual(self.objects.views(self.filesystem), {})
+
+    def test_properties_changed(self):
+        """
+        Views are replaced as for PropertiesChanged, and reindexed.
+        """
+        old_view = self.objects.views(self.filesystem)["/fs/1"]
+        self.objects.properties_changed(
+            "/fs/1", FILESYSTEM, {"Name": "new", "Size": "2"}, ["Used"]
+        )
+        view = self.objects.views(self.filesystem)["/fs/1"]
+        self.assertEqual((view.Name, view.Uuid, view.Size), ("new", "f1", "2"))
+        self.assertFalse(hasattr(view, "Used"))
+        self.assertEqual(old_view.Name, "fs")
+        self.assertEqual(
+            list(self.objects.find(self.filesystem, "Name", "new")), ["/fs/1"]
+        )
+        self.assertEqual(
+            len(self.objects.find(self.filesystem, "Used", (True, "1"))), 1
+        )
+
+        self.objects.properties_changed("/fs/3", FILESYSTEM, {"Name": "other"})
+        self.objects.properties_changed("/fs/1", "org.example.Other", {"Name": "x"})
+        self.assertEqual(self.objects.find(self.filesystem, "Name", "other"), {})
+
+    def test_watch(self):
+        """
+        Views are kept up to date by signals, with one match for each signal.
+        """
+        bus = RecordingBus()
+        self.objects.watch(bus, "org.storage.stratis3", "/org/storage/stratis3")
+        self.objects.watch(bus, "org.storage.stratis3", "/org/storage/stratis3")
+        self.assertEqual(len(bus.receivers), 3)
+
+        bus.emit(
+            "InterfacesAdded",
+            "/org/storage/stratis3",
+            "/fs/3",
+            {FILESYSTEM: _filesystem("fs", "f3")},
+            dbus_interface=OBJECT_MANAGER,
+        )
+        self.assertEqual(len(self.objects.find(self.filesystem, "Name", "fs")), 3)
+
+        bus.emit(
+            "PropertiesChanged",
+            "/fs/3",
+            FILESYSTEM,
+            {"Name": "new"},
+            [],
+            dbus_interface="org.freedesktop.DBus.Properties",
+        )
+        self.assertEqual(
+            list(self.objects.find(self.filesystem, "Name", "new")), ["/fs/3"]
+        )
+
+        bus.emit(
+            "InterfacesRemoved",
+            "/org/storage/stratis3",
+            "/fs/3",
+            [FILESYSTEM],
+            dbus_interface=OBJECT_MANAGER,
+        )
+        self.assertNotIn("/fs/3", self.objects.views(self.filesystem))
+
+        self.objects.unwatch()
+        self.assertEqual(bus.receivers, [])
+
+    def test_unhashable(self):
+        """
+        Unhashable values are not indexed.
+        """
+        spec = ET.fromstring(
+            '<interface name="a.b"><property name="Name" type="as" access="read"/>'
+            "</interface>"
+        )
+        klass = make_class("Klass", spec)
+        objects = ManagedObjects([klass], index=("Name",))
+        objects.load({"/1": {"a.b": {"Name": ["a"]}}})
+        objects.remove_interfaces("/1", ["a.b"])
+        self.assertEqual(objects.views(klass), {})
+
+    def test_classes(self):
+        """
+        Classes of generated modules have views, and classes without a
+        GetAll method are rejected.
+        """
+        namespace = {}
+        exec(  # nosec B102
+            make_module_source({"Pool": ET.fromstring(SPECS[POOL])}), namespace
+        )
+        objects = ManagedObjects([namespace["Pool"]])
+        objects.load(MANAGED_OBJECTS)
+        self.assertEqual(objects.views(namespace["Pool"])["/pool/1"].Uuid, "p1")
+
+        spec = ET.fromstring(
+            '<interface name="a.b"><property name="GetAll" type="s" access="read"/>'
+            "</interface>"
+        )
+        with self.assertRaises(DPClientGenerationError):
+            ManagedObjects([make_class("Klass", spec)])
@@ -0,0 +1,78 @@
+"""
+Test selective generation of the members of an interface.
+"""
+
+import unittest
+import xml.etree.ElementTree as ET
+
+from dbus_python_client_gen import DPClientGenerationError, make_class
+from tests._introspect import SPECS
+from tests._proxy import RecordingProxy
+
+POOL = "org.storage.stratis3.pool.r5"
+
+
+class MembersTestCase(unittest.TestCase):
+    """
+    Test the behavior of classes made with member filters.
+    """
+
+    def setUp(self):
+        self.spec = ET.fromstring(SPECS[POOL])
+
+    def test_allowlist(self):
+        """
+        Only the members named are generated, for every kind of class.
+        """
+        for lazy in (False, True):
+            with self.subTest(lazy=lazy):
+                klass = make_class(
+                    "Pool",
+                    self.spec,
+                    lazy=lazy,
+                    asynchronous=True,
+                    members=["SetName", "Name", "Uuid"],
+                )
+                self.assertTrue(callable(klass.Methods.SetName))
+                self.assertTrue(callable(klass.Async.Properties.Name.Get))
+                with self.assertRaisesRegex(AttributeError, "excluded"):
+                    klass.Methods.AddDataDevs  # noqa: B018
+                with self.assertRaisesRegex(AttributeError, "excluded"):
+                    klass.Async.Properties.FsLimit  # noqa: B018
+                with self.assertRaises(AttributeError) as ctx:
+                    klass.Methods.Unknown  # noqa: B018
+                self.assertNotIn("excluded", str(ctx.exception))
+                self.assertNotIn("AddDataDevs", dir(klass.Methods))
+
+                snapshot = klass.Properties.GetAll(
+                    RecordingProxy({"Name": "pool", "FsLimit": 4})
+                )
+                self.assertEqual(snapshot.Name, "pool")
+                self.assertFalse(hasattr(snapshot, "FsLimit"))
+
+    def test_denylist(self):
+        """
+        The members named are not generated.
+        """
+        klass = make_class("Pool", self.spec, exclude_members=["SetName", "Name"])
+        self.assertTrue(callable(klass.Properties.Uuid.Get))
+        self.assertTrue(callable(klass.Methods.AddDataDevs))
+        with self.assertRaisesRegex(AttributeError, "excluded"):
+            klass.Methods.SetName  # noqa: B018
+        with self.assertRaisesRegex(AttributeError, "excluded"):
+            klass.Properties.Name  # noqa: B018
+
+        klass = make_class(
+            "Pool", self.spec, members=["Name"], exclude_members=["Name"]
+        )
+        with self.assertRaisesRegex(AttributeError, "excluded"):
+            klass.Properties.Name  # noqa: B018
+
+    def test_unknown(self):
+        """
+        Members selected or excluded must belong to the interface.
+        """
+        with self.assertRaises(DPClientGenerationError):
+            make_class("Pool", self.spec, members=["Name", "Unknown"])
+        with self.assertRaises(DPClientGenerationError):
+            make_class("Pool", self.spec, exclude_members=["Unknown"])
@@ -0,0 +1,239 @@
+"""
+Test recording of invocation metrics.
+"""
+
+import asyncio
+import time
+import unittest
+import xml.etree.ElementTree as ET
+
+import dbus
+
+from dbus_python_client_gen import (
+    DPClientInvocationError,
+    DPClientKeywordError,
+    DPClientMarshallingError,
+    Histogram,
+    InvocationMetrics,
+    make_class,
+)
+from dbus_python_client_gen._metrics import _TimingProxy
+from tests._introspect import SPECS
+from tests._proxy import RecordingProxy
+
+INTERFACE_NAME = "org.storage.stratis3.pool.r5"
+
+# Seconds that a SlowProxy takes to resolve a method
+RESOLVE_TIME = 0.1
+
+
+class SlowProxy(RecordingProxy):
+    """
+    Stands in for a proxy object which is slow to resolve methods and whose
+    methods reply after a delay.
+    """
+
+    def __init__(self, reply=None, error=None, delay: float | None = 0.02):
+        """
+        Initialize the proxy.
+
+        :param reply: the value to return from every method invoked
+        :param error: if not None, the exception every method raises
+        :param delay: seconds before each reply, or None to never reply
+        """
+        super().__init__(reply, error)
+        self.delay = delay
+
+    def get_dbus_method(self, member, dbus_interface=None):
+        """
+        Return, slowly, a function that replies after the delay.
+        """
+        time.sleep(RESOLVE_TIME)
+        method = super().get_dbus_method(member, dbus_interface)
+
+        def the_method(*args, reply_handler=None, error_handler=None, **kwargs):
+            if reply_handler is None:
+                time.sleep(self.delay or 0)
+                return method(*args, **kwargs)
+
+            if self.delay is not None:
+                asyncio.get_running_loop().call_later(
+                    self.delay,
+                    lambda: method(
+                        *args,
+                        reply_handler=reply_handler,
+                        error_handler=error_handler,
+                        **kwargs,
+                    ),
+                )
+            return None
+
+        return the_method
+
+
+class MetricsTestCase(unittest.TestCase):
+    """
+    Test the behavior of instrumented classes.
+    """
+
+    def setUp(self):
+        self.metrics = InvocationMetrics()
+        spec = ET.fromstring(SPECS[INTERFACE_NAME])
+        self.klasses = [
+            make_class("Pool", spec, metrics=self.metrics, asynchronous=True),
+            make_class("Pool", spec, metrics=self.metrics, compiled=True),
+        ]
+
+    def test_calls(self):
+        """
+        Each invocation is recorded with its marshalling time.
+        """
+        for klass in self.klasses:
+            with self.subTest(klass=klass):
+                self.metrics.clear()
+                proxy = RecordingProxy()
+                for _ in range(2):
+                    klass.Methods.SetName(proxy, {"name": "pool"})
+                klass.Methods.RebindClevis(proxy, {})
+                klass.Properties.Name.Get(proxy)
+                klass.Properties.FsLimit.Set(proxy, 64)
+                klass.Properties.GetAll(RecordingProxy({}))
+
+                members = self.metrics.members()
+                self.assertEqual(
+                    {name: member.calls for ((_, name), member) in members.items()},
+                    {
+                        "SetName": 2,
+                        "RebindClevis": 1,
+                        "Name.Get": 1,
+                        "FsLimit.Set": 1,
+                        "GetAll": 1,
+                    },
+                )
+                set_name = members[(INTERFACE_NAME, "SetName")]
+                self.assertGreater(set_name.marshal_time.total, 0)
+                self.assertEqual(sum(set_name.bus_time.counts), 2)
+                self.assertGreater(
+                    members[(INTERFACE_NAME, "FsLimit.Set")].marshal_time.total, 0
+                )
+                self.assertEqual(
+                    members[(INTERFACE_NAME, "Name.Get")].marshal_time.total, 0
+                )
+
+    def test_errors(self):
+        """
+        Errors are counted by type.
+        """
+        klass = self.klasses[0]
+        proxy = RecordingProxy(error=dbus.DBusException("failed"))
+        for func_args in ({}, {"filesystems": ["fs"]}, {"filesystems": ["/fs"]}):
+            with self.assertRaises(
+                (
+                    DPClientKeywordError,
+                    DPClientMarshallingError,
+                    DPClientInvocationError,
+                )
+            ):
+                klass.Methods.DestroyFilesystems(proxy, func_args)
+
+        member = self.metrics.members()[(INTERFACE_NAME, "DestroyFilesystems")]
+        self.assertEqual(member.calls, 3)
+        self.assertEqual(
+            member.errors,
+            {
+                DPClientKeywordError: 1,
+                DPClientMarshallingError: 1,
+                DPClientInvocationError: 1,
+            },
+        )
+        self.assertIn("calls=3", repr(member))
+
+    def test_async(self):
+        """
+        Invocations of coroutine functions are recorded also.
+        """
+        klass = self.klasses[0]
+        proxy = RecordingProxy()
+        asyncio.run(klass.Async.Methods.SetName(proxy, {"name": "pool"}))
+        with self.assertRaises(DPClientKeywordError):
+            asyncio.run(klass.Async.Methods.SetName(proxy, {}))
+
+        member = self.metrics.members()[(INTERFACE_NAME, "SetName")]
+        self.assertEqual(member.calls, 2)
+        self.assertEqual(member.errors, {DPClientKeywordError: 1})
+        self.assertGreater(member.marshal_time.total, 0)
+
+    def test_bus_time(self):
+        """
+        Only the time from sending a message to its reply is bus time.
+        """
+        for klass in self.klasses:
+            with self.subTest(klass=klass):
+                self.metrics.clear()
+                klass.Methods.SetName(SlowProxy(), {"name": "pool"})
+                klass.Properties.Name.Get(SlowProxy())
+                for member in self.metrics.members().values():
+                    self.assertGreaterEqual(member.bus_time.total, 0.02)
+                    self.assertLess(member.bus_time.total, RESOLVE_TIME)
+
+        klass = self.klasses[0]
+        self.metrics.clear()
+        asyncio.run(klass.Async.Methods.SetName(SlowProxy(), {"name": "pool"}))
+        with self.assertRaises(DPClientInvocationError):
+            asyncio.run(
+                klass.Async.Properties.Name.Get(
+                    SlowProxy(error=dbus.DBusException("failed"))
+                )
+            )
+        for member in self.metrics.members().values():
+            self.assertGreaterEqual(member.bus_time.total, 0.02)
+            self.assertLess(member.bus_time.total, RESOLVE_TIME)
+
+    def test_timing_proxy(self):
+        """
+        The wrapper of a proxy object passes on its other attributes.
+        """
+        proxy = _TimingProxy(RecordingProxy(), [0.0, 0.0])
+        self.assertEqual(proxy.object_path, "/org/example")
+        self.assertFalse(hasattr(proxy, "__len__"))
+
+    def test_other_exceptions(self):
+        """
+        Invocations which raise other exceptions are recorded, but not
+        counted as errors.
+        """
+        klass = self.klasses[0]
+        with self.assertRaises(RuntimeError):
+            klass.Methods.SetName(SlowProxy(error=RuntimeError("bug")), {"name": "a"})
+
+        async def timed_out():
+            await asyncio.wait_for(
+                klass.Async.Properties.Name.Get(SlowProxy(delay=None)), 0.01
+            )
+
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(timed_out())
+
+        members = self.metrics.members()
+        for name in ("SetName", "Name.Get"):
+            member = members[(INTERFACE_NAME, name)]
+            self.assertEqual((member.calls, member.errors), (1, {}))
+            self.assertEqual(member.bus_time.count, 1)
+
+    def test_uninstrumented(self):
+        """
+        Classes are only instrumented on request.
+        """
+        klass = make_class("Pool", ET.fromstring(SPECS[INTERFACE_NAME]))
+        self.assertIsNone(getattr(klass.Methods.SetName, "__wrapped__", None))
+
+    def test_histogram(self):
+        """
+        Durations are counted in the least bucket that can hold them.
+        """
+        histogram = Histogram((0.1, 1.0))
+        for duration in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(duration)
+        self.assertEqual(histogram.counts, [2, 1, 1])
+        self.assertEqual(histogram.count, 4)
+        self.assertIn("count=4", repr(histogram))
@@ -0,0 +1,96 @@
+"""
+Test generating classes from a whole introspection document.
+"""
+
+import io
+import os
+import pathlib
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+
+from dbus_python_client_gen import DPClientGenerationError, make_classes
+from tests._introspect import SPECS
+
+MANAGER = "org.storage.stratis3.Manager.r5"
+POOL = "org.storage.stratis3.pool.r5"
+FILESYSTEM = "org.storage.stratis3.filesystem.r5"
+
+DOCUMENT = f"""
+<node name="/org/storage/stratis3">
+  {SPECS[MANAGER]}
+  {SPECS["org.freedesktop.DBus.ObjectManager"]}
+  <node name="pool">
+    {SPECS[POOL]}
+    <node name="filesystem">
+      {SPECS[FILESYSTEM]}
+      {SPECS[POOL]}
+    </node>
+  </node>
+</node>
+"""
+
+
+class MakeClassesTestCase(unittest.TestCase):
+    """
+    Test the behavior of make_classes.
+    """
+
+    def test_all(self):
+        """
+        Every interface of every node has a class.
+        """
+        classes = make_classes(io.StringIO(DOCUMENT), timeout=120)
+        self.assertEqual(
+            sorted(classes),
+            sorted([MANAGER, POOL, FILESYSTEM, "org.freedesktop.DBus.ObjectManager"]),
+        )
+        self.assertEqual(classes[POOL].__name__, POOL)
+        self.assertTrue(hasattr(classes[MANAGER].Methods, "CreatePool"))
+
+    def test_allowlist(self):
+        """
+        Only the interfaces named have classes, made with the options given.
+        """
+        classes = make_classes(
+            io.BytesIO(DOCUMENT.encode()), [FILESYSTEM], lazy=True, decode=True
+        )
+        self.assertEqual(list(classes), [FILESYSTEM])
+        self.assertTrue(hasattr(classes[FILESYSTEM].Properties, "Name"))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "node.xml")
+            with open(path, "w", encoding="utf-8") as node_file:
+                node_file.write(DOCUMENT)
+            self.assertEqual(list(make_classes(pathlib.Path(path), [POOL])), [POOL])
+
+    def test_text(self):
+        """
+        A str is the text of the document, not a path.
+        """
+        classes = make_classes(DOCUMENT, [POOL, MANAGER])
+        self.assertEqual(sorted(classes), [MANAGER, POOL])
+
+        with self.assertRaises(DPClientGenerationError):
+            make_classes("node.xml")
+
+    def test_element(self):
+        """
+        The interfaces of a parsed document have classes, and the document
+        is left unchanged.
+        """
+        node = ET.fromstring(DOCUMENT)
+        classes = make_classes(node, [FILESYSTEM, POOL])
+        self.assertEqual(sorted(classes), [FILESYSTEM, POOL])
+        self.assertEqual(ET.tostring(node), ET.tostring(ET.fromstring(DOCUMENT)))
+        self.assertEqual(len(make_classes(node)), 4)
+
+    def test_errors(self):
+        """
+        Missing interfaces and malformed documents are errors.
+        """
+        with self.assertRaises(DPClientGenerationError):
+            make_classes(io.StringIO(DOCUMENT), [POOL, "org.example.Missing"])
+        with self.assertRaises(DPClientGenerationError):
+            make_classes(io.StringIO("<node><interface name='a.b'>"))
+        self.assertEqual(make_classes(io.StringIO("<node><interface/></node>")), {})
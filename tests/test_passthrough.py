@@ -0,0 +1,189 @@
+"""
+Test passing through arguments which are already of dbus-python types.
+"""
+
+import unittest
+import xml.etree.ElementTree as ET
+
+import dbus
+import dbus.lowlevel
+
+from dbus_python_client_gen import make_class
+from dbus_python_client_gen._passthrough import complete_type_checker, passing_through
+from tests._introspect import SPECS
+from tests._proxy import RecordingProxy
+
+MANAGER = "org.storage.stratis3.Manager.r5"
+POOL = "org.storage.stratis3.pool.r5"
+
+ARRAY_SPEC = """
+<interface name="org.example.Array">
+    <property name="Sizes" type="at" access="readwrite" />
+</interface>
+"""
+
+
+def _create_pool_args(klass, **func_args):
+    """
+    Invoke CreatePool and return the arguments sent.
+    """
+    proxy = RecordingProxy(reply=())
+    klass.Methods.CreatePool(proxy, func_args)
+    ((_, _, args, _),) = proxy.invocations
+    return args
+
+
+class PassthroughTestCase(unittest.TestCase):
+    """
+    Test the behavior of classes made with passthrough.
+    """
+
+    def setUp(self):
+        self.spec = ET.fromstring(SPECS[MANAGER])
+
+    def test_passed_through(self):
+        """
+        Arguments of the right types are sent unchanged, others transformed.
+        """
+        name = dbus.String("pool")
+        devices = dbus.Array(["/dev/a"], signature="s")
+        key_desc = dbus.Struct((dbus.Boolean(True), "key"), signature="bs")
+        for compiled in (False, True):
+            with self.subTest(compiled=compiled):
+                klass = make_class(
+                    "Manager", self.spec, compiled=compiled, passthrough=True
+                )
+                args = _create_pool_args(
+                    klass,
+                    name=name,
+                    devices=devices,
+                    key_desc=key_desc,
+                    clevis_info=(False, ("", "")),
+                )
+                self.assertIs(args[0], name)
+                self.assertIs(args[1], devices)
+                self.assertIs(args[2], key_desc)
+                self.assertIsInstance(args[3], dbus.Struct)
+
+    def test_transformed(self):
+        """
+        Values of other types, or with other signatures, are transformed.
+        """
+        for passthrough in (False, True):
+            with self.subTest(passthrough=passthrough):
+                klass = make_class("Manager", self.spec, passthrough=passthrough)
+                name = dbus.String("pool") if not passthrough else "pool"
+                devices = dbus.Array(["/dev/a"], signature="o")
+                args = _create_pool_args(
+                    klass,
+                    name=name,
+                    devices=devices,
+                    key_desc=(False, ""),
+                    clevis_info=(False, ("", "")),
+                )
+                self.assertIsNot(args[0], name)
+                self.assertEqual(args[0], "pool")
+                self.assertIsNot(args[1], devices)
+                self.assertEqual(args[1].signature, "s")
+
+    def test_strict(self):
+        """
+        Containers are sent unchanged only if their contents are also of
+        the right types.
+        """
+        klass = make_class("Manager", self.spec, strict_passthrough=True)
+        plain = dbus.Array(["/dev/a"], signature="s")
+        typed = dbus.Array([dbus.String("/dev/a")])
+        key_desc = dbus.Struct((dbus.Boolean(True), dbus.String("key")))
+        args = _create_pool_args(
+            klass,
+            name="pool",
+            devices=plain,
+            key_desc=key_desc,
+            clevis_info=(False, ("", "")),
+        )
+        self.assertIsNot(args[1], plain)
+        self.assertIs(args[2], key_desc)
+
+        args = _create_pool_args(
+            klass,
+            name="pool",
+            devices=typed,
+            key_desc=(True, ""),
+            clevis_info=(False, ("", "")),
+        )
+        self.assertIs(args[1], typed)
+
+    def test_setter(self):
+        """
+        A value from a variant is sent unchanged by a setter.
+        """
+        klass = make_class("Pool", ET.fromstring(SPECS[POOL]), passthrough=True)
+        for variant_level, same in ((0, True), (1, True), (2, False)):
+            with self.subTest(variant_level=variant_level):
+                proxy = RecordingProxy()
+                value = dbus.UInt64(5, variant_level=variant_level)
+                klass.Properties.FsLimit.Set(proxy, value)
+                ((_, _, (_, _, arg), _),) = proxy.invocations
+                self.assertEqual(arg is value, same)
+                self.assertEqual(arg, 5)
+
+    def test_setter_signature(self):
+        """
+        A container without a signature is transformed by a setter, so that
+        dbus-python does not guess the signature of the variant.
+        """
+        spec = ET.fromstring(ARRAY_SPEC)
+        for strict in (False, True):
+            klass = make_class(
+                "Array", spec, passthrough=True, strict_passthrough=strict
+            )
+            for value in (dbus.Array([1, 2]), dbus.Array([])):
+                with self.subTest(strict=strict, value=value):
+                    proxy = RecordingProxy()
+                    klass.Properties.Sizes.Set(proxy, value)
+                    ((_, _, (_, _, arg), _),) = proxy.invocations
+                    self.assertIsNot(arg, value)
+
+                    message = dbus.lowlevel.MethodCallMessage(
+                        "org.example", "/org/example", "org.example.Array", "Set"
+                    )
+                    message.append(arg, signature="v")
+                    (sent,) = message.get_args_list()
+                    self.assertEqual(sent.signature, "t")
+                    self.assertEqual(sent, list(value))
+
+            typed = dbus.Array([dbus.UInt64(1)], signature="t", variant_level=1)
+            proxy = RecordingProxy()
+            klass.Properties.Sizes.Set(proxy, typed)
+            ((_, _, (_, _, arg), _),) = proxy.invocations
+            self.assertIs(arg, typed)
+
+    def test_checker(self):
+        """
+        Strict checking functions check the contents of containers.
+        """
+        self.assertIsNone(complete_type_checker("v"))
+        self.assertIs(passing_through("v", str), str)
+
+        check = complete_type_checker("a{sv}", strict=True)
+        assert check is not None
+        self.assertTrue(
+            check(dbus.Dictionary({dbus.String("a"): dbus.Int32(1, variant_level=1)}))
+        )
+        self.assertFalse(check(dbus.Dictionary({dbus.String("a"): 1})))
+        self.assertFalse(check({dbus.String("a"): dbus.Int32(1)}))
+        check = complete_type_checker("a{sv}")
+        assert check is not None
+        self.assertTrue(check(dbus.Dictionary({dbus.String("a"): 1})))
+
+        check = complete_type_checker("ay", strict=True)
+        assert check is not None
+        self.assertTrue(check(dbus.ByteArray(b"ab")))
+        self.assertTrue(check(dbus.Array([dbus.Byte(1)], signature="y")))
+        self.assertFalse(check(dbus.Array([1], signature="y")))
+
+        check = complete_type_checker("ay")
+        assert check is not None
+        self.assertTrue(check(dbus.Array([1], signature="y")))
+        self.assertFalse(check(dbus.Array([1], signature="i")))
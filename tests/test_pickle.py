@@ -0,0 +1,100 @@
+"""
+Test pickling generated classes.
+"""
+
+import concurrent.futures
+import gc
+import io
+import multiprocessing
+import pickle
+import unittest
+import xml.etree.ElementTree as ET
+
+from dbus_python_client_gen import (
+    InvocationMetrics,
+    PropertyCache,
+    SingleFlight,
+    make_class,
+    make_classes,
+)
+from tests._introspect import SPECS
+from tests._proxy import RecordingProxy
+
+POOL = "org.storage.stratis3.pool.r5"
+
+
+def _pool_name(klass):
+    """
+    Get the Name property of a pool by a class, in a worker process.
+    """
+    return (klass.__name__, klass.Properties.Name.Get(RecordingProxy("p")))
+
+
+class PickleTestCase(unittest.TestCase):
+    """
+    Test the behavior of pickled classes.
+    """
+
+    def setUp(self):
+        self.spec = ET.fromstring(SPECS[POOL])
+
+    def test_same_process(self):
+        """
+        A class unpickled in the process which has it is the same class.
+        """
+        klass = make_class("Pool", self.spec, lazy=True, members={"Name", "Uuid"})
+        self.assertIs(pickle.loads(pickle.dumps(klass)), klass)
+
+    def test_remade(self):
+        """
+        A class is made again from its specification and options, once.
+        """
+        klass = make_class("Pool", self.spec, decode=True, exclude_members=["Name"])
+        data = pickle.dumps(klass)
+        del klass
+        gc.collect()
+
+        klass = pickle.loads(data)
+        self.assertIs(pickle.loads(data), klass)
+        self.assertEqual(klass.__name__, "Pool")
+        self.assertEqual(klass.Properties.Uuid.Get(RecordingProxy("u")), "u")
+        with self.assertRaisesRegex(AttributeError, "excluded"):
+            klass.Properties.Name  # noqa: B018
+
+    def test_make_classes(self):
+        """
+        A class made from a whole document keeps its specification.
+        """
+        classes = make_classes(io.StringIO(f"<node>{SPECS[POOL]}</node>"))
+        data = pickle.dumps(classes)
+        self.assertIs(pickle.loads(data)[POOL], classes[POOL])
+        self.assertIn(b"AddDataDevs", data)
+
+    def test_local_options(self):
+        """
+        A class made with objects of this process can not be pickled.
+        """
+        for option, klass in (
+            (
+                "property_cache",
+                make_class("Pool", self.spec, property_cache=PropertyCache()),
+            ),
+            ("metrics", make_class("Pool", self.spec, metrics=InvocationMetrics())),
+            (
+                "single_flight",
+                make_class("Pool", self.spec, single_flight=SingleFlight()),
+            ),
+        ):
+            with self.subTest(option=option):
+                with self.assertRaisesRegex(pickle.PicklingError, option):
+                    pickle.dumps(klass)
+
+    def test_worker(self):
+        """
+        A class can be sent to a worker process which does not have it.
+        """
+        klass = make_class("Pool", self.spec, compiled=True)
+        with concurrent.futures.ProcessPoolExecutor(
+            1, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            self.assertEqual(executor.submit(_pool_name, klass).result(), ("Pool", "p"))
@@ -0,0 +1,217 @@
+"""
+Test the client-side cache of property values.
+"""
+
+import asyncio
+import unittest
+import warnings
+import xml.etree.ElementTree as ET
+from typing import Any
+
+import dbus
+
+from dbus_python_client_gen import (
+    DPClientInvocationError,
+    PropertyCache,
+    PropertyCacheInfo,
+    make_class,
+)
+from tests._introspect import SPECS
+from tests._proxy import RecordingProxy, default_main_loop
+
+FILESYSTEM = "org.storage.stratis3.filesystem.r5"
+BLOCKDEV = "org.storage.stratis3.blockdev.r5"
+
+
+class PropertyCacheTestCase(unittest.TestCase):
+    """
+    Test the behavior of getters which consult a property cache.
+    """
+
+    def setUp(self):
+        self.enterContext(default_main_loop())
+        self.cache = PropertyCache(maxsize=4)
+        self.filesystem = make_class(
+            "Filesystem",
+            ET.fromstring(SPECS[FILESYSTEM]),
+            property_cache=self.cache,
+            asynchronous=True,
+        )
+        self.blockdev = make_class(
+            "Blockdev", ET.fromstring(SPECS[BLOCKDEV]), property_cache=self.cache
+        )
+
+    def test_const(self):
+        """
+        A constant property is fetched once, without watching any signal.
+        """
+        proxy = RecordingProxy("created")
+        for _ in range(3):
+            self.assertEqual(self.filesystem.Properties.Created.Get(proxy), "created")
+        self.assertEqual(len(proxy.invocations), 1)
+        self.assertEqual(proxy.matches, [])
+        self.assertEqual(self.cache.cache_info(), PropertyCacheInfo(2, 1, 4, 1))
+
+    def test_changed(self):
+        """
+        A property whose changes are signalled is updated by the signal.
+        """
+        proxy = RecordingProxy("name")
+        bound = self.filesystem.bind(proxy)
+        self.assertEqual(bound.Properties.Name.Get(), "name")
+        self.assertEqual(len(proxy.matches), 1)
+
+        proxy.emit("PropertiesChanged", FILESYSTEM, {"Name": "new", "Size": "1"}, [])
+        self.assertEqual(bound.Properties.Name.Get(), "new")
+        self.assertEqual(len(proxy.invocations), 1)
+        self.assertEqual(self.cache.cache_info().currsize, 1)
+
+    def test_invalidated(self):
+        """
+        A property which is invalidated by the signal is fetched again, and
+        the signal is no longer watched once nothing is cached.
+        """
+        proxy = RecordingProxy("/dev/fs")
+        self.filesystem.Properties.Devnode.Get(proxy)
+        proxy.emit("PropertiesChanged", FILESYSTEM, {}, ["Devnode"])
+        self.assertEqual(proxy.matches, [])
+
+        self.filesystem.Properties.Devnode.Get(proxy)
+        self.filesystem.Properties.Devnode.Get(proxy)
+        self.assertEqual(len(proxy.invocations), 2)
+
+    def test_main_loop(self):
+        """
+        Watching a signal without a main loop issues a warning, once.
+        """
+        with default_main_loop() as get_default_main_loop:
+            get_default_main_loop.return_value = None
+            with self.assertWarnsRegex(RuntimeWarning, "main loop"):
+                self.filesystem.Properties.Name.Get(RecordingProxy("name"))
+            with warnings.catch_warnings():
+                warnings.simplefilter("error")
+                self.filesystem.Properties.Name.Get(
+                    RecordingProxy("name", object_path="/a")
+                )
+
+        klass = make_class(
+            "Filesystem",
+            ET.fromstring(SPECS[FILESYSTEM]),
+            property_cache=PropertyCache(),
+        )
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            klass.Properties.Name.Get(RecordingProxy("name"))
+
+    def test_not_cached(self):
+        """
+        A property whose changes are not signalled is always fetched.
+        """
+        proxy = RecordingProxy(1)
+        self.blockdev.Properties.Tier.Get(proxy)
+        self.blockdev.Properties.Tier.Get(proxy)
+        self.assertEqual(len(proxy.invocations), 2)
+        self.assertEqual(self.cache.cache_info(), PropertyCacheInfo(0, 0, 4, 0))
+
+    def test_interface_annotation(self):
+        """
+        The annotation of the interface applies to unannotated properties.
+        """
+        spec = ET.fromstring(
+            '<interface name="a.b"><property name="Name" type="s" access="read"/>'
+            '<annotation name="org.freedesktop.DBus.Property.EmitsChangedSignal" '
+            'value="false"/></interface>'
+        )
+        klass = make_class("Klass", spec, property_cache=self.cache)
+        proxy = RecordingProxy("name")
+        klass.Properties.Name.Get(proxy)
+        klass.Properties.Name.Get(proxy)
+        self.assertEqual(len(proxy.invocations), 2)
+
+    def test_eviction(self):
+        """
+        The least recently used value is evicted, and the signal of its
+        object path is no longer watched.
+        """
+        proxies = [RecordingProxy("name", object_path=f"/{i}") for i in range(5)]
+        for proxy in proxies:
+            self.filesystem.Properties.Name.Get(proxy)
+        self.assertEqual(self.cache.cache_info().currsize, 4)
+        self.assertEqual(proxies[0].matches, [])
+        self.assertEqual(len(proxies[4].matches), 1)
+
+        self.cache.forget("/4")
+        self.assertEqual(proxies[4].matches, [])
+        self.assertEqual(self.cache.cache_info().currsize, 3)
+
+        self.cache.clear()
+        self.assertEqual(self.cache.cache_info(), PropertyCacheInfo(0, 0, 4, 0))
+        self.assertEqual(proxies[1].matches, [])
+
+        with self.assertRaises(ValueError):
+            PropertyCache(maxsize=0)
+
+    def test_changed_while_fetching(self):
+        """
+        A value is not cached if a signal arrives while it is fetched.
+        """
+        proxy: Any = RecordingProxy()
+
+        def fetch():
+            proxy.emit("PropertiesChanged", FILESYSTEM, {"Name": "new"}, [])
+            return "old"
+
+        self.assertEqual(
+            self.cache.get(proxy, FILESYSTEM, "Name", "true", fetch), "old"
+        )
+        self.assertEqual(self.cache.cache_info().currsize, 0)
+
+    def test_fetch_error(self):
+        """
+        The signal is no longer watched if the value could not be fetched.
+        """
+        proxy = RecordingProxy(error=dbus.DBusException("failed"))
+        with self.assertRaises(DPClientInvocationError):
+            self.filesystem.Properties.Name.Get(proxy)
+        with self.assertRaises(DPClientInvocationError):
+            asyncio.run(self.filesystem.Async.Properties.Name.Get(proxy))
+        self.assertEqual(proxy.matches, [])
+
+        proxy = RecordingProxy("/dev/fs")
+        self.filesystem.Properties.Devnode.Get(proxy)
+        proxy.error = dbus.DBusException("failed")
+        with self.assertRaises(DPClientInvocationError):
+            self.filesystem.Properties.Name.Get(proxy)
+        self.assertEqual(len(proxy.matches), 1)
+
+    def test_setter(self):
+        """
+        Setting a property discards its cached value.
+        """
+        proxy = RecordingProxy((True, "info"))
+        self.blockdev.Properties.UserInfo.Set(proxy, (True, "new"))
+        self.blockdev.Properties.UserInfo.Get(proxy)
+        self.blockdev.Properties.UserInfo.Set(proxy, (True, "new"))
+        self.assertEqual(self.cache.cache_info().currsize, 0)
+
+    def test_async(self):
+        """
+        Coroutine getters and setters consult the cache also.
+        """
+        proxy = RecordingProxy("created")
+        getter = self.filesystem.Async.Properties.Created.Get
+        self.assertEqual(asyncio.run(getter(proxy)), "created")
+        self.assertEqual(asyncio.run(getter(proxy)), "created")
+        self.assertEqual(len(proxy.invocations), 1)
+
+        klass = make_class(
+            "Blockdev",
+            ET.fromstring(SPECS[BLOCKDEV]),
+            property_cache=self.cache,
+            asynchronous=True,
+        )
+        proxy = RecordingProxy((True, "info"))
+        asyncio.run(klass.Async.Properties.UserInfo.Get(proxy))
+        asyncio.run(klass.Async.Properties.UserInfo.Set(proxy, (True, "new")))
+        asyncio.run(klass.Async.Properties.Tier.Get(proxy))
+        self.assertEqual(self.cache.cache_info().currsize, 1)
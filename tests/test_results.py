@@ -0,0 +1,79 @@
+"""
+Test named tuples of the values of out-arguments.
+"""
+
+import asyncio
+import unittest
+import xml.etree.ElementTree as ET
+
+from dbus_python_client_gen import (
+    DPClientUnmarshallingError,
+    FakeProxyObject,
+    InvocationMetrics,
+    make_class,
+)
+from tests._introspect import SPECS
+from tests._proxy import RecordingProxy
+
+MANAGER = "org.storage.stratis3.Manager.r5"
+
+SPEC = """
+<interface name="org.example.Results">
+    <method name="Pair">
+      <arg type="s" direction="out" />
+      <arg name="class" type="q" direction="out" />
+    </method>
+    <method name="Single">
+      <arg name="value" type="s" direction="out" />
+    </method>
+</interface>
+"""
+
+
+class NamedResultsTestCase(unittest.TestCase):
+    """
+    Test the behavior of methods which return named tuples.
+    """
+
+    def test_fields(self):
+        """
+        Fields are named after the out-arguments.
+        """
+        for decode, compiled in ((False, False), (True, False), (False, True)):
+            with self.subTest(decode=decode, compiled=compiled):
+                klass = make_class(
+                    "Manager",
+                    ET.fromstring(SPECS[MANAGER]),
+                    decode=decode,
+                    compiled=compiled,
+                    named_results=True,
+                )
+                proxy = FakeProxyObject([ET.fromstring(SPECS[MANAGER])])
+                result = klass.Methods.DestroyPool(proxy, {"pool": "/"})
+                self.assertEqual(result.return_code, 0)
+                self.assertEqual(result.result, (False, ""))
+                self.assertEqual(result, ((False, ""), 0, ""))
+                self.assertIsInstance(result, klass.Methods.DestroyPool.result_type)
+                self.assertEqual(type(result).__name__, "DestroyPoolResult")
+
+    def test_unnamed(self):
+        """
+        Unnamed and invalid names are replaced, and methods with fewer than
+        two out-arguments are unchanged.
+        """
+        metrics = InvocationMetrics()
+        klass = make_class(
+            "Klass",
+            ET.fromstring(SPEC),
+            named_results=True,
+            asynchronous=True,
+            metrics=metrics,
+        )
+        result = asyncio.run(klass.Async.Methods.Pair(RecordingProxy(("a", 1)), {}))
+        self.assertEqual(result._fields, ("_0", "_1"))
+        self.assertEqual(klass.Methods.Single(RecordingProxy("a"), {}), "a")
+        self.assertFalse(hasattr(klass.Methods.Single, "result_type"))
+
+        with self.assertRaises(DPClientUnmarshallingError):
+            klass.Methods.Pair(RecordingProxy(("a",)), {})
+        self.assertEqual(metrics.members()[("org.example.Results", "Pair")].calls, 2)
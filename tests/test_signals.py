@@ -0,0 +1,180 @@
+"""
+Test the Signals classes of generated classes and their dispatch.
+"""
+
+import unittest
+import xml.etree.ElementTree as ET
+
+import dbus
+
+from dbus_python_client_gen import (
+    DPClientGenerationError,
+    DPClientUnmarshallingError,
+    Signal,
+    SignalDispatcher,
+    make_class,
+    make_module_source,
+)
+from tests._proxy import RecordingBus, RecordingProxy
+
+INTERFACE_NAME = "org.example.Signals"
+
+SPEC = """
+<interface name="org.example.Signals">
+    <signal name="Renamed">
+      <arg name="old" type="s" />
+      <arg name="new" type="s" />
+    </signal>
+    <signal name="Resized">
+      <arg type="t" />
+    </signal>
+    <signal name="Cleared" />
+</interface>
+"""
+
+
+class SignalsTestCase(unittest.TestCase):
+    """
+    Test the behavior of signals connected through a SignalDispatcher.
+    """
+
+    def setUp(self):
+        self.bus = RecordingBus()
+        self.dispatcher = SignalDispatcher(self.bus, "org.example")
+        self.klass = make_class("Klass", ET.fromstring(SPEC), decode=True)
+        self.received = []
+
+    def handler(self, *args, object_path):
+        """
+        Record the arguments of a signal.
+        """
+        self.received.append((object_path, args))
+
+    def emit(self, member, object_path, *args):
+        """
+        Emit a signal of the interface.
+        """
+        self.bus.emit(member, object_path, *args, dbus_interface=INTERFACE_NAME)
+
+    def test_members(self):
+        """
+        Each signal is a member of the Signals class.
+        """
+        renamed = self.klass.Signals.Renamed
+        self.assertIsInstance(renamed, Signal)
+        self.assertEqual(renamed.arg_names, ("old", "new"))
+        self.assertEqual(renamed.signature, "ss")
+        self.assertEqual(self.klass.Signals.Resized.arg_names, ("",))
+        self.assertEqual(repr(renamed), f"Signal({INTERFACE_NAME!r}, 'Renamed')")
+        self.assertIs(self.klass.bind(RecordingProxy()).Signals.Renamed, renamed)
+
+    def test_dispatch(self):
+        """
+        Handlers are called by object path, with one receiver per interface.
+        """
+        subscriptions = [
+            self.klass.Signals.Renamed.connect(self.dispatcher, self.handler, "/1"),
+            self.klass.Signals.Renamed.connect(self.dispatcher, self.handler),
+            self.klass.Signals.Resized.connect(self.dispatcher, self.handler, "/1"),
+        ]
+        self.assertEqual(len(self.bus.receivers), 1)
+        self.assertEqual(self.bus.receivers[0].kwargs["bus_name"], "org.example")
+
+        self.emit("Renamed", "/1", dbus.String("a"), dbus.String("b"))
+        self.emit("Renamed", "/2", dbus.String("b"), dbus.String("c"))
+        self.emit("Resized", "/2", dbus.UInt64(1))
+        self.emit("Cleared", "/1")
+        self.assertEqual(
+            self.received, [("/1", ("a", "b")), ("/1", ("a", "b")), ("/2", ("b", "c"))]
+        )
+        self.assertIs(type(self.received[0][1][0]), str)
+
+        subscriptions[0].remove()
+        subscriptions[0].remove()
+        subscriptions[1].remove()
+        self.emit("Renamed", "/1", dbus.String("a"), dbus.String("b"))
+        self.emit("Resized", "/1", dbus.UInt64(2))
+        self.assertEqual(self.received[-1], ("/1", (2,)))
+        self.assertEqual(len(self.bus.receivers), 1)
+
+        subscriptions[2].remove()
+        self.assertEqual(self.bus.receivers, [])
+
+        self.klass.Signals.Cleared.connect(self.dispatcher, self.handler)
+        self.dispatcher.close()
+        self.assertEqual(self.bus.receivers, [])
+
+    def test_decoding(self):
+        """
+        Arguments are decoded only for classes made with decode=True.
+        """
+        raw = make_class("Raw", ET.fromstring(SPEC), lazy=True)
+        subscription = raw.Signals.Resized.connect(self.dispatcher, self.handler)
+        self.klass.Signals.Resized.connect(self.dispatcher, self.handler)
+        self.emit("Resized", "/1", dbus.UInt64(1))
+        self.assertIs(type(self.received[0][1][0]), dbus.UInt64)
+        self.assertIs(type(self.received[1][1][0]), int)
+
+        subscription.remove()
+        self.emit("Resized", "/1", dbus.UInt64(2))
+        self.assertEqual(self.received[2:], [("/1", (2,))])
+
+        with self.assertRaises(DPClientUnmarshallingError):
+            self.klass.Signals.Renamed.decode(("a",))
+
+    def test_handler_errors(self):
+        """
+        A handler which raises, or arguments which can not be decoded, do
+        not prevent the other handlers from being called.
+        """
+
+        def failing(*args, object_path):
+            raise RuntimeError("bug")
+
+        self.klass.Signals.Renamed.connect(self.dispatcher, failing)
+        self.klass.Signals.Renamed.connect(self.dispatcher, self.handler)
+        with self.assertLogs("dbus_python_client_gen", "ERROR") as logs:
+            self.emit("Renamed", "/1", "a", "b")
+        self.assertEqual(self.received, [("/1", ("a", "b"))])
+        self.assertIn("RuntimeError: bug", logs.output[0])
+
+        raw = make_class("Raw", ET.fromstring(SPEC), lazy=True)
+        self.klass.Signals.Resized.connect(self.dispatcher, self.handler)
+        self.klass.Signals.Resized.connect(self.dispatcher, self.handler)
+        raw.Signals.Resized.connect(self.dispatcher, self.handler)
+        with self.assertLogs("dbus_python_client_gen", "ERROR") as logs:
+            self.emit("Resized", "/1", dbus.Struct((1,)))
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("decode", logs.output[0])
+        self.assertEqual(self.received[1:], [("/1", (dbus.Struct((1,)),))])
+
+    def test_malformed(self):
+        """
+        A malformed signature is detected.
+        """
+        spec = ET.fromstring(
+            '<interface name="a.b"><signal name="Bad"><arg type="a{"/></signal>'
+            "</interface>"
+        )
+        klass = make_class("Klass", spec, lazy=True)
+        with self.assertRaises(DPClientGenerationError):
+            klass.Signals.Bad  # noqa: B018
+        with self.assertRaises(DPClientGenerationError):
+            make_class("Klass", spec, lazy=True, validate=True)
+        with self.assertRaises(DPClientGenerationError):
+            make_module_source({"Klass": spec})
+
+    def test_generated_module(self):
+        """
+        Classes of generated modules have the same signals.
+        """
+        namespace = {}
+        exec(  # nosec B102
+            make_module_source({"Klass": ET.fromstring(SPEC)}), namespace
+        )
+        renamed = namespace["Klass"].Signals.Renamed
+        self.assertEqual(
+            (renamed.interface_name, renamed.arg_names),
+            (INTERFACE_NAME, ("old", "new")),
+        )
+        self.assertIsNone(renamed.decoder)
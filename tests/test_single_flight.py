@@ -0,0 +1,175 @@
+"""
+Test coalescing of concurrent identical invocations.
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+import xml.etree.ElementTree as ET
+
+from dbus_python_client_gen import (
+    DPClientGenerationError,
+    DPClientInvocationError,
+    FakeProxyObject,
+    SingleFlight,
+    make_class,
+)
+
+INTERFACE_NAME = "org.example.Reader"
+
+SPEC = """
+<interface name="org.example.Reader">
+    <method name="List">
+      <arg name="prefix" type="ay" direction="in" />
+      <arg name="names" type="as" direction="out" />
+    </method>
+    <method name="Touch" />
+    <property name="Size" type="t" access="read" />
+</interface>
+"""
+
+
+class SingleFlightTestCase(unittest.TestCase):
+    """
+    Test the behavior of classes made with a SingleFlight.
+    """
+
+    def setUp(self):
+        self.single_flight = SingleFlight()
+        self.klass = make_class(
+            "Reader",
+            ET.fromstring(SPEC),
+            asynchronous=True,
+            single_flight=self.single_flight,
+            read_only_methods=["List"],
+        )
+        self.proxy = FakeProxyObject(
+            [ET.fromstring(SPEC)], "/1", latency=0.01, bus_name="org.example"
+        )
+
+    def wait_for_coalesced(self, count):
+        """
+        Wait until count calls are waiting for a call in flight.
+        """
+        deadline = time.monotonic() + 5
+        while self.single_flight.info().coalesced < count:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.001)
+
+    def run_threads(self, func, count):
+        """
+        Invoke func on count threads while the first invocation is held in
+        flight, and return the results or errors.
+        """
+        release = threading.Event()
+        results = [None] * count
+
+        def reply(prefix):
+            release.wait(5)
+            if bytes(prefix) == b"error":
+                raise ValueError(prefix)
+            return ["name"]
+
+        self.proxy.set_reply(INTERFACE_NAME, "List", reply)
+
+        def target(i):
+            try:
+                results[i] = func()
+            except Exception as err:  # noqa: BLE001
+                results[i] = err
+
+        threads = [threading.Thread(target=target, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        self.wait_for_coalesced(count - 1)
+        release.set()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_threads(self):
+        """
+        Identical calls on several threads share one call and its result.
+        """
+        results = self.run_threads(
+            lambda: self.klass.Methods.List(self.proxy, {"prefix": b"a"}), 8
+        )
+        self.assertEqual(results, [["name"]] * 8)
+        self.assertEqual(self.proxy.calls[(INTERFACE_NAME, "List")], 1)
+        self.assertEqual(self.single_flight.info(), (1, 7, 0))
+
+    def test_thread_errors(self):
+        """
+        Identical calls on several threads share one error.
+        """
+        self.proxy.latency = 0
+        results = self.run_threads(
+            lambda: self.klass.Methods.List(self.proxy, {"prefix": b"error"}), 4
+        )
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+        self.assertEqual(self.proxy.calls[(INTERFACE_NAME, "List")], 1)
+
+    def test_tasks(self):
+        """
+        Identical calls on several tasks share one call; others do not.
+        """
+
+        async def gather():
+            return await asyncio.gather(
+                *[self.klass.Async.Properties.Size.Get(self.proxy) for _ in range(5)],
+                self.klass.Async.Methods.List(self.proxy, {"prefix": b"a"}),
+                self.klass.Async.Methods.List(self.proxy, {"prefix": b"b"}),
+                self.klass.Async.Methods.List(self.proxy, {"prefix": bytearray()}),
+                self.klass.Async.Methods.Touch(self.proxy, {}),
+                self.klass.Async.Methods.Touch(self.proxy, {}),
+            )
+
+        results = asyncio.run(gather())
+        self.assertEqual(results[:5], [0] * 5)
+        self.assertEqual(self.proxy.calls[(INTERFACE_NAME, "Size.Get")], 1)
+        self.assertEqual(self.proxy.calls[(INTERFACE_NAME, "List")], 3)
+        self.assertEqual(self.proxy.calls[(INTERFACE_NAME, "Touch")], 2)
+        self.assertEqual(self.single_flight.info(), (3, 4, 0))
+
+        self.klass.bind(self.proxy).Properties.Size.Get()
+        self.klass.Methods.List(self.proxy, {"prefix": bytearray()})
+
+    def test_task_errors(self):
+        """
+        Identical calls on several tasks share one error, and the call in
+        flight is not cancelled with the task that awaits it.
+        """
+        self.proxy.inject_error(INTERFACE_NAME, "Size.Get", count=1)
+
+        async def gather():
+            return await asyncio.gather(
+                *[self.klass.Async.Properties.Size.Get(self.proxy) for _ in range(3)],
+                return_exceptions=True,
+            )
+
+        for result in asyncio.run(gather()):
+            self.assertIsInstance(result, DPClientInvocationError)
+        self.assertEqual(self.proxy.calls[(INTERFACE_NAME, "Size.Get")], 1)
+
+        async def cancel():
+            task = asyncio.ensure_future(
+                self.klass.Async.Properties.Size.Get(self.proxy)
+            )
+            await asyncio.sleep(0)
+            task.cancel()
+
+        asyncio.run(cancel())
+        self.assertEqual(self.single_flight.info().in_flight, 0)
+
+    def test_unknown_methods(self):
+        """
+        Methods marked read-only must belong to the interface.
+        """
+        with self.assertRaises(DPClientGenerationError):
+            make_class(
+                "Reader",
+                ET.fromstring(SPEC),
+                single_flight=self.single_flight,
+                read_only_methods=["Unknown"],
+            )
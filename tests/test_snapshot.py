@@ -0,0 +1,80 @@
+"""
+Test getting all properties of an interface in a single call.
+"""
+
+import unittest
+import xml.etree.ElementTree as ET
+
+from dbus_python_client_gen import DPClientKeywordError, make_class
+from tests._introspect import SPECS
+from tests._proxy import RecordingProxy
+
+INTERFACE_NAME = "org.storage.stratis3.filesystem.r5"
+
+VALUES = {"Name": "fs", "Uuid": "abc", "Used": (True, "1024")}
+
+
+class SnapshotTestCase(unittest.TestCase):
+    """
+    Test the behavior of GetAll.
+    """
+
+    def setUp(self):
+        self.klass = make_class("Filesystem", ET.fromstring(SPECS[INTERFACE_NAME]), 120)
+
+    def test_get_all(self):
+        """
+        All properties returned are set on the snapshot in a single call.
+        """
+        proxy = RecordingProxy(VALUES)
+        snapshot = self.klass.Properties.GetAll(proxy)
+        self.assertEqual(
+            proxy.invocations,
+            [
+                (
+                    "org.freedesktop.DBus.Properties",
+                    "GetAll",
+                    (INTERFACE_NAME,),
+                    {"timeout": 120},
+                )
+            ],
+        )
+        self.assertEqual(snapshot.Name, "fs")
+        self.assertEqual(snapshot.Used, (True, "1024"))
+        self.assertFalse(hasattr(snapshot, "__dict__"))
+        self.assertIn("Name='fs'", repr(snapshot))
+
+        # Readable, but not returned
+        with self.assertRaises(AttributeError):
+            getattr(snapshot, "Devnode")
+
+    def test_subset(self):
+        """
+        Only requested properties are set on the snapshot.
+        """
+        snapshot = self.klass.bind(RecordingProxy(VALUES)).Properties.GetAll(["Uuid"])
+        self.assertEqual(snapshot.Uuid, "abc")
+        with self.assertRaises(AttributeError):
+            getattr(snapshot, "Name")
+
+    def test_unknown_property(self):
+        """
+        Requesting a property that is not readable is an error.
+        """
+        proxy = RecordingProxy(VALUES)
+        with self.assertRaises(DPClientKeywordError) as context:
+            self.klass.Properties.GetAll(proxy, ["Name", "Bogus"])
+        self.assertEqual(context.exception.actual, ["Name", "Bogus"])
+        self.assertEqual(proxy.invocations, [])
+
+    def test_property_named_get_all(self):
+        """
+        A property named GetAll takes precedence.
+        """
+        spec = ET.fromstring(
+            '<interface name="a.b"><property name="GetAll" type="s" '
+            'access="read"/></interface>'
+        )
+        for lazy in (False, True):
+            klass = make_class("Klass", spec, lazy=lazy)
+            self.assertTrue(hasattr(klass.Properties.GetAll, "Get"))
@@ -0,0 +1,58 @@
+"""
+Test the process-wide cache of argument-transforming functions.
+"""
+
+import unittest
+import xml.etree.ElementTree as ET
+
+from dbus_python_client_gen import make_class, xformer_cache_clear, xformer_cache_info
+from dbus_python_client_gen._xformers import signature_xformers
+from tests._introspect import SPECS
+
+
+class XformerCacheTestCase(unittest.TestCase):
+    """
+    Test the statistics of the cache.
+    """
+
+    def setUp(self):
+        xformer_cache_clear()
+
+    def tearDown(self):
+        xformer_cache_clear()
+
+    def test_shared_between_classes(self):
+        """
+        Generating the same classes again constructs no new functions.
+        """
+        for key, value in SPECS.items():
+            make_class(key.split(".")[-2], ET.fromstring(value))
+        first = xformer_cache_info()
+        self.assertGreater(first.misses, 0)
+        self.assertGreater(first.hits, 0)
+        self.assertEqual(first.currsize, first.misses)
+
+        for key, value in SPECS.items():
+            make_class(key.split(".")[-2], ET.fromstring(value), compiled=True)
+        second = xformer_cache_info()
+        self.assertEqual(second.misses, first.misses)
+        self.assertGreater(second.hits, first.hits)
+
+    def test_variants(self):
+        """
+        Transforming the contents of variants does not use the main cache.
+        """
+        (func,) = signature_xformers("a{sv}")
+        before = xformer_cache_info()
+        func({code: (f"a{code}", []) for code in "ybnqiuxtdsog"})
+        after = xformer_cache_info()
+        self.assertEqual(after.currsize, before.currsize)
+
+    def test_clear(self):
+        """
+        Clearing the cache resets the statistics.
+        """
+        make_class("Manager", ET.fromstring(SPECS["org.storage.stratis3.Manager.r5"]))
+        xformer_cache_clear()
+        info = xformer_cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (0, 0, 0))